@@ -0,0 +1,105 @@
+"""Canonical street-address form used for geocode cache keys and dedup."""
+from __future__ import annotations
+
+import re
+
+from .towns import TOWNS
+
+# USPS Publication 28 street suffix abbreviations (the ones seen in CT court data and their common variants).
+SUFFIXES = {
+    "ALLEY": "ALY", "AVENUE": "AVE", "AV": "AVE", "AVEN": "AVE", "BOULEVARD": "BLVD", "BLV": "BLVD",
+    "CIRCLE": "CIR", "CIRC": "CIR", "CRCL": "CIR", "COURT": "CT", "CRT": "CT", "COVE": "CV",
+    "CRESCENT": "CRES", "CROSSING": "XING", "DRIVE": "DR", "DRV": "DR", "EXTENSION": "EXT",
+    "EXTN": "EXT", "HEIGHTS": "HTS", "HIGHWAY": "HWY", "HIWAY": "HWY", "HILL": "HL", "HOLLOW": "HOLW",
+    "LANE": "LN", "LA": "LN", "MANOR": "MNR", "MEADOW": "MDW", "MEADOWS": "MDWS", "PARKWAY": "PKWY",
+    "PKY": "PKWY", "PLACE": "PL", "PLAZA": "PLZ", "POINT": "PT", "RIDGE": "RDG", "ROAD": "RD",
+    "ROUTE": "RTE", "SQUARE": "SQ", "STREET": "ST", "STR": "ST", "TERRACE": "TER", "TERR": "TER",
+    "TRAIL": "TRL", "TURNPIKE": "TPKE", "TPK": "TPKE", "VIEW": "VW", "WAY": "WAY",
+}
+STREET_TYPES = set(SUFFIXES) | set(SUFFIXES.values())
+DIRECTIONALS = {
+    "NORTH": "N", "SOUTH": "S", "EAST": "E", "WEST": "W",
+    "NORTHEAST": "NE", "NORTHWEST": "NW", "SOUTHEAST": "SE", "SOUTHWEST": "SW",
+}
+
+# The court site glues the unit onto the street ("East River DriveUnit 807", "Northbrook Court#9").
+GLUED_UNIT_RE = re.compile(r"(?<=[a-z.])(?=(?:Unit|Apt|Suite|Ste|Floor|Fl|Bldg|Rm|No\.|#)(?:[\s\d#.]|$))")
+UNIT_RE = re.compile(
+    r"(?:\s|,)+(?:UNIT|APT|APARTMENT|SUITE|STE|FLOOR|FL|BLDG|BUILDING|RM|ROOM|NO\.?|#)(?=[\s\d#.,-]|$).*$"
+    r"|\s*#.*$",
+    re.IGNORECASE,
+)
+# The court stores property addresses with the locality: "1121 TOLLAND STREET EAST HARTFORD, CT 06108",
+# "236 Broadway, Milford, CT 06460". A bare "CT" needs a comma or ZIP code so "12 Oak Ct" is kept.
+STATE_RE = re.compile(r"(?:,\s*|\s+(?=CT\.?\s+\d{5}))CT\.?(?:\s+\d{5}(?:-\d{4})?)?\s*$", re.IGNORECASE)
+TOWN_RE = re.compile(
+    r"(?:,\s*|\s+)(?:" + "|".join(re.escape(t) for t in sorted(TOWNS, key=len, reverse=True)) + r")\s*,?\s*$",
+    re.IGNORECASE,
+)
+PUNCT_RE = re.compile(r"[^\w\s-]")
+SPACE_RE = re.compile(r"\s+")
+
+
+def strip_locality(address: str) -> str:
+    """``address`` without a trailing ``<town>, CT <zip>``; left alone when no state follows the street."""
+    if not address:
+        return ""
+    street = STATE_RE.sub("", address)
+    if street == address:
+        return address
+    without_town = TOWN_RE.sub("", street)
+    return (without_town if without_town.strip(" ,") else street).strip(" ,")
+
+
+def strip_unit(address: str) -> str:
+    """``address`` without apartment/unit/floor designators, otherwise as written."""
+    if not address:
+        return ""
+    address = GLUED_UNIT_RE.sub(" ", address)
+    street = UNIT_RE.sub("", address)
+    if len(street.split()) < 2:
+        # "3 Fl Ave" is a street, not a floor; keep it whole.
+        street = address
+    return SPACE_RE.sub(" ", street).strip(" ,")
+
+
+def normalize_address(address: str) -> str:
+    """Uppercase, punctuation-free, unit- and locality-free form with USPS suffix and directional abbreviations.
+
+    ``"102 Orchard Street, Apt 2"``, ``"102 orchard st."`` and ``"102 ORCHARD STREET HARTFORD, CT 06106"``
+    all become ``"102 ORCHARD ST"``.
+    """
+    cleaned = PUNCT_RE.sub(" ", strip_unit(strip_locality(address)).upper())
+    tokens = cleaned.split()
+    # Only the street type is abbreviated, with any extension or directional after it
+    # ("AVENUE EXTENSION", "STREET NORTH"), so a name made of suffix words keeps its spelling:
+    # "La Salle Road" is LA SALLE RD and "Court Street" is COURT ST.
+    tail = len(tokens)
+    while tail > 1 and (tokens[tail - 1] in DIRECTIONALS or SUFFIXES.get(tokens[tail - 1], tokens[tail - 1]) == "EXT"):
+        tail -= 1
+    if tail > 1 and tokens[tail - 1] in STREET_TYPES:
+        tail -= 1
+    # A pre-directional follows the house number and needs a street name after it: "5 North St" keeps NORTH.
+    pre = 1 if tokens and any(c.isdigit() for c in tokens[0]) else 0
+    out = []
+    for i, token in enumerate(tokens):
+        if i >= tail:
+            token = SUFFIXES.get(token, DIRECTIONALS.get(token, token))
+        elif i == pre and pre < tail - 1 and token in DIRECTIONALS:
+            token = DIRECTIONALS[token]
+        out.append(token)
+    return " ".join(out)
+
+
+def normalize_town(town: str) -> str:
+    return SPACE_RE.sub(" ", (town or "").upper()).strip()
+
+
+def address_key(address: str, town: str) -> str:
+    """Cache/dedup key for a property; empty when there is no usable address."""
+    return join_key(normalize_address(address), normalize_town(town))
+
+
+def join_key(street: str, town: str) -> str:
+    """``address_key`` from an already normalized street and town."""
+    return f"{street}|{town}|CT" if street else ""
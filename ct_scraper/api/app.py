@@ -4,7 +4,10 @@ from __future__ import annotations
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from ..database import dispose_async_engine
 from ..pipeline import init_db
+from . import maps
+from .pagination import NEXT_CURSOR_HEADER
 from .routes import router
 
 
@@ -17,13 +20,19 @@ def create_app() -> FastAPI:
         allow_credentials=False,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, "Link"],
     )
 
     @app.on_event("startup")
     def _startup() -> None:
         init_db()
 
+    @app.on_event("shutdown")
+    async def _shutdown() -> None:
+        await dispose_async_engine()
+
     app.include_router(router)
+    app.include_router(maps.router)
     return app
 
 
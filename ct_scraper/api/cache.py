@@ -0,0 +1,188 @@
+"""Response cache and ETags for read endpoints, keyed on the data version so ingest invalidates them."""
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ct:resp:"
+# Keys embed the data version, so stale entries are simply never read again; this only bounds Redis memory.
+REDIS_TTL_SECONDS = 24 * 3600
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    next_cursor: Optional[str] = None
+
+
+def cache_key(path: str, params: Mapping[str, Any], version: int) -> str:
+    """Stable key for ``path`` with the validated ``params``; unset params are dropped, strings stripped."""
+    normalized = sorted(
+        (name, value.strip() if isinstance(value, str) else value)
+        for name, value in params.items()
+        if value is not None
+    )
+    raw = f"{version}:{path}?" + "&".join(f"{name}={value}" for name, value in normalized)
+    return KEY_PREFIX + hashlib.sha1(raw.encode()).hexdigest()
+
+
+def etag_for(key: str) -> str:
+    return f'"{key[len(KEY_PREFIX):][:24]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 9110 weak comparison of an If-None-Match header against ``etag``."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+class ResponseCache:
+    """Thread-safe in-process LRU, optionally backed by Redis so every API worker shares entries."""
+
+    def __init__(self, maxsize: int = 256, redis_url: Optional[str] = None) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        if redis_url:
+            try:
+                import redis
+            except ImportError:
+                logger.warning("redis not installed; response cache is per process only")
+            else:
+                self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    @property
+    def shared(self) -> bool:
+        """Whether lookups can go over the network to Redis."""
+        return self._redis is not None
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+        entry = self._redis_get(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._store(key, entry)
+        return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._store(key, entry)
+        if self._redis is not None:
+            try:
+                self._redis.pipeline().hset(
+                    key, mapping={"body": entry.body, "cursor": entry.next_cursor or ""}
+                ).expire(key, REDIS_TTL_SECONDS).execute()
+            except Exception as exc:  # a cache outage must not fail the request
+                logger.debug("Redis response cache write failed: %s", exc)
+
+    def _store(self, key: str, entry: CachedResponse) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _redis_get(self, key: str) -> Optional[CachedResponse]:
+        if self._redis is None:
+            return None
+        try:
+            stored = self._redis.hgetall(key)
+        except Exception as exc:
+            logger.debug("Redis response cache read failed: %s", exc)
+            return None
+        if not stored or b"body" not in stored:
+            return None
+        return CachedResponse(stored[b"body"], stored.get(b"cursor", b"").decode() or None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _validators(request: Request, key: Optional[str]) -> Tuple[Dict[str, str], bool]:
+    """Headers for the response named by ``key``, and whether the request's If-None-Match already has it."""
+    headers = {"Cache-Control": "no-cache"}
+    if key is None:
+        return headers, False
+    headers["ETag"] = etag_for(key)
+    return headers, etag_matches(request.headers.get("if-none-match"), headers["ETag"])
+
+
+def cached_page(
+    request: Request, key: Optional[str], build: Callable[[], CachedResponse]
+) -> Tuple[Optional[CachedResponse], Dict[str, str]]:
+    """The response for ``key`` from the cache or ``build``, plus validator headers.
+
+    The page is None when the request's If-None-Match already names it; answer
+    304 with the headers. A None ``key`` means the response cannot be cached or
+    tagged and is always built.
+    """
+    headers, not_modified = _validators(request, key)
+    if key is None:
+        return build(), headers
+    if not_modified:
+        return None, headers
+    cache = get_response_cache()
+    page = cache.get(key) if cache is not None else None
+    if page is None:
+        page = build()
+        if cache is not None:
+            cache.put(key, page)
+    return page, headers
+
+
+async def cached_page_async(
+    request: Request, key: Optional[str], build: Callable[[], Awaitable[CachedResponse]]
+) -> Tuple[Optional[CachedResponse], Dict[str, str]]:
+    """:func:`cached_page` for async routes. The Redis client blocks, so a shared cache is read in the threadpool."""
+    headers, not_modified = _validators(request, key)
+    if key is None:
+        return await build(), headers
+    if not_modified:
+        return None, headers
+    cache = get_response_cache()
+    page = None
+    if cache is not None:
+        page = await run_in_threadpool(cache.get, key) if cache.shared else cache.get(key)
+    if page is None:
+        page = await build()
+        if cache is not None:
+            if cache.shared:
+                await run_in_threadpool(cache.put, key, page)
+            else:
+                cache.put(key, page)
+    return page, headers
+
+
+@lru_cache(maxsize=1)
+def get_response_cache() -> Optional[ResponseCache]:
+    """The process-wide cache per ``Settings.response_cache``; None when caching is off."""
+    settings = get_settings()
+    mode = settings.response_cache.lower()
+    if mode == "off" or settings.response_cache_size <= 0:
+        return None
+    return ResponseCache(settings.response_cache_size, settings.redis_url if mode == "redis" else None)
@@ -0,0 +1,120 @@
+"""Case filters shared by GET /cases, /cases/export and /map/clusters."""
+from __future__ import annotations
+
+import datetime as dt
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import Select, and_, or_, select, tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+from ..models import Case
+from ..search import apply_search
+from ..spatial import BBox, apply_bbox, apply_radius
+from .pagination import decode_cursor, decode_rank_cursor
+from .serialization import CASE_COLUMNS
+
+
+def parse_bbox(raw: Optional[str]) -> Optional[BBox]:
+    """``minLng,minLat,maxLng,maxLat`` (GeoJSON order); 400 if it is not four numbers in range."""
+    if not raw:
+        return None
+    try:
+        box = BBox(*(float(part) for part in raw.split(",")))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="bbox must be minLng,minLat,maxLng,maxLat")
+    if not (-180 <= box.min_lng <= box.max_lng <= 180 and -90 <= box.min_lat <= box.max_lat <= 90):
+        raise HTTPException(status_code=400, detail="bbox is out of range or inverted")
+    return box
+
+
+def parse_near(raw: Optional[str]) -> Optional[Tuple[float, float]]:
+    """``lat,lng``; 400 if it is not two numbers in range."""
+    if not raw:
+        return None
+    try:
+        lat, lng = (float(part) for part in raw.split(","))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="near must be lat,lng")
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        raise HTTPException(status_code=400, detail="near is out of range")
+    return lat, lng
+
+
+def filtered_cases(dialect: str, **filters) -> Tuple[Select, Optional[ColumnElement]]:
+    """``CASE_COLUMNS`` newest first with the /cases filters applied, and the search rank ordering it, if any."""
+    # Newest first; id breaks ties so the keyset cursor is a strict total order.
+    stmt = select(*CASE_COLUMNS).order_by(Case.created_at.desc(), Case.id.desc())
+    return apply_case_filters(stmt, dialect, **filters)
+
+
+def apply_case_filters(
+    stmt: Select,
+    dialect: str,
+    *,
+    cursor: Optional[str] = None,
+    since_hours: Optional[int] = None,
+    search: Optional[str] = None,
+    county: Optional[str] = None,
+    town: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    bbox: Optional[str] = None,
+    near: Optional[str] = None,
+    radius: Optional[float] = None,
+) -> Tuple[Select, Optional[ColumnElement]]:
+    """Narrow ``stmt`` (a select from cases) by the /cases query parameters.
+
+    A search the dialect can rank reorders ``stmt`` best match first and returns
+    the rank (lower is better), which the cursor of a ranked page then carries.
+    """
+    rank = None
+    if search:
+        stmt, rank = apply_search(stmt, search, dialect)
+        if rank is not None:
+            stmt = stmt.order_by(None).order_by(rank, Case.id.desc())
+
+    if cursor and rank is not None:
+        after_rank, after_id = decode_rank_cursor(cursor)
+        stmt = stmt.where(or_(rank > after_rank, and_(rank == after_rank, Case.id < after_id)))
+    elif cursor:
+        after_created, after_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Case.created_at, Case.id) < tuple_(after_created, after_id))
+
+    if since_hours:
+        cutoff = dt.datetime.utcnow() - dt.timedelta(hours=since_hours)
+        stmt = stmt.where(Case.created_at >= cutoff)
+
+    if county:
+        stmt = stmt.where(Case.county == county.strip())
+
+    if town:
+        stmt = stmt.where(Case.town == town.strip())
+
+    if date_from:
+        try:
+            from_date = dt.datetime.strptime(date_from, "%Y-%m-%d").date()
+            stmt = stmt.where(Case.created_at >= from_date)
+        except ValueError:
+            pass  # Invalid date format, ignore
+
+    if date_to:
+        try:
+            to_date = dt.datetime.strptime(date_to, "%Y-%m-%d").date()
+            # Add one day to include the entire end date
+            to_date_next = to_date + dt.timedelta(days=1)
+            stmt = stmt.where(Case.created_at < to_date_next)
+        except ValueError:
+            pass  # Invalid date format, ignore
+
+    box = parse_bbox(bbox)
+    if box:
+        stmt = apply_bbox(stmt, box, dialect)
+
+    center = parse_near(near)
+    if (center is None) != (radius is None):
+        raise HTTPException(status_code=400, detail="near and radius must be given together")
+    if center:
+        stmt = apply_radius(stmt, center, radius, dialect)
+
+    return stmt, rank
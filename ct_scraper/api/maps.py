@@ -0,0 +1,142 @@
+"""Map endpoints: clustered case points for a viewport and locally served CT boundary layers."""
+from __future__ import annotations
+
+import math
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..data_version import get_data_version
+from ..database import get_session
+from ..geohash import PRECISION, cell_size
+from ..models import Case
+from ..spatial import BBox, geohash_filter
+from .cache import CachedResponse, cache_key, cached_page
+from .filters import apply_case_filters, parse_bbox
+from .serialization import dumps
+
+router = APIRouter(prefix="/map")
+
+GEOJSON_MEDIA_TYPE = "application/geo+json"
+BOUNDARY_LAYERS = ("state", "counties", "towns")
+# The layers only change when scripts/fetch_boundaries.py is rerun.
+BOUNDARY_MAX_AGE = 7 * 24 * 3600
+MAX_ZOOM = 20
+# Upper bound on grid cells per response, whatever zoom the client asks for.
+MAX_CELLS = 4096
+
+
+def precision_for_zoom(zoom: int) -> int:
+    """Geohash length whose cells are roughly 64 px across at web-map ``zoom``."""
+    return max(1, min(PRECISION, round(2 * (zoom + 2) / 5)))
+
+
+def snap_bbox(box: BBox, precision: int) -> BBox:
+    """``box`` grown to whole cells, so clusters near the edges are complete and nearby viewports share a key."""
+    height, width = cell_size(precision)
+    return BBox(
+        max(-180.0, math.floor(box.min_lng / width) * width),
+        max(-90.0, math.floor(box.min_lat / height) * height),
+        min(180.0, math.ceil(box.max_lng / width) * width),
+        min(90.0, math.ceil(box.max_lat / height) * height),
+    )
+
+
+def _cells(box: BBox, precision: int) -> float:
+    height, width = cell_size(precision)
+    return ((box.max_lat - box.min_lat) / height) * ((box.max_lng - box.min_lng) / width)
+
+
+@router.get("/clusters")
+def clusters(
+    request: Request,
+    bbox: str = Query(..., description="minLng,minLat,maxLng,maxLat of the viewport"),
+    zoom: int = Query(8, ge=0, le=MAX_ZOOM),
+    since_hours: Optional[int] = Query(None, ge=1, le=720),
+    search: Optional[str] = Query(None, min_length=1, max_length=120),
+    county: Optional[str] = Query(None, min_length=1, max_length=50),
+    town: Optional[str] = Query(None, min_length=1, max_length=80),
+    date_from: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    date_to: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    session: Session = Depends(get_session),
+):
+    """Geocoded cases matching the /cases filters, counted per geohash cell, as GeoJSON points.
+
+    Each feature sits at the mean position of its cell's cases; a cell holding a
+    single case also carries its docket, town and address.
+    """
+    precision = precision_for_zoom(zoom)
+    box = snap_bbox(parse_bbox(bbox), precision)
+    while precision > 1 and _cells(box, precision) > MAX_CELLS:
+        precision -= 1
+        box = snap_bbox(box, precision)
+
+    filters = dict(since_hours=since_hours, search=search, county=county, town=town, date_from=date_from, date_to=date_to)
+    params = dict(filters, bbox=",".join(f"{v:.6f}" for v in box), precision=precision)
+    key = None if since_hours else cache_key(request.url.path, params, get_data_version(session))
+    page, headers = cached_page(request, key, lambda: _cluster_page(session, box, precision, filters))
+    if page is None:
+        return Response(status_code=304, headers=headers)
+    return Response(content=page.body, media_type=GEOJSON_MEDIA_TYPE, headers=headers)
+
+
+def _cluster_page(session: Session, box: BBox, precision: int, filters: Dict[str, Any]) -> CachedResponse:
+    cell = func.substr(Case.geohash, 1, precision).label("cell")
+    # Only columns in ix_cases_geohash (SQLite indexes carry the rowid), so the scan never touches the table.
+    stmt = select(
+        cell,
+        func.count().label("count"),
+        func.avg(Case.latitude).label("lat"),
+        func.avg(Case.longitude).label("lng"),
+        func.min(Case.id).label("case_id"),
+    ).where(
+        # Also leaves out cases placed at a town centroid, which get no geohash.
+        Case.geohash.is_not(None),
+        Case.latitude.between(box.min_lat, box.max_lat),
+        Case.longitude.between(box.min_lng, box.max_lng),
+    )
+    # A few prefix ranges covering the box keep the scan on ix_cases_geohash to the viewport.
+    ranges = geohash_filter(box)
+    if ranges is not None:
+        stmt = stmt.where(ranges)
+    stmt, _ = apply_case_filters(stmt, session.get_bind().dialect.name, **filters)
+    rows = session.execute(stmt.order_by(None).group_by(cell)).all()
+
+    details: Dict[int, Dict[str, str]] = {}
+    singles = [row.case_id for row in rows if row.count == 1]
+    if singles:
+        detail_stmt = select(Case.id, Case.docket_no, Case.town, Case.property_address).where(Case.id.in_(singles))
+        for case_id, docket_no, town, address in session.execute(detail_stmt):
+            details[case_id] = {"docket_no": docket_no, "town": town, "property_address": address}
+
+    features: List[Dict[str, Any]] = []
+    for row in rows:
+        properties: Dict[str, Any] = {"count": row.count, "cell": row.cell}
+        if row.count == 1:
+            properties.update(details.get(row.case_id, {}))
+        features.append(
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [round(row.lng, 6), round(row.lat, 6)]},
+                "properties": properties,
+            }
+        )
+    return CachedResponse(dumps({"type": "FeatureCollection", "precision": precision, "features": features}))
+
+
+@router.get("/boundaries/{layer}.geojson")
+def boundary(layer: str):
+    """A simplified CT boundary layer (state, counties or towns) from ``Settings.boundaries_dir``."""
+    if layer not in BOUNDARY_LAYERS:
+        raise HTTPException(status_code=404, detail=f"Unknown layer; expected one of {', '.join(BOUNDARY_LAYERS)}")
+    path = Path(get_settings().boundaries_dir) / f"{layer}.geojson"
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="Boundary layer not downloaded; run scripts/fetch_boundaries.py")
+    return FileResponse(
+        path, media_type=GEOJSON_MEDIA_TYPE, headers={"Cache-Control": f"public, max-age={BOUNDARY_MAX_AGE}"}
+    )
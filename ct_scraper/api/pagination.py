@@ -0,0 +1,43 @@
+"""Opaque keyset cursors for paging cases newest-first on (created_at, id), or a ranked search on (rank, id)."""
+from __future__ import annotations
+
+import base64
+import datetime as dt
+import json
+from typing import Tuple
+
+from fastapi import HTTPException
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: dt.datetime, case_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), case_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[dt.datetime, int]:
+    """``(created_at, id)`` of the last case on the previous page; 400 if the cursor is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, case_id = json.loads(raw)
+        return dt.datetime.fromisoformat(created_at), int(case_id)
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def encode_rank_cursor(rank: float, case_id: int) -> str:
+    raw = json.dumps(["rank", rank, case_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    """``(rank, id)`` of the last case on the previous page of a ranked search; 400 if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        tag, rank, case_id = json.loads(raw)
+        if tag != "rank":
+            raise ValueError(tag)
+        return float(rank), int(case_id)
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
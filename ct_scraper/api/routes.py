@@ -2,17 +2,23 @@
 from __future__ import annotations
 
 import datetime as dt
-from typing import Optional
+from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from urllib.parse import quote_plus
-from sqlalchemy import select, or_
-from sqlalchemy.orm import Session, selectinload
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from .. import schemas
-from ..database import get_session
-from ..counties import TOWN_TO_COUNTY
-from ..models import Case, Party, Subscriber
+from ..data_version import get_data_version
+from ..database import SessionLocal, engine, get_async_session
+from ..models import Subscriber
+from .cache import CachedResponse, cache_key, cached_page_async
+from .filters import filtered_cases
+from .pagination import NEXT_CURSOR_HEADER, encode_cursor, encode_rank_cursor
+from .serialization import cases_json, load_parties
+from .streaming import MEDIA_TYPES, parquet_available, stream_cases
 
 router = APIRouter()
 
@@ -23,106 +29,105 @@ def health() -> schemas.HealthOut:
 
 
 @router.get("/cases", response_model=list[schemas.CaseOut])
-def list_cases(
+async def list_cases(
+    request: Request,
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, max_length=200, description="X-Next-Cursor from the previous page"),
     since_hours: Optional[int] = Query(None, ge=1, le=720),
     search: Optional[str] = Query(None, min_length=1, max_length=120),
     county: Optional[str] = Query(None, min_length=1, max_length=50),
     town: Optional[str] = Query(None, min_length=1, max_length=80),
     date_from: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
     date_to: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
-    session: Session = Depends(get_session),
+    bbox: Optional[str] = Query(None, max_length=100, description="minLng,minLat,maxLng,maxLat"),
+    near: Optional[str] = Query(None, max_length=50, description="lat,lng; use with radius"),
+    radius: Optional[float] = Query(None, gt=0, le=100, description="Miles from near"),
+    session: AsyncSession = Depends(get_async_session),
 ):
-    stmt = select(Case).options(selectinload(Case.parties)).order_by(Case.created_at.desc())
-
-    if since_hours:
-        cutoff = dt.datetime.utcnow() - dt.timedelta(hours=since_hours)
-        stmt = stmt.where(Case.created_at >= cutoff)
-
-    if search:
-        pattern = f"%{search.strip()}%"
-        stmt = stmt.where(
-            or_(
-                Case.docket_no.ilike(pattern),
-                Case.town.ilike(pattern),
-                Case.property_address.ilike(pattern),
-            )
-        )
-
-    if county:
-        # Filter by county using the TOWN_TO_COUNTY mapping
-        towns_in_county = [town for town, c in TOWN_TO_COUNTY.items() if c == county]
-        if towns_in_county:
-            stmt = stmt.where(Case.town.in_(towns_in_county))
-
-    if town:
-        stmt = stmt.where(Case.town == town.strip())
-
-    if date_from:
-        try:
-            from_date = dt.datetime.strptime(date_from, "%Y-%m-%d").date()
-            stmt = stmt.where(Case.created_at >= from_date)
-        except ValueError:
-            pass  # Invalid date format, ignore
-
-    if date_to:
-        try:
-            to_date = dt.datetime.strptime(date_to, "%Y-%m-%d").date()
-            # Add one day to include the entire end date
-            to_date_next = to_date + dt.timedelta(days=1)
-            stmt = stmt.where(Case.created_at < to_date_next)
-        except ValueError:
-            pass  # Invalid date format, ignore
-
-    stmt = stmt.limit(limit)
-    cases = session.scalars(stmt).all()
-
-    return [
-        schemas.CaseOut(
-            docket_no=case.docket_no,
-            case_url=f"https://civilinquiry.jud.ct.gov/CaseDetail/PublicCaseDetail.aspx?DocketNo={quote_plus(case.docket_no.strip())}",
-            town=case.town,
-            county=TOWN_TO_COUNTY.get(case.town, ""),
-            case_type=case.case_type,
-            court_location=case.court_location,
-            property_address=case.property_address,
-            list_type=case.list_type,
-            trial_list_claim=case.trial_list_claim,
-            last_action_date=case.last_action_date,
-            latitude=case.latitude,
-            longitude=case.longitude,
-            created_at=case.created_at,
-            parties=[
-                schemas.PartyOut(
-                    role=party.role,
-                    name=party.name,
-                    attorney=party.attorney,
-                    attorney_address=party.attorney_address,
-                    file_date=party.file_date,
-                )
-                for party in case.parties
-            ],
-        )
-        for case in cases
-    ]
+    params = dict(
+        limit=limit, cursor=cursor, since_hours=since_hours, search=search,
+        county=county, town=town, date_from=date_from, date_to=date_to, bbox=bbox, near=near, radius=radius,
+    )
+    # A page only changes when a writer bumps the data version, so (version, params) names it.
+    # since_hours is relative to the clock instead and is never cached.
+    key = None if since_hours else cache_key(request.url.path, params, await session.run_sync(get_data_version))
+    # The query and serialization are shared with the sync code paths; run_sync awaits the driver underneath.
+    page, headers = await cached_page_async(request, key, lambda: session.run_sync(_cases_page, **params))
+    if page is None:
+        return Response(status_code=304, headers=headers)
+
+    if page.next_cursor:
+        headers[NEXT_CURSOR_HEADER] = page.next_cursor
+        headers["Link"] = f'<{request.url.include_query_params(cursor=page.next_cursor)}>; rel="next"'
+    return Response(content=page.body, media_type="application/json", headers=headers)
+
+
+def _cases_page(session: Session, *, limit: int, cursor: Optional[str], **filters: Any) -> CachedResponse:
+    stmt, rank = filtered_cases(session.get_bind().dialect.name, cursor=cursor, **filters)
+    if rank is not None:
+        # Ranked search results resume from the last row's (rank, id) instead of (created_at, id).
+        stmt = stmt.add_columns(rank.label("search_rank"))
+
+    # One extra row tells us whether there is a next page.
+    rows = session.execute(stmt.limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        if rank is None:
+            next_cursor = encode_cursor(last.created_at, last.id)
+        else:
+            next_cursor = encode_rank_cursor(last.search_rank, last.id)
+
+    # Serialized here rather than through response_model, which would build and
+    # validate a CaseOut per row; the declared model still documents the shape.
+    return CachedResponse(cases_json(rows, load_parties(session, [row.id for row in rows])), next_cursor)
+
+
+@router.get("/cases/export")
+def export_cases(
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv|parquet)$"),
+    since_hours: Optional[int] = Query(None, ge=1, le=720),
+    search: Optional[str] = Query(None, min_length=1, max_length=120),
+    county: Optional[str] = Query(None, min_length=1, max_length=50),
+    town: Optional[str] = Query(None, min_length=1, max_length=80),
+    date_from: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    date_to: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    bbox: Optional[str] = Query(None, max_length=100, description="minLng,minLat,maxLng,maxLat"),
+    near: Optional[str] = Query(None, max_length=50, description="lat,lng; use with radius"),
+    radius: Optional[float] = Query(None, gt=0, le=100, description="Miles from near"),
+):
+    """Every case matching the /cases filters, with parties, streamed as NDJSON, CSV or Parquet."""
+    if fmt == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export needs pyarrow installed on the server")
+    stmt, _ = filtered_cases(
+        engine.dialect.name, since_hours=since_hours, search=search, county=county, town=town,
+        date_from=date_from, date_to=date_to, bbox=bbox, near=near, radius=radius,
+    )
+    return StreamingResponse(
+        stream_cases(SessionLocal, stmt, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="cases.{fmt}"'},
+    )
 
 
 @router.post("/subscribers", response_model=schemas.SubscriberOut, status_code=201)
-def create_subscriber(
+async def create_subscriber(
     payload: schemas.SubscriberCreate,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ):
-    existing = session.scalar(select(Subscriber).where(Subscriber.email == payload.email))
+    existing = await session.scalar(select(Subscriber).where(Subscriber.email == payload.email))
     if existing:
         raise HTTPException(status_code=409, detail="Subscriber already exists")
     subscriber = Subscriber(email=payload.email, is_active=True)
     session.add(subscriber)
-    session.commit()
-    session.refresh(subscriber)
+    await session.commit()
+    await session.refresh(subscriber)
     return subscriber
 
 
 @router.get("/subscribers", response_model=list[schemas.SubscriberOut])
-def list_subscribers(session: Session = Depends(get_session)):
+async def list_subscribers(session: AsyncSession = Depends(get_async_session)):
     stmt = select(Subscriber).order_by(Subscriber.created_at.desc())
-    return list(session.scalars(stmt))
+    return list(await session.scalars(stmt))
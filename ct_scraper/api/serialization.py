@@ -0,0 +1,92 @@
+"""GET /cases response bytes built straight from selected columns, without pydantic models."""
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Dict, List, Sequence
+from urllib.parse import quote_plus
+
+from pydantic_core import to_json
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None  # type: ignore
+
+from ..counties import county_for_town
+from ..models import Case, Party
+
+CASE_URL_PREFIX = "https://civilinquiry.jud.ct.gov/CaseDetail/PublicCaseDetail.aspx?DocketNo="
+
+# Exactly what schemas.CaseOut exposes, plus the id for the cursor and the party lookup.
+CASE_COLUMNS = (
+    Case.id,
+    Case.docket_no,
+    Case.town,
+    Case.county,
+    Case.case_type,
+    Case.court_location,
+    Case.property_address,
+    Case.list_type,
+    Case.trial_list_claim,
+    Case.last_action_date,
+    Case.latitude,
+    Case.longitude,
+    Case.geocode_precision,
+    Case.created_at,
+)
+PARTY_COLUMNS = (Party.case_id, Party.role, Party.name, Party.attorney, Party.mailing_address, Party.file_date)
+
+
+def dumps(obj: Any) -> bytes:
+    """orjson when installed, else pydantic-core; both write datetimes as ISO 8601 like the response models."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return to_json(obj)
+
+
+def case_url(docket_no: str) -> str:
+    docket = docket_no.strip()
+    # Stored dockets are alphanumeric; only quote the odd one that is not.
+    return CASE_URL_PREFIX + (docket if docket.isalnum() else quote_plus(docket))
+
+
+def load_parties(session: Session, case_ids: Sequence[int]) -> Dict[int, List[Dict[str, str]]]:
+    """``PartyOut`` dicts per case id, in one query for the whole page."""
+    parties: Dict[int, List[Dict[str, str]]] = defaultdict(list)
+    if not case_ids:
+        return parties
+    stmt = select(*PARTY_COLUMNS).where(Party.case_id.in_(case_ids)).order_by(Party.case_id, Party.id)
+    for case_id, role, name, attorney, mailing_address, file_date in session.execute(stmt):
+        parties[case_id].append(
+            {"role": role, "name": name, "attorney": attorney, "attorney_address": mailing_address, "file_date": file_date}
+        )
+    return parties
+
+
+def case_dict(row: Row, parties: List[Dict[str, str]]) -> Dict[str, Any]:
+    """One ``schemas.CaseOut`` as a plain dict from a ``CASE_COLUMNS`` row."""
+    return {
+        "docket_no": row.docket_no,
+        "case_url": case_url(row.docket_no),
+        "town": row.town,
+        "county": row.county or county_for_town(row.town),
+        "case_type": row.case_type,
+        "court_location": row.court_location,
+        "property_address": row.property_address,
+        "list_type": row.list_type,
+        "trial_list_claim": row.trial_list_claim,
+        "last_action_date": row.last_action_date,
+        "latitude": row.latitude,
+        "longitude": row.longitude,
+        "geocode_precision": row.geocode_precision,
+        "created_at": row.created_at,
+        "parties": parties,
+    }
+
+
+def cases_json(rows: Sequence[Row], parties: Dict[int, List[Dict[str, str]]]) -> bytes:
+    """Serialize ``CASE_COLUMNS`` rows to the same JSON array ``list[schemas.CaseOut]`` produces."""
+    return dumps([case_dict(row, parties.get(row.id, [])) for row in rows])
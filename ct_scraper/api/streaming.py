@@ -0,0 +1,156 @@
+"""Chunked NDJSON / CSV / Parquet encoders for GET /cases/export."""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Any, Callable, Dict, Iterator, List, Sequence
+
+from sqlalchemy import Select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = None  # type: ignore
+    pq = None  # type: ignore
+
+from .serialization import case_dict, dumps, load_parties
+
+# Rows per server-side fetch; each chunk is one party query and one piece of the response.
+EXPORT_CHUNK_ROWS = 1000
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+# Flat columns for CSV and Parquet; parties travel as a JSON array like ct_scraper.export.
+FLAT_COLUMNS = (
+    "docket_no", "case_url", "town", "county", "case_type", "court_location", "property_address",
+    "list_type", "trial_list_claim", "last_action_date", "latitude", "longitude", "geocode_precision", "created_at",
+    "parties_json",
+)
+
+
+def _flat(record: Dict[str, Any]) -> Dict[str, Any]:
+    flat = {name: record[name] for name in FLAT_COLUMNS[:-1]}
+    flat["parties_json"] = json.dumps(record["parties"], ensure_ascii=False)
+    return flat
+
+
+def _ndjson(records: List[Dict[str, Any]]) -> bytes:
+    return b"".join(dumps(record) + b"\n" for record in records)
+
+
+class _CsvEncoder:
+    def __init__(self) -> None:
+        self._buffer = io.StringIO()
+        self._writer = csv.DictWriter(self._buffer, fieldnames=FLAT_COLUMNS)
+
+    def header(self) -> bytes:
+        self._writer.writeheader()
+        return self._drain()
+
+    def __call__(self, records: List[Dict[str, Any]]) -> bytes:
+        for record in records:
+            flat = _flat(record)
+            flat["created_at"] = flat["created_at"].isoformat() if flat["created_at"] else ""
+            self._writer.writerow(flat)
+        return self._drain()
+
+    def _drain(self) -> bytes:
+        out = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return out
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back whatever pyarrow wrote since the last drain."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def drain(self) -> bytes:
+        out = b"".join(self._chunks)
+        self._chunks = []
+        return out
+
+
+class _ParquetEncoder:
+    """One row group per chunk, streamed as soon as it is written; the footer follows the last."""
+
+    def __init__(self) -> None:
+        self._schema = pa.schema(
+            [(name, pa.string()) for name in FLAT_COLUMNS[:10]]
+            + [("latitude", pa.float64()), ("longitude", pa.float64()), ("geocode_precision", pa.string())]
+            + [("created_at", pa.timestamp("us"))]
+            + [("parties_json", pa.string())]
+        )
+        self._sink = _ChunkSink()
+        self._writer = pq.ParquetWriter(self._sink, self._schema)
+
+    def __call__(self, records: List[Dict[str, Any]]) -> bytes:
+        self._writer.write_table(pa.Table.from_pylist([_flat(r) for r in records], schema=self._schema))
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+def parquet_available() -> bool:
+    return pa is not None
+
+
+def stream_cases(
+    session_factory: Callable[[], Session],
+    stmt: Select,
+    fmt: str,
+    *,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> Iterator[bytes]:
+    """Yield ``stmt`` (a select of ``CASE_COLUMNS``) encoded as ``fmt``, ``chunk_rows`` cases at a time.
+
+    The generator owns its session so it outlives the request handler. Rows come
+    from a server-side cursor (``yield_per``), so memory is bounded by one chunk
+    however many cases match.
+    """
+    encoder: Callable[[List[Dict[str, Any]]], bytes]
+    if fmt == "csv":
+        encoder = _CsvEncoder()
+        yield encoder.header()
+    elif fmt == "parquet":
+        encoder = _ParquetEncoder()
+    else:
+        encoder = _ndjson
+
+    session = session_factory()
+    try:
+        result = session.execute(stmt.execution_options(yield_per=chunk_rows))
+        for chunk in result.partitions():
+            yield encoder(_records(session, chunk))
+        if isinstance(encoder, _ParquetEncoder):
+            yield encoder.close()
+    finally:
+        session.close()
+
+
+def _records(session: Session, rows: Sequence[Row]) -> List[Dict[str, Any]]:
+    parties = load_parties(session, [row.id for row in rows])
+    return [case_dict(row, parties.get(row.id, [])) for row in rows]
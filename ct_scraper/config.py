@@ -22,6 +22,8 @@ def _csv_env(name: str) -> List[str]:
 @dataclass
 class Settings:
     database_url: str = os.getenv("DATABASE_URL", "sqlite:///./data/ct_scraper.db")
+    # Connection profile in database.ENGINE_PROFILES: "api" for the web server, "ingest" for scrape/PDF/geocode jobs.
+    db_role: str = os.getenv("DB_ROLE", "api")
     redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
     timezone: str = os.getenv("TIMEZONE", "America/New_York")
     email_from: str = os.getenv("EMAIL_FROM", "leads@example.com")
@@ -30,10 +32,20 @@ class Settings:
     stripe_api_key: str = os.getenv("STRIPE_API_KEY", "")
     stripe_webhook_secret: str = os.getenv("STRIPE_WEBHOOK_SECRET", "")
     openrouter_api_key: str = os.getenv("OPENROUTER_API_KEY", "")
+    geocode_cache_path: str = os.getenv("GEOCODE_CACHE_PATH", "./data/geocode_cache.sqlite3")
+    address_points_path: str = os.getenv("ADDRESS_POINTS_PATH", "./data/ct_address_points.csv")
+    town_centroids_path: str = os.getenv("TOWN_CENTROIDS_PATH", "./data/ct_town_centroids.csv")
+    # Simplified state/county/town GeoJSON written by scripts/fetch_boundaries.py, served under /map/boundaries.
+    boundaries_dir: str = os.getenv("BOUNDARIES_DIR", "./data/boundaries")
+    # GET /cases response cache: "memory" (per process), "redis" (memory in front of redis_url) or "off".
+    response_cache: str = os.getenv("RESPONSE_CACHE", "memory")
+    response_cache_size: int = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+    geocoder_backends: List[str] | None = None
     allowed_towns: List[str] | None = None
 
     def __post_init__(self) -> None:
         self.allowed_towns = _csv_env("ALLOWED_TOWNS") or []
+        self.geocoder_backends = _csv_env("GEOCODER_BACKENDS") or ["local", "nominatim", "centroid"]
 
 
 @lru_cache(maxsize=1)
@@ -171,3 +171,10 @@ TOWN_TO_COUNTY = {
     "Woodbury": "Litchfield",
     "Woodstock": "Windham",
 }
+
+_COUNTY_BY_UPPER_TOWN = {town.upper(): county for town, county in TOWN_TO_COUNTY.items()}
+
+
+def county_for_town(town: str) -> str:
+    """County of ``town`` regardless of case or stray whitespace; empty for unknown towns."""
+    return _COUNTY_BY_UPPER_TOWN.get(" ".join((town or "").upper().split()), "")
@@ -0,0 +1,29 @@
+"""Monotonic version of the case data, bumped in the same transaction as each write."""
+from __future__ import annotations
+
+import datetime as dt
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from .database import insert_ignoring_conflicts
+from .models import DataVersion
+
+ROW_ID = 1
+
+
+def ensure_data_version(session: Session) -> None:
+    insert_ignoring_conflicts(session, DataVersion, [{"id": ROW_ID, "version": 0}], ("id",))
+
+
+def bump_data_version(session: Session) -> None:
+    """Invalidate cached API responses once ``session`` commits."""
+    session.execute(
+        update(DataVersion)
+        .where(DataVersion.id == ROW_ID)
+        .values(version=DataVersion.version + 1, updated_at=dt.datetime.utcnow())
+    )
+
+
+def get_data_version(session: Session) -> int:
+    return session.scalar(select(DataVersion.version).where(DataVersion.id == ROW_ID)) or 0
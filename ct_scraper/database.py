@@ -2,17 +2,105 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
-from typing import Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterator, List, Sequence
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, insert, make_url
+from sqlalchemy.engine import Engine
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from .config import get_settings
 
+
+@dataclass(frozen=True)
+class EngineProfile:
+    """Pool and SQLite locking settings for one kind of process sharing the database."""
+
+    pool_size: int
+    max_overflow: int
+    # Seconds to wait for a pooled connection before giving up.
+    pool_timeout: float
+    # SQLite: milliseconds a statement retries while another connection holds the write lock.
+    busy_timeout_ms: int
+    # SQLite: take the write lock at BEGIN. A deferred transaction that reads and then
+    # writes fails at once, without waiting, if another writer committed in between.
+    begin_immediate: bool
+
+
+# Selected by Settings.db_role (DB_ROLE); see deploy/*.service.
+ENGINE_PROFILES: Dict[str, EngineProfile] = {
+    # uvicorn: many short concurrent reads and the odd subscriber write.
+    "api": EngineProfile(pool_size=10, max_overflow=20, pool_timeout=10, busy_timeout_ms=5_000, begin_immediate=False),
+    # Scrape, PDF download/extract and geocode jobs: a connection or two writing in bulk,
+    # queueing behind one another's transactions rather than failing.
+    "ingest": EngineProfile(pool_size=2, max_overflow=2, pool_timeout=60, busy_timeout_ms=60_000, begin_immediate=True),
+}
+SQLITE_MMAP_BYTES = 256 * 1024 * 1024
+# Postgres: replace connections before a server or proxy idle timeout drops them.
+POOL_RECYCLE_SECONDS = 1800
+
+
+def engine_options(url: str, profile: EngineProfile) -> Dict[str, Any]:
+    """create_engine/create_async_engine keyword arguments for ``profile``."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}  # in-memory databases use a single-connection pool that takes no sizing
+    options: Dict[str, Any] = {
+        "pool_size": profile.pool_size,
+        "max_overflow": profile.max_overflow,
+        "pool_timeout": profile.pool_timeout,
+    }
+    if parsed.get_backend_name() == "postgresql":
+        options.update(pool_pre_ping=True, pool_recycle=POOL_RECYCLE_SECONDS)
+    return options
+
+
+def configure_sqlite(target: Engine, profile: EngineProfile) -> None:
+    """Put every connection of ``target`` in WAL mode with the profile's locking behaviour.
+
+    WAL lets readers run while a writer commits, so the API keeps answering during
+    an ingest. ``synchronous=NORMAL`` syncs at checkpoints rather than on every
+    commit; a power cut can lose the last transactions but not corrupt the file.
+    """
+    if target.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(target, "connect")
+    def _pragmas(dbapi_connection, _record) -> None:
+        # The "begin" listener below issues BEGIN instead of the driver's implicit one.
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA busy_timeout = {profile.busy_timeout_ms}")
+        cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.execute("PRAGMA synchronous = NORMAL")
+        cursor.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_BYTES}")
+        cursor.close()
+
+    @event.listens_for(target, "begin")
+    def _begin(connection) -> None:
+        connection.exec_driver_sql("BEGIN IMMEDIATE" if profile.begin_immediate else "BEGIN")
+
+
+def make_engine(url: str, profile: EngineProfile) -> Engine:
+    created = create_engine(url, future=True, echo=False, **engine_options(url, profile))
+    configure_sqlite(created, profile)
+    return created
+
+
 settings = get_settings()
-engine = create_engine(settings.database_url, future=True, echo=False)
+if settings.db_role not in ENGINE_PROFILES:
+    raise ValueError(f"DB_ROLE must be one of {', '.join(ENGINE_PROFILES)}, not {settings.db_role!r}")
+engine_profile = ENGINE_PROFILES[settings.db_role]
+engine = make_engine(settings.database_url, engine_profile)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
+# asyncio drivers for the async API routes, by the backend named in DATABASE_URL.
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
 
 @contextmanager
 def session_scope() -> Iterator[Session]:
@@ -34,3 +122,51 @@ def get_session() -> Iterator[Session]:
         yield session
     finally:
         session.close()
+
+
+def async_database_url(url: str) -> str:
+    """``url`` with its driver swapped for the asyncio one, e.g. ``sqlite+aiosqlite:///...``."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver configured for {backend!r} databases")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+@lru_cache(maxsize=1)
+def get_async_engine() -> AsyncEngine:
+    """Created on first use, so scripts and workers that never serve async routes need no asyncio driver."""
+    url = async_database_url(settings.database_url)
+    async_engine = create_async_engine(url, echo=False, **engine_options(url, engine_profile))
+    configure_sqlite(async_engine.sync_engine, engine_profile)
+    return async_engine
+
+
+@lru_cache(maxsize=1)
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    # Routes return ORM objects after committing; expiring them would need another round trip.
+    return async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    async with get_async_sessionmaker()() as session:
+        yield session
+
+
+async def dispose_async_engine() -> None:
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+
+
+def insert_ignoring_conflicts(session: Session, model: type, rows: List[dict], conflict_cols: Sequence[str]) -> None:
+    """executemany INSERT that skips rows violating ``conflict_cols`` on SQLite and Postgres."""
+    if not rows:
+        return
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        stmt = sqlite_insert(model).on_conflict_do_nothing(index_elements=list(conflict_cols))
+    elif dialect == "postgresql":
+        stmt = pg_insert(model).on_conflict_do_nothing(index_elements=list(conflict_cols))
+    else:
+        stmt = insert(model)
+    session.execute(stmt, rows)
@@ -0,0 +1,103 @@
+"""Fetch PublicCaseDetail pages over HTTP with bounded concurrency and per-host throttling."""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .parsers import CaseRow, parse_case_row
+from .throttle import get_throttle
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/126.0 Safari/537.36"
+)
+
+
+def build_session(pool_size: int = 8) -> requests.Session:
+    """A pooled session that retries idempotent requests on gateway errors."""
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+class DetailFetcher:
+    """Download and parse case detail pages concurrently, yielding CaseRows in link order.
+
+    Requests to each host share that host's process-wide AdaptiveThrottle, with
+    ``rate_per_host`` as its ceiling. A detail page that still fails after the
+    adapter's retries, or that does not parse, is logged and skipped so one bad
+    docket does not abort the whole town.
+    """
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        *,
+        concurrency: int = 4,
+        rate_per_host: float = 4.0,
+        timeout: float = 20.0,
+    ) -> None:
+        self.concurrency = max(1, concurrency)
+        self.session = session or build_session(self.concurrency)
+        self.rate_per_host = rate_per_host
+        self.timeout = timeout
+        self.fetched = 0
+        self.failed = 0
+        self._stats_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="detail")
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def fetch(self, town: str, hrefs: Iterable[str]) -> Iterator[CaseRow]:
+        futures = [self._executor.submit(self._fetch_one, town, href) for href in hrefs]
+        for future in futures:
+            row = future.result()
+            if row is not None:
+                yield row
+
+    def _fetch_one(self, town: str, href: str) -> Optional[CaseRow]:
+        throttle = get_throttle(urlparse(href).netloc, max_rate=self.rate_per_host)
+        throttle.wait()
+        start = time.monotonic()
+        try:
+            resp = self.session.get(href, timeout=self.timeout)
+            throttle.record_status(resp.status_code, time.monotonic() - start)
+            resp.raise_for_status()
+        except requests.RequestException as exc:
+            if not isinstance(exc, requests.HTTPError):
+                throttle.record(time.monotonic() - start, ok=False)
+            with self._stats_lock:
+                self.failed += 1
+            logger.warning("Detail fetch failed for %s: %s", href, exc)
+            return None
+        try:
+            row = parse_case_row(resp.content, town, resp.url)
+        except Exception:
+            # A page the parser does not recognise is a miss for this docket, not for the town.
+            with self._stats_lock:
+                self.failed += 1
+            logger.exception("Detail parse failed for %s", href)
+            return None
+        with self._stats_lock:
+            self.fetched += 1
+        return row
@@ -0,0 +1,121 @@
+"""Streaming CSV / Parquet export of scraped CaseRows."""
+from __future__ import annotations
+
+import csv
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Union
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = None  # type: ignore
+    pq = None  # type: ignore
+
+from .parsers import CaseRow, docket_from_link
+
+EXPORT_COLUMNS = (
+    "docket_no",
+    "town",
+    "case_type",
+    "court_location",
+    "property_address",
+    "list_type",
+    "trial_list_claim",
+    "last_action_date",
+    "docket_link",
+    "parties_json",
+)
+
+
+def case_record(row: CaseRow) -> Dict[str, str]:
+    """Flatten a CaseRow into one export record; parties are kept as a JSON array."""
+    return {
+        "docket_no": docket_from_link(row.docket_link),
+        "town": row.town,
+        "case_type": row.case_type,
+        "court_location": row.court_location,
+        "property_address": row.property_address,
+        "list_type": row.list_type,
+        "trial_list_claim": row.trial_list_claim,
+        "last_action_date": row.last_action_date,
+        "docket_link": row.docket_link,
+        "parties_json": json.dumps(row.parties, ensure_ascii=False),
+    }
+
+
+class CaseCsvWriter:
+    """Append rows to a CSV file as they arrive; nothing is held in memory."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.rows = 0
+        self._file = self.path.open("w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=EXPORT_COLUMNS)
+        self._writer.writeheader()
+
+    def write(self, row: CaseRow) -> None:
+        self._writer.writerow(case_record(row))
+        self.rows += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "CaseCsvWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class CaseParquetWriter:
+    """Write rows to Parquet one row group per ``row_group_size`` rows."""
+
+    def __init__(self, path: str | Path, *, row_group_size: int = 5000) -> None:
+        if pa is None:
+            raise RuntimeError("pyarrow not installed; install it to export Parquet")
+        self.path = Path(path)
+        self.rows = 0
+        self.row_group_size = max(1, row_group_size)
+        self._schema = pa.schema([(name, pa.string()) for name in EXPORT_COLUMNS])
+        self._writer: Any = pq.ParquetWriter(str(self.path), self._schema)
+        self._buffer: List[Dict[str, str]] = []
+
+    def write(self, row: CaseRow) -> None:
+        self._buffer.append(case_record(row))
+        self.rows += 1
+        if len(self._buffer) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._buffer:
+            self._writer.write_table(pa.Table.from_pylist(self._buffer, schema=self._schema))
+            self._buffer = []
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+    def __enter__(self) -> "CaseParquetWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+CaseWriter = Union[CaseCsvWriter, CaseParquetWriter]
+
+
+def open_case_writer(path: str | Path) -> CaseWriter:
+    """Pick the export format from the file suffix (``.parquet`` or CSV otherwise)."""
+    if Path(path).suffix.lower() in {".parquet", ".pq"}:
+        return CaseParquetWriter(path)
+    return CaseCsvWriter(path)
+
+
+def export_rows(rows: Iterable[CaseRow], path: str | Path) -> int:
+    with open_case_writer(path) as writer:
+        for row in rows:
+            writer.write(row)
+        return writer.rows
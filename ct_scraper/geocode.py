@@ -1,68 +1,194 @@
 """Geocoding helpers with caching."""
 from __future__ import annotations
 
-import json
+import logging
+import threading
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from geopy.exc import GeocoderServiceError
-from geopy.geocoders import Nominatim
+from geopy.geocoders import Nominatim, Photon
 from geopy.extra.rate_limiter import RateLimiter
 
+from .address import address_key, strip_locality, strip_unit
+from .config import get_settings
+from .geocode_cache import GeocodeCache
+from .geocoders import (
+    ADDRESS_PRECISION,
+    Geocoder,
+    GeocoderChain,
+    LocalGeocoder,
+    Located,
+    ParallelGeocoders,
+    TownCentroidGeocoder,
+)
+from .geohash import encode as encode_geohash
+
+logger = logging.getLogger(__name__)
+
 BASE_DIR = Path(__file__).resolve().parents[1]
-CACHE_PATH = BASE_DIR / "geocode_cache.json"
+# Pre-SQLite cache; imported into the cache store the first time it is opened.
+LEGACY_CACHE_PATH = BASE_DIR / "geocode_cache.json"
+
+USER_AGENT = "ct-scraper-service"
+REMOTE_PROVIDERS = {"nominatim": Nominatim, "photon": Photon}
+
+_cache: Optional[GeocodeCache] = None
+_geocoder: Optional[GeocoderChain] = None
+_init_lock = threading.Lock()
+
+
+def get_cache() -> GeocodeCache:
+    global _cache
+    with _init_lock:
+        if _cache is None:
+            cache = GeocodeCache(get_settings().geocode_cache_path)
+            if LEGACY_CACHE_PATH.exists() and not len(cache):
+                cache.import_json(LEGACY_CACHE_PATH)
+            _cache = cache
+        return _cache
+
+
+class RemoteGeocoder:
+    """Lookups through a geopy provider at ``min_delay`` seconds apart, cached in the cache store.
+
+    Hits are shared by every provider under the normalized address key; misses
+    are recorded per provider, so one provider's miss does not stop another
+    from trying the address. Only an answer with no result is a miss: a timeout
+    or error response is retried ``max_retries`` times, ``error_wait`` seconds
+    apart, then raised as geopy's ``GeocoderServiceError`` without caching anything.
+    """
+
+    precision = ADDRESS_PRECISION
 
-_geolocator: Optional[Nominatim] = None
-_rate_limiter: Optional[RateLimiter] = None
-_cache: dict[str, dict[str, float]] = {}
+    def __init__(self, name: str, *, min_delay: float = 1.0, max_retries: int = 2, error_wait: float = 5.0) -> None:
+        if name not in REMOTE_PROVIDERS:
+            raise ValueError(f"unknown geocoder backend {name!r}")
+        self.name = name
+        self.min_delay = min_delay
+        self.max_retries = max_retries
+        self.error_wait = error_wait
+        self._rate_limiter: Optional[RateLimiter] = None
 
+    def _lookup(self, query: str):
+        if self._rate_limiter is None:
+            provider = REMOTE_PROVIDERS[self.name](user_agent=USER_AGENT, timeout=15)
+            self._rate_limiter = RateLimiter(
+                provider.geocode,
+                min_delay_seconds=self.min_delay,
+                max_retries=self.max_retries,
+                error_wait_seconds=self.error_wait,
+                swallow_exceptions=False,
+            )
+        return self._rate_limiter(query)
 
-def _ensure_cache_loaded() -> None:
-    if _cache:
-        return
-    if CACHE_PATH.exists():
-        try:
-            data = json.loads(CACHE_PATH.read_text())
-        except json.JSONDecodeError:
-            data = {}
-        _cache.update(data)
+    def geocode(self, address: str, town: str) -> Optional[Tuple[float, float]]:
+        key = address_key(address, town)
+        if not key:
+            return None
+        cache = get_cache()
+        miss_key = f"{self.name}:{key}"
+        cached = cache.get(key)
+        if cached is None or not cached.found:
+            # Entries written before keys were normalized are keyed by the raw query string.
+            cached = cache.get(f"{address}, {town}, CT")
+            if cached is not None and cached.found:
+                cache.put(key, cached.coords)
+            else:
+                cached = cache.get(miss_key)
+        cache.record_lookup(cached is not None)
+        if cached is not None:
+            return cached.coords
 
+        location = self._lookup(f"{strip_unit(strip_locality(address))}, {town}, CT")
+        if location is None:
+            cache.put(miss_key, None)
+            return None
 
-def _save_cache() -> None:
-    try:
-        CACHE_PATH.write_text(json.dumps(_cache, indent=2))
-    except OSError:
-        pass
+        coords = (float(location.latitude), float(location.longitude))
+        cache.put(key, coords)
+        return coords
 
 
-def _get_rate_limiter() -> RateLimiter:
-    global _geolocator, _rate_limiter
-    if _rate_limiter is None:
-        _geolocator = Nominatim(user_agent="ct-scraper-service", timeout=15)
-        _rate_limiter = RateLimiter(_geolocator.geocode, min_delay_seconds=1)
-    return _rate_limiter
+def build_geocoder(backends: Sequence[str]) -> GeocoderChain:
+    """A chain of the named backends, skipping unavailable ones.
+
+    Names are ``local``, ``centroid`` and the remote providers in ``REMOTE_PROVIDERS``;
+    ``nominatim|photon`` runs those providers concurrently as one link of the chain.
+    """
+    settings = get_settings()
+    chain: List[Geocoder] = []
+    local: Optional[LocalGeocoder] = None
+    for name in backends:
+        if "|" in name:
+            chain.append(ParallelGeocoders([RemoteGeocoder(n.strip()) for n in name.split("|")]))
+        elif name == "local":
+            path = Path(settings.address_points_path)
+            if not path.exists():
+                logger.info("Local geocoder disabled: %s not found", path)
+                continue
+            try:
+                local = LocalGeocoder(path)
+            except (RuntimeError, ValueError) as exc:
+                logger.warning("Local geocoder disabled: %s", exc)
+                continue
+            chain.append(local)
+        elif name in REMOTE_PROVIDERS:
+            chain.append(RemoteGeocoder(name))
+        elif name == "centroid":
+            path = Path(settings.town_centroids_path)
+            if path.exists():
+                chain.append(TownCentroidGeocoder.from_csv(path))
+            elif local is not None:
+                chain.append(TownCentroidGeocoder(local.town_centroids()))
+            else:
+                logger.info("Town centroid fallback disabled: %s not found and no address points loaded", path)
+        else:
+            raise ValueError(f"unknown geocoder backend {name!r}")
+    return GeocoderChain(chain)
+
+
+def get_geocoder() -> GeocoderChain:
+    """Process-wide chain configured by ``GEOCODER_BACKENDS``."""
+    global _geocoder
+    with _init_lock:
+        if _geocoder is None:
+            _geocoder = build_geocoder(get_settings().geocoder_backends)
+        return _geocoder
 
 
 def geocode_address(address: str, town: str) -> Optional[Tuple[float, float]]:
-    """Return (lat, lng) for an address using cached values when possible."""
+    """Return (lat, lng) for an address from the first backend in the chain that knows it."""
     if not address or not town:
         return None
+    return get_geocoder().geocode(address, town)
 
-    _ensure_cache_loaded()
-    key = f"{address}, {town}, CT"
-    if key in _cache:
-        data = _cache[key]
-        return data.get("lat"), data.get("lng")
 
-    rate_limiter = _get_rate_limiter()
-    try:
-        location = rate_limiter(key)
-    except GeocoderServiceError:
-        return None
-    if location is None:
-        return None
+def geocode_many(queries: Sequence[Tuple[str, str]]) -> List[Optional[Tuple[float, float]]]:
+    """Batch form of ``geocode_address``; local backends resolve the whole batch at once."""
+    return [located[0] if located else None for located in locate_many(queries)]
+
+
+def locate_many(queries: Sequence[Tuple[str, str]]) -> List[Optional[Located]]:
+    """``geocode_many`` with the precision of each answer, for writing to ``cases``."""
+    results: List[Optional[Located]] = [None] * len(queries)
+    usable = [i for i, (address, town) in enumerate(queries) if address and town]
+    found = get_geocoder().locate_many([queries[i] for i in usable])
+    for i, located in zip(usable, found):
+        results[i] = located
+    return results
+
+
+def case_location(case_id: int, located: Located) -> Dict[str, Any]:
+    """``update(Case)`` parameters for a geocode result.
 
-    coords = (float(location.latitude), float(location.longitude))
-    _cache[key] = {"lat": coords[0], "lng": coords[1]}
-    _save_cache()
-    return coords
+    Only address-precision points get a geohash: the map clusters and the bbox and
+    radius filters select on it, so a town centroid is kept out of them.
+    """
+    (lat, lng), precision = located
+    return {
+        "id": case_id,
+        "latitude": lat,
+        "longitude": lng,
+        "geocode_precision": precision,
+        "geohash": encode_geohash(lat, lng) if precision == ADDRESS_PRECISION else None,
+    }
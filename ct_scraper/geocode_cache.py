@@ -0,0 +1,126 @@
+"""Persistent geocode cache in a local SQLite file shared by every process on the host."""
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Misses are cached too, but retried once they are older than this.
+NEGATIVE_TTL_SECONDS = 30 * 24 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS geocode_cache (
+    key TEXT PRIMARY KEY,
+    lat REAL,
+    lng REAL,
+    found INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+@dataclass
+class CacheEntry:
+    lat: Optional[float]
+    lng: Optional[float]
+    found: bool
+
+    @property
+    def coords(self) -> Optional[Tuple[float, float]]:
+        if not self.found or self.lat is None or self.lng is None:
+            return None
+        return self.lat, self.lng
+
+
+class GeocodeCache:
+    """Keyed reads and single-row upserts; nothing is loaded or rewritten wholesale.
+
+    The file runs in WAL mode with a busy timeout so the API, scrape and backfill
+    processes can read and write it at the same time. Each thread gets its own
+    connection.
+    """
+
+    def __init__(self, path: str | Path, *, negative_ttl: float = NEGATIVE_TTL_SECONDS) -> None:
+        self.path = Path(path)
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(SCHEMA)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """The cached result for ``key``, or None if absent or an expired miss."""
+        row = self._conn().execute(
+            "SELECT lat, lng, found, updated_at FROM geocode_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        lat, lng, found, updated_at = row
+        if not found and time.time() - updated_at > self.negative_ttl:
+            return None
+        return CacheEntry(lat, lng, bool(found))
+
+    def record_lookup(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def put(self, key: str, coords: Optional[Tuple[float, float]]) -> None:
+        """Store a hit, or a miss when ``coords`` is None."""
+        lat, lng = coords if coords else (None, None)
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO geocode_cache (key, lat, lng, found, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (key, lat, lng, int(coords is not None), time.time()),
+            )
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM geocode_cache").fetchone()[0]
+
+    def import_json(self, path: str | Path) -> int:
+        """Copy entries from the legacy ``geocode_cache.json``; existing keys win. Returns rows added."""
+        try:
+            data = json.loads(Path(path).read_text())
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Could not read legacy geocode cache %s: %s", path, exc)
+            return 0
+        now = time.time()
+        rows = [
+            (key, value.get("lat"), value.get("lng"), 1, now)
+            for key, value in data.items()
+            if isinstance(value, dict) and value.get("lat") is not None and value.get("lng") is not None
+        ]
+        conn = self._conn()
+        with conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO geocode_cache (key, lat, lng, found, updated_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            return conn.total_changes - before
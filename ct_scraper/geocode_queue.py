@@ -0,0 +1,175 @@
+"""Work queue of cases that still need coordinates, drained outside the scrape run."""
+from __future__ import annotations
+
+import datetime as dt
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from geopy.exc import GeocoderServiceError
+from sqlalchemy import and_, delete, func, insert, literal, or_, select, update
+from sqlalchemy.orm import Session
+
+from .address import address_key
+from .data_version import bump_data_version
+from .database import insert_ignoring_conflicts, session_scope
+from .geocode import case_location, locate_many
+from .geocoders import TOWN_PRECISION, Located
+from .models import Case, GeocodeJob
+
+logger = logging.getLogger(__name__)
+
+# A miss is retried after RETRY_DELAY * attempts, up to MAX_ATTEMPTS lookups; then the job is given up.
+# A town centroid counts as a miss here, though its coordinates are stored meanwhile.
+RETRY_DELAY = dt.timedelta(hours=6)
+MAX_ATTEMPTS = 3
+
+
+@dataclass
+class DrainStats:
+    processed: int = 0
+    geocoded: int = 0
+    missed: int = 0
+    # Misses that used up the last attempt.
+    gave_up: int = 0
+    # Jobs left due because a geocoder errored; they do not count as attempts.
+    deferred: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.geocoded / self.processed if self.processed else 0.0
+
+
+def enqueue_cases(session: Session, case_ids: Iterable[int]) -> None:
+    """Queue ``case_ids`` inside the caller's transaction; already queued cases are ignored."""
+    now = dt.datetime.utcnow()
+    rows = [{"case_id": case_id, "attempts": 0, "not_before": now, "enqueued_at": now} for case_id in case_ids]
+    insert_ignoring_conflicts(session, GeocodeJob, rows, ("case_id",))
+
+
+def enqueue_missing() -> int:
+    """Queue every stored case with an address but no coordinates, or only its town's, that is not queued yet."""
+    now = dt.datetime.utcnow()
+    missing = (
+        select(Case.id, literal(0), literal(now), literal(now))
+        .where(
+            or_(Case.latitude.is_(None), Case.geocode_precision == TOWN_PRECISION),
+            Case.property_address != "",
+            ~Case.id.in_(select(GeocodeJob.case_id)),
+        )
+    )
+    with session_scope() as session:
+        result = session.execute(
+            insert(GeocodeJob).from_select(["case_id", "attempts", "not_before", "enqueued_at"], missing)
+        )
+        return result.rowcount or 0
+
+
+def pending_jobs(max_attempts: int = MAX_ATTEMPTS) -> int:
+    with session_scope() as session:
+        stmt = select(func.count()).select_from(GeocodeJob).where(*_live(max_attempts))
+        return session.scalar(stmt) or 0
+
+
+def abandoned_jobs(max_attempts: int = MAX_ATTEMPTS) -> int:
+    """Jobs no longer retried: given up by drain_queue, or past ``max_attempts`` from an earlier run."""
+    with session_scope() as session:
+        stmt = select(func.count()).select_from(GeocodeJob).where(~and_(*_live(max_attempts)))
+        return session.scalar(stmt) or 0
+
+
+def drain_queue(
+    limit: Optional[int] = None,
+    *,
+    batch_size: int = 50,
+    max_attempts: int = MAX_ATTEMPTS,
+) -> DrainStats:
+    """Geocode due jobs in batches of ``batch_size`` until the queue (or ``limit``) runs out.
+
+    Lookups go through the configured geocoder chain, so remote ones run at the provider's rate;
+    each batch's coordinates are written and its jobs cleared in one transaction. A job whose
+    ``max_attempts``-th lookup misses is marked given up rather than deleted, so
+    ``enqueue_missing`` does not queue the case again. If a provider errors (timeout, 429, 503)
+    the batch is left as it was and the drain stops, so the next run asks again.
+    """
+    stats = DrainStats()
+    last_id = 0
+    while limit is None or stats.processed < limit:
+        size = batch_size if limit is None else min(batch_size, limit - stats.processed)
+        jobs = _claim_batch(last_id, size, max_attempts)
+        if not jobs:
+            break
+        last_id = jobs[-1][0]
+
+        now = dt.datetime.utcnow()
+        coords: List[dict] = []
+        done: List[int] = []
+        missed: List[dict] = []
+        gave_up = 0
+        # One lookup per distinct normalized address in the batch, resolved as a batch.
+        queries: Dict[str, Tuple[str, str]] = {}
+        for _, _, _, address, town in jobs:
+            queries.setdefault(address_key(address, town), (address, town))
+        try:
+            located = locate_many(list(queries.values()))
+        except GeocoderServiceError as exc:
+            stats.deferred += len(jobs)
+            logger.warning("Geocoder unavailable, leaving %d jobs for the next run: %s", len(jobs), exc)
+            break
+        lookups: Dict[str, Optional[Located]] = dict(zip(queries, located))
+        for job_id, attempts, case_id, address, town in jobs:
+            result = lookups[address_key(address, town)]
+            if result:
+                coords.append(case_location(case_id, result))
+            if result and result[1] != TOWN_PRECISION:
+                done.append(job_id)
+            else:
+                last = attempts + 1 >= max_attempts
+                missed.append({
+                    "id": job_id,
+                    "attempts": attempts + 1,
+                    "not_before": now + RETRY_DELAY * (attempts + 1),
+                    "gave_up_at": now if last else None,
+                })
+                gave_up += last
+        _finish_batch(coords, done, missed)
+
+        stats.processed += len(jobs)
+        stats.geocoded += len(done)
+        stats.missed += len(missed)
+        stats.gave_up += gave_up
+        logger.info("Geocoded %d/%d in batch; %d processed so far", len(done), len(jobs), stats.processed)
+        if gave_up:
+            logger.warning("Gave up on %d addresses after %d attempts", gave_up, max_attempts)
+    return stats
+
+
+def _live(max_attempts: int) -> tuple:
+    return GeocodeJob.gave_up_at.is_(None), GeocodeJob.attempts < max_attempts
+
+
+def _claim_batch(after_id: int, size: int, max_attempts: int) -> List[tuple]:
+    stmt = (
+        select(GeocodeJob.id, GeocodeJob.attempts, Case.id, Case.property_address, Case.town)
+        .join(Case, Case.id == GeocodeJob.case_id)
+        .where(
+            GeocodeJob.id > after_id,
+            *_live(max_attempts),
+            GeocodeJob.not_before <= dt.datetime.utcnow(),
+        )
+        .order_by(GeocodeJob.id)
+        .limit(size)
+    )
+    with session_scope() as session:
+        return [tuple(row) for row in session.execute(stmt)]
+
+
+def _finish_batch(coords: List[dict], done: List[int], missed: List[dict]) -> None:
+    with session_scope() as session:
+        if coords:
+            session.execute(update(Case), coords)
+            bump_data_version(session)
+        if done:
+            session.execute(delete(GeocodeJob).where(GeocodeJob.id.in_(done)))
+        if missed:
+            session.execute(update(GeocodeJob), missed)
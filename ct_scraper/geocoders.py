@@ -0,0 +1,322 @@
+"""Pluggable geocoding backends: local address points, town centroids, and a chain over them."""
+from __future__ import annotations
+
+import csv
+import logging
+import re
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Protocol, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None  # type: ignore
+
+from .address import join_key, normalize_address, normalize_town
+from .counties import TOWN_TO_COUNTY
+
+logger = logging.getLogger(__name__)
+
+Coords = Tuple[float, float]
+Query = Tuple[str, str]
+# Coordinates and the precision of the backend that found them.
+Located = Tuple[Coords, str]
+
+# Case.geocode_precision: a point for the property itself, or only the middle of its town.
+ADDRESS_PRECISION = "address"
+TOWN_PRECISION = "town"
+
+HOUSE_RE = re.compile(r"^(\d+)[A-Z]?(?:-\d+[A-Z]?)?\s+(.+)$")
+# How far outside a street's known house numbers interpolation may extrapolate.
+STREET_RANGE_SLACK = 20
+
+LAT_COLUMNS = ("lat", "latitude", "y")
+LNG_COLUMNS = ("lng", "lon", "long", "longitude", "x")
+TOWN_COLUMNS = ("town", "city", "municipality", "town_name")
+
+
+class Geocoder(Protocol):
+    name: str
+    precision: str
+
+    def geocode(self, address: str, town: str) -> Optional[Coords]:
+        ...
+
+
+def _split_house(street: str) -> Tuple[Optional[int], str]:
+    match = HOUSE_RE.match(street)
+    if not match:
+        return None, street
+    return int(match.group(1)), match.group(2)
+
+
+def _pick(header: Sequence[str], names: Sequence[str]) -> Optional[str]:
+    lowered = {h.lower(): h for h in header}
+    for name in names:
+        if name in lowered:
+            return lowered[name]
+    return None
+
+
+class LocalGeocoder:
+    """Resolve addresses from a CT address-point CSV held in memory.
+
+    The CSV needs a town column, a latitude/longitude pair and either a full
+    ``address`` column or ``number`` + ``street``. Exact matches come from a dict
+    on the normalized address; otherwise the house number is interpolated along
+    the known points of the same street with NumPy.
+    """
+
+    name = "local"
+    precision = ADDRESS_PRECISION
+
+    def __init__(self, path: str | Path) -> None:
+        if np is None:
+            raise RuntimeError("numpy not installed; install it to use the local geocoder")
+        self.path = Path(path)
+        self._exact: Dict[str, int] = {}
+        # (street, town) -> (sorted house numbers, lats, lngs)
+        self._streets: Dict[Tuple[str, str], Tuple["np.ndarray", "np.ndarray", "np.ndarray"]] = {}
+        self.lats = np.empty(0)
+        self.lngs = np.empty(0)
+        self.towns: List[str] = []
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.lats)
+
+    def _load(self) -> None:
+        lats: List[float] = []
+        lngs: List[float] = []
+        by_street: Dict[Tuple[str, str], List[Tuple[int, int]]] = defaultdict(list)
+        with self.path.open(newline="", encoding="utf-8-sig") as fh:
+            reader = csv.DictReader(fh)
+            header = reader.fieldnames or []
+            lat_col, lng_col, town_col = _pick(header, LAT_COLUMNS), _pick(header, LNG_COLUMNS), _pick(header, TOWN_COLUMNS)
+            addr_col, num_col, street_col = _pick(header, ("address",)), _pick(header, ("number",)), _pick(header, ("street",))
+            if not (lat_col and lng_col and town_col and (addr_col or (num_col and street_col))):
+                raise ValueError(f"{self.path}: unrecognised address point columns {header}")
+            for rec in reader:
+                raw = rec[addr_col] if addr_col else f"{rec[num_col]} {rec[street_col]}"
+                try:
+                    lat, lng = float(rec[lat_col]), float(rec[lng_col])
+                except (TypeError, ValueError):
+                    continue
+                town = normalize_town(rec[town_col])
+                normalized = normalize_address(raw)
+                if not normalized:
+                    continue
+                idx = len(lats)
+                lats.append(lat)
+                lngs.append(lng)
+                self.towns.append(town)
+                self._exact.setdefault(join_key(normalized, town), idx)
+                number, street = _split_house(normalized)
+                if number is not None:
+                    by_street[(street, town)].append((number, idx))
+
+        self.lats = np.asarray(lats, dtype=float)
+        self.lngs = np.asarray(lngs, dtype=float)
+        for street_key, points in by_street.items():
+            points.sort()
+            numbers = np.fromiter((n for n, _ in points), dtype=float, count=len(points))
+            idxs = np.fromiter((i for _, i in points), dtype=np.int64, count=len(points))
+            self._streets[street_key] = (numbers, self.lats[idxs], self.lngs[idxs])
+        logger.info("Loaded %d address points on %d streets from %s", len(self.lats), len(self._streets), self.path)
+
+    def geocode(self, address: str, town: str) -> Optional[Coords]:
+        return self.geocode_many([(address, town)])[0]
+
+    def geocode_many(self, queries: Sequence[Query]) -> List[Optional[Coords]]:
+        results: List[Optional[Coords]] = [None] * len(queries)
+        # Queries that need interpolation, grouped per street so each street is one np.interp call.
+        pending: Dict[Tuple[str, str], List[Tuple[int, int]]] = defaultdict(list)
+        for pos, (address, town) in enumerate(queries):
+            normalized, town = normalize_address(address), normalize_town(town)
+            idx = self._exact.get(join_key(normalized, town))
+            if idx is not None:
+                results[pos] = (float(self.lats[idx]), float(self.lngs[idx]))
+                continue
+            number, street = _split_house(normalized)
+            if number is not None:
+                pending[(street, town)].append((pos, number))
+
+        for street_key, wanted in pending.items():
+            street = self._streets.get(street_key)
+            if street is None:
+                continue
+            numbers, lats, lngs = street
+            query = np.fromiter((n for _, n in wanted), dtype=float, count=len(wanted))
+            in_range = (query >= numbers[0] - STREET_RANGE_SLACK) & (query <= numbers[-1] + STREET_RANGE_SLACK)
+            qlat = np.interp(query, numbers, lats)
+            qlng = np.interp(query, numbers, lngs)
+            for (pos, _), ok, lat, lng in zip(wanted, in_range, qlat, qlng):
+                if ok:
+                    results[pos] = (float(lat), float(lng))
+        return results
+
+    def town_centroids(self) -> Dict[str, Coords]:
+        """Mean position of each town's address points."""
+        if not len(self.lats):
+            return {}
+        names, codes = np.unique(np.asarray(self.towns), return_inverse=True)
+        counts = np.bincount(codes)
+        lat = np.bincount(codes, weights=self.lats) / counts
+        lng = np.bincount(codes, weights=self.lngs) / counts
+        return {str(n): (float(a), float(b)) for n, a, b in zip(names, lat, lng)}
+
+
+class TownCentroidGeocoder:
+    """Last resort: the centroid of the case's town (one of ``TOWN_TO_COUNTY``).
+
+    Its answers carry ``TOWN_PRECISION`` so they are not mistaken for the property's location.
+    """
+
+    name = "centroid"
+    precision = TOWN_PRECISION
+
+    def __init__(self, centroids: Dict[str, Coords]) -> None:
+        known = {normalize_town(t) for t in TOWN_TO_COUNTY}
+        self.centroids = {normalize_town(t): c for t, c in centroids.items() if normalize_town(t) in known}
+        missing = known - set(self.centroids)
+        if missing:
+            logger.info("No centroid for %d towns (e.g. %s)", len(missing), ", ".join(sorted(missing)[:3]))
+
+    @classmethod
+    def from_csv(cls, path: str | Path) -> "TownCentroidGeocoder":
+        centroids: Dict[str, Coords] = {}
+        with Path(path).open(newline="", encoding="utf-8-sig") as fh:
+            reader = csv.DictReader(fh)
+            header = reader.fieldnames or []
+            lat_col, lng_col, town_col = _pick(header, LAT_COLUMNS), _pick(header, LNG_COLUMNS), _pick(header, TOWN_COLUMNS)
+            if not (lat_col and lng_col and town_col):
+                raise ValueError(f"{path}: expected town, lat and lng columns, got {header}")
+            for line, rec in enumerate(reader, start=2):
+                try:
+                    centroids[rec[town_col]] = (float(rec[lat_col]), float(rec[lng_col]))
+                except (TypeError, ValueError):
+                    logger.warning("%s:%d: skipping row with unusable coordinates %r", path, line, rec)
+        return cls(centroids)
+
+    def geocode(self, address: str, town: str) -> Optional[Coords]:
+        return self.centroids.get(normalize_town(town))
+
+
+def _run_many(backend: Geocoder, queries: Sequence[Query]) -> List[Optional[Coords]]:
+    many = getattr(backend, "geocode_many", None)
+    if many is not None:
+        return many(queries)
+    return [backend.geocode(a, t) for a, t in queries]
+
+
+class ParallelGeocoders:
+    """Spread a batch across several rate-limited providers running at the same time.
+
+    Each round splits the unresolved queries evenly over the providers that have
+    not tried them yet, one thread per provider; a provider's misses go to the
+    others in the next round. The threads live as long as the instance; ``close()``
+    (or leaving a ``with`` block) shuts them down.
+    """
+
+    precision = ADDRESS_PRECISION
+
+    def __init__(self, backends: Sequence[Geocoder]) -> None:
+        self.backends = list(backends)
+        self.name = "|".join(b.name for b in self.backends)
+        self.hits: Counter = Counter()
+        self._executor = ThreadPoolExecutor(max_workers=len(self.backends) or 1, thread_name_prefix="geocode")
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "ParallelGeocoders":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def geocode(self, address: str, town: str) -> Optional[Coords]:
+        return self.geocode_many([(address, town)])[0]
+
+    def geocode_many(self, queries: Sequence[Query]) -> List[Optional[Coords]]:
+        results: List[Optional[Coords]] = [None] * len(queries)
+        tried: List[Set[int]] = [set() for _ in queries]
+        remaining = list(range(len(queries)))
+        while remaining:
+            assigned: Dict[int, List[int]] = defaultdict(list)
+            for n, pos in enumerate(remaining):
+                options = [b for b in range(len(self.backends)) if b not in tried[pos]]
+                if options:
+                    assigned[options[n % len(options)]].append(pos)
+            if not assigned:
+                break
+            futures = {
+                b: self._executor.submit(_run_many, self.backends[b], [queries[p] for p in positions])
+                for b, positions in assigned.items()
+            }
+            still: List[int] = []
+            for b, positions in assigned.items():
+                for pos, coords in zip(positions, futures[b].result()):
+                    tried[pos].add(b)
+                    if coords is None:
+                        still.append(pos)
+                    else:
+                        results[pos] = coords
+                        self.hits[self.backends[b].name] += 1
+            remaining = still
+        return results
+
+
+class GeocoderChain:
+    """Try each backend in order; only queries every earlier backend missed reach the next.
+
+    Put rate-limited remote backends after the local ones so their limit only
+    applies to the residual misses. ``hits`` counts answers per backend.
+    """
+
+    def __init__(self, backends: Iterable[Geocoder]) -> None:
+        self.backends = list(backends)
+        self.hits: Counter = Counter()
+
+    @property
+    def name(self) -> str:
+        return "+".join(b.name for b in self.backends)
+
+    def close(self) -> None:
+        """Release backends that hold threads, such as ``ParallelGeocoders``."""
+        for backend in self.backends:
+            close = getattr(backend, "close", None)
+            if close is not None:
+                close()
+
+    def __enter__(self) -> "GeocoderChain":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def geocode(self, address: str, town: str) -> Optional[Coords]:
+        return self.geocode_many([(address, town)])[0]
+
+    def geocode_many(self, queries: Sequence[Query]) -> List[Optional[Coords]]:
+        return [located[0] if located else None for located in self.locate_many(queries)]
+
+    def locate_many(self, queries: Sequence[Query]) -> List[Optional[Located]]:
+        """Like ``geocode_many``, with the precision of the backend that answered each query."""
+        results: List[Optional[Located]] = [None] * len(queries)
+        remaining = list(range(len(queries)))
+        for backend in self.backends:
+            if not remaining:
+                break
+            found = _run_many(backend, [queries[i] for i in remaining])
+            still: List[int] = []
+            for pos, coords in zip(remaining, found):
+                if coords is None:
+                    still.append(pos)
+                else:
+                    results[pos] = (coords, backend.precision)
+                    self.hits[backend.name] += 1
+            remaining = still
+        return results
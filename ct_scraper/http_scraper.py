@@ -0,0 +1,134 @@
+"""Browser-free scrape engine that replays the civil inquiry ASP.NET postbacks."""
+from __future__ import annotations
+
+import time
+from typing import Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from lxml.html import HtmlElement
+
+from .detail_fetch import DetailFetcher, build_session
+from .incremental import EarlyStopPolicy, KnownDockets, select_new, total_pages
+from .parsers import (
+    RESULTS_GRID_TARGET,
+    CaseRow,
+    has_results_grid,
+    has_results_page,
+    parse_form_action,
+    parse_form_fields,
+    parse_record_counts,
+    parse_result_rows,
+    to_document,
+)
+from .scrape_cases import BASE_URL
+from .throttle import get_throttle
+
+TOWN_FIELD = "ctl00$ContentPlaceHolder1$txtCityTown"
+SUBMIT_FIELD = "ctl00$ContentPlaceHolder1$btnSubmit"
+
+
+class HttpCaseScraper:
+    """Drop-in replacement for ``CaseScraper`` that needs no browser.
+
+    A pooled ``requests.Session`` carries the ASP.NET session cookie, and each
+    postback resubmits the ``__VIEWSTATE``/``__EVENTVALIDATION`` of the page it
+    came from, exactly as the browser would.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float = 20.0,
+        detail_concurrency: int = 4,
+        detail_rate: float = 4.0,
+        nobot_delay: float = 2.0,
+        known: Optional[KnownDockets] = None,
+        early_stop: Optional[EarlyStopPolicy] = None,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        self.timeout = timeout
+        self.detail_concurrency = detail_concurrency
+        self.detail_rate = detail_rate
+        # NoBot rejects a search postback that arrives sooner than a person could type.
+        self.nobot_delay = nobot_delay
+        self.known = known
+        self.early_stop = early_stop or EarlyStopPolicy()
+        self.session = session
+        self.details: Optional[DetailFetcher] = None
+        self._owns_session = session is None
+
+    def __enter__(self) -> "HttpCaseScraper":
+        if self.session is None:
+            self.session = build_session(self.detail_concurrency + 1)
+        self.details = DetailFetcher(
+            self.session,
+            concurrency=self.detail_concurrency,
+            rate_per_host=self.detail_rate,
+            timeout=self.timeout,
+        )
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self.details is not None:
+            self.details.close()
+            self.details = None
+        if self.session is not None and self._owns_session:
+            self.session.close()
+            self.session = None
+
+    # ---------- Public API ----------
+    def scrape_towns(self, towns: Iterable[str]) -> Iterator[CaseRow]:
+        assert self.details is not None, "use HttpCaseScraper as a context manager"
+        for town in towns:
+            paging = self.early_stop.begin(town)
+            consecutive_known = 0
+            for page_url, doc in self.iter_results_pages(town):
+                paging.pages_read += 1
+                if paging.total_pages is None:
+                    paging.total_pages = total_pages(parse_record_counts(doc))
+                hrefs, fully_known = select_new(parse_result_rows(doc, page_url), self.known)
+                consecutive_known = consecutive_known + 1 if fully_known else 0
+                yield from self.details.fetch(town, hrefs)
+                if self.early_stop.should_stop(consecutive_known):
+                    paging.stopped_early = True
+                    break
+
+    def iter_results_pages(self, town: str) -> Iterator[Tuple[str, HtmlElement]]:
+        """Yield ``(url, document)`` for each page of ``gvPropertyResults`` for ``town``."""
+        resp = self._request("GET", BASE_URL)
+        doc = to_document(resp.content)
+        payload = parse_form_fields(doc, submit=SUBMIT_FIELD)
+        payload[TOWN_FIELD] = town
+        time.sleep(self.nobot_delay)
+        resp = self._request("POST", parse_form_action(doc, resp.url), data=payload)
+
+        page = 1
+        while True:
+            doc = to_document(resp.content)
+            if not has_results_grid(doc):
+                return
+            yield resp.url, doc
+
+            page += 1
+            if not has_results_page(doc, page):
+                return
+            payload = parse_form_fields(doc)
+            payload["__EVENTTARGET"] = RESULTS_GRID_TARGET
+            payload["__EVENTARGUMENT"] = f"Page${page}"
+            resp = self._request("POST", parse_form_action(doc, resp.url), data=payload)
+
+    # ---------- Helpers ----------
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        assert self.session is not None, "use HttpCaseScraper as a context manager"
+        throttle = get_throttle(urlparse(url).netloc, max_rate=self.detail_rate)
+        throttle.wait()
+        start = time.monotonic()
+        try:
+            resp = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        except requests.RequestException:
+            throttle.record(time.monotonic() - start, ok=False)
+            raise
+        throttle.record_status(resp.status_code, time.monotonic() - start)
+        resp.raise_for_status()
+        return resp
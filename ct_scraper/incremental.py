@@ -0,0 +1,150 @@
+"""Skip detail fetches for dockets that are already stored."""
+from __future__ import annotations
+
+import datetime as dt
+import math
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+
+from .database import session_scope
+from .models import Case
+from .parsers import ResultRow, normalize_docket
+
+ACTION_DATE_FORMATS = ("%m/%d/%Y", "%Y-%m-%d")
+
+
+def parse_action_date(value: str | None) -> Optional[dt.date]:
+    if not value:
+        return None
+    for fmt in ACTION_DATE_FORMATS:
+        try:
+            return dt.datetime.strptime(value.strip(), fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+class KnownDockets:
+    """Dockets the results-page stage should not open again.
+
+    ``refresh`` holds known dockets whose detail page is re-fetched anyway
+    (recently active cases whose list type or last action may have moved).
+    Call ``remember`` once rows are persisted so a case that shows up under
+    several town searches is only opened once; dockets are not marked at fetch
+    time because a town that fails partway is scraped again from scratch.
+    """
+
+    def __init__(self, known: Set[str] | None = None, refresh: Set[str] | None = None) -> None:
+        self.known: Set[str] = set(known or ())
+        self.refresh: Set[str] = set(refresh or ())
+        self.skipped = 0
+        self.refreshed = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.known)
+
+    def is_known(self, docket: str) -> bool:
+        return normalize_docket(docket) in self.known
+
+    def should_fetch(self, docket: str) -> bool:
+        key = normalize_docket(docket)
+        if not key:
+            return True
+        with self._lock:
+            if key in self.refresh:
+                self.refreshed += 1
+                return True
+            if key in self.known:
+                self.skipped += 1
+                return False
+            return True
+
+    def remember(self, dockets: Iterable[str]) -> None:
+        keys = {normalize_docket(d) for d in dockets}
+        keys.discard("")
+        with self._lock:
+            self.known.update(keys)
+            self.refresh.difference_update(keys)
+
+
+@dataclass
+class PagingStats:
+    town: str
+    pages_read: int = 0
+    total_pages: Optional[int] = None
+    stopped_early: bool = False
+
+    @property
+    def pages_skipped(self) -> int:
+        if not self.stopped_early or self.total_pages is None:
+            return 0
+        return max(0, self.total_pages - self.pages_read)
+
+
+class EarlyStopPolicy:
+    """Stop paging a town after ``known_pages`` consecutive results pages with no new docket.
+
+    Only sound while the court site lists the newest cases first; ``known_pages=0``
+    disables it. Per-town paging stats are kept for the run summary.
+    """
+
+    def __init__(self, known_pages: int = 0) -> None:
+        self.known_pages = max(0, known_pages)
+        self.towns: Dict[str, PagingStats] = {}
+        self._lock = threading.Lock()
+
+    def begin(self, town: str) -> PagingStats:
+        stats = PagingStats(town=town)
+        with self._lock:
+            self.towns[town] = stats
+        return stats
+
+    def should_stop(self, consecutive_known: int) -> bool:
+        return bool(self.known_pages) and consecutive_known >= self.known_pages
+
+    @property
+    def pages_skipped(self) -> int:
+        return sum(s.pages_skipped for s in self.towns.values())
+
+    @property
+    def towns_stopped_early(self) -> List[PagingStats]:
+        return [s for s in self.towns.values() if s.stopped_early]
+
+
+def select_new(rows: List[ResultRow], known: Optional[KnownDockets]) -> Tuple[List[str], bool]:
+    """Detail hrefs to fetch from one results page, and whether every docket on it is already stored."""
+    if known is None:
+        return [r.docket_href for r in rows], False
+    hrefs = [r.docket_href for r in rows if known.should_fetch(r.docket_no)]
+    fully_known = bool(rows) and all(known.is_known(r.docket_no) for r in rows)
+    return hrefs, fully_known
+
+
+def total_pages(records: Optional[Tuple[int, int, int]]) -> Optional[int]:
+    """Pages in a town's results from the ``first-last of total`` record label."""
+    if not records:
+        return None
+    first, last, total = records
+    page_size = last - first + 1
+    return math.ceil(total / page_size) if page_size > 0 else None
+
+
+def load_known_dockets(refresh_days: int | None = None, *, today: dt.date | None = None) -> KnownDockets:
+    """Preload every stored docket; those with a last action within ``refresh_days`` are re-fetched."""
+    today = today or dt.date.today()
+    cutoff = today - dt.timedelta(days=refresh_days) if refresh_days else None
+    known: Set[str] = set()
+    refresh: Set[str] = set()
+    with session_scope() as session:
+        for docket_no, last_action in session.execute(select(Case.docket_no, Case.last_action_date)):
+            key = normalize_docket(docket_no)
+            known.add(key)
+            if cutoff is not None:
+                action_date = parse_action_date(last_action)
+                if action_date is not None and action_date >= cutoff:
+                    refresh.add(key)
+    return KnownDockets(known, refresh)
@@ -4,7 +4,7 @@ from __future__ import annotations
 import datetime as dt
 from typing import List
 
-from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import declarative_base, Mapped, mapped_column, relationship
 
 Base = declarative_base()
@@ -15,6 +15,8 @@ class Case(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     docket_no: Mapped[str] = mapped_column(String(64), unique=True, index=True)
     town: Mapped[str] = mapped_column(String(80))
+    # Denormalized from TOWN_TO_COUNTY at ingest so the county filter is an index lookup.
+    county: Mapped[str | None] = mapped_column(String(40), nullable=True)
     case_type: Mapped[str] = mapped_column(String(120))
     court_location: Mapped[str] = mapped_column(String(120))
     property_address: Mapped[str] = mapped_column(String(255))
@@ -23,11 +25,27 @@ class Case(Base):
     last_action_date: Mapped[str] = mapped_column(String(40))
     latitude: Mapped[float | None] = mapped_column(Float, nullable=True)
     longitude: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # geocoders.ADDRESS_PRECISION or TOWN_PRECISION (a town centroid); NULL if geocoded before it was recorded.
+    geocode_precision: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    # ct_scraper.geohash.encode(latitude, longitude); written with address-precision coordinates only.
+    geohash: Mapped[str | None] = mapped_column(String(12), nullable=True)
     created_at: Mapped[dt.datetime] = mapped_column(DateTime, default=dt.datetime.utcnow)
     defendants_json: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Docket, town, address, party names and defendant addresses; indexed by ct_scraper.search.
+    search_text: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     parties: Mapped[List["Party"]] = relationship("Party", back_populates="case", cascade="all, delete-orphan")
 
+    # GET /cases is newest first, optionally narrowed to one county or town; each index
+    # serves one of those filters and the (created_at, id) keyset order together.
+    __table_args__ = (
+        Index("ix_cases_created_at_id", "created_at", "id"),
+        Index("ix_cases_county_created_at_id", "county", "created_at", "id"),
+        Index("ix_cases_town_created_at_id", "town", "created_at", "id"),
+        # Covers /map/clusters: a prefix range scan grouped by shorter prefixes.
+        Index("ix_cases_geohash", "geohash", "latitude", "longitude"),
+    )
+
 
 class Party(Base):
     __tablename__ = "parties"
@@ -55,6 +73,41 @@ class Subscriber(Base):
     created_at: Mapped[dt.datetime] = mapped_column(DateTime, default=dt.datetime.utcnow)
 
 
+class ScrapeCheckpoint(Base):
+    """A town whose rows were fully persisted during the scrape run ``run_key``."""
+
+    __tablename__ = "scrape_checkpoints"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    run_key: Mapped[str] = mapped_column(String(40), index=True)
+    town: Mapped[str] = mapped_column(String(80))
+    cases: Mapped[int] = mapped_column(Integer, default=0)
+    completed_at: Mapped[dt.datetime] = mapped_column(DateTime, default=dt.datetime.utcnow)
+
+    __table_args__ = (UniqueConstraint("run_key", "town", name="uq_checkpoint_run_town"),)
+
+
+class GeocodeJob(Base):
+    """A stored case still waiting for coordinates; drained by scripts/geocode_worker.py."""
+
+    __tablename__ = "geocode_queue"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    case_id: Mapped[int] = mapped_column(ForeignKey("cases.id"), unique=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    not_before: Mapped[dt.datetime] = mapped_column(DateTime, default=dt.datetime.utcnow, index=True)
+    enqueued_at: Mapped[dt.datetime] = mapped_column(DateTime, default=dt.datetime.utcnow)
+    # Set when the last allowed attempt misses; the row stays so enqueue_missing does not requeue the case.
+    gave_up_at: Mapped[dt.datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+class DataVersion(Base):
+    """Single-row counter bumped by every writer of case data; read API caches key on it."""
+
+    __tablename__ = "data_version"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[dt.datetime] = mapped_column(DateTime, default=dt.datetime.utcnow)
+
+
 class DigestSend(Base):
     __tablename__ = "digest_sends"
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -0,0 +1,207 @@
+"""Spread towns across a pool of isolated scraper sessions."""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+from requests import RequestException
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from .scrape_cases import CaseRow, CaseScraper
+
+logger = logging.getLogger(__name__)
+
+# Called once per town with its rows as they are scraped; returns rows persisted.
+RowSink = Callable[[str, Iterable[CaseRow]], int]
+# Builds one worker's sink; the pool calls it once per worker thread.
+SinkFactory = Callable[[], RowSink]
+# Builds a fresh engine (CaseScraper or HttpCaseScraper) used as a context manager.
+ScraperFactory = Callable[[], Any]
+
+# Failures that mean the session is unusable; the town is retried on a new one.
+# TimeoutException is a WebDriverException too, but a slow page leaves the browser
+# usable, so _work catches it first and retries the town on the same session.
+RETRYABLE_ERRORS = (WebDriverException, RequestException)
+
+
+@dataclass
+class WorkerStats:
+    worker_id: int
+    towns: int = 0
+    cases: int = 0
+    saved: int = 0
+    restarts: int = 0
+    busy_seconds: float = 0.0
+
+    @property
+    def cases_per_minute(self) -> float:
+        if self.busy_seconds <= 0:
+            return 0.0
+        return self.cases * 60.0 / self.busy_seconds
+
+
+@dataclass
+class PoolResult:
+    workers: List[WorkerStats]
+    failed_towns: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def cases(self) -> int:
+        return sum(w.cases for w in self.workers)
+
+    @property
+    def saved(self) -> int:
+        return sum(w.saved for w in self.workers)
+
+
+class ScraperPool:
+    """Run N scraper workers over a shared town queue.
+
+    By default each worker is a CaseScraper with its own Chrome profile; pass
+    ``factory`` to use another engine. Each worker streams a town's rows into its
+    own sink from ``sinks`` as they are scraped, so no worker holds a whole town.
+    A town whose session dies partway through is requeued on a fresh session, up
+    to ``max_attempts`` times; a wait timeout or any other error (parsing, the
+    sink) requeues it on the same session. Rows the sink committed before the
+    failure stay saved, and the retry skips or upserts them.
+    """
+
+    def __init__(
+        self,
+        sinks: SinkFactory,
+        *,
+        workers: int = 2,
+        headless: bool = True,
+        driver_path: Optional[str] = None,
+        factory: Optional[ScraperFactory] = None,
+        max_attempts: int = 3,
+    ) -> None:
+        self.sinks = sinks
+        self.workers = max(1, workers)
+        self.factory = factory or (lambda: CaseScraper(headless=headless, driver_path=driver_path))
+        self.max_attempts = max(1, max_attempts)
+        self._queue: "queue.Queue[Tuple[str, int]]" = queue.Queue()
+        self._state_lock = threading.Lock()
+        self._failed: List[str] = []
+
+    def run(self, towns: Iterable[str]) -> PoolResult:
+        for town in towns:
+            self._queue.put((town, 1))
+
+        stats = [WorkerStats(worker_id=i) for i in range(self.workers)]
+        threads = [
+            threading.Thread(target=self._work, args=(s,), name=f"scraper-{s.worker_id}", daemon=True)
+            for s in stats
+        ]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        result = PoolResult(workers=stats, failed_towns=list(self._failed), elapsed=time.monotonic() - started)
+        for s in stats:
+            logger.info(
+                "worker=%d towns=%d cases=%d saved=%d restarts=%d busy=%.0fs rate=%.1f cases/min",
+                s.worker_id, s.towns, s.cases, s.saved, s.restarts, s.busy_seconds, s.cases_per_minute,
+            )
+        return result
+
+    def _work(self, stats: WorkerStats) -> None:
+        scraper: Any = None
+        sink = self.sinks()
+        try:
+            while True:
+                try:
+                    town, attempt = self._queue.get_nowait()
+                except queue.Empty:
+                    return
+
+                started = time.monotonic()
+                try:
+                    if scraper is None:
+                        scraper = self.factory().__enter__()
+                    rows = _Counted(scraper.scrape_towns([town]))
+                    saved = sink(town, rows)
+                except TimeoutException as exc:
+                    stats.busy_seconds += time.monotonic() - started
+                    logger.warning(
+                        "worker=%d timed out on %s (attempt %d/%d): %s",
+                        stats.worker_id, town, attempt, self.max_attempts, _first_line(exc),
+                    )
+                    self._requeue(town, attempt)
+                    continue
+                except RETRYABLE_ERRORS as exc:
+                    stats.busy_seconds += time.monotonic() - started
+                    stats.restarts += 1
+                    logger.warning(
+                        "worker=%d session failed on %s (attempt %d/%d): %s",
+                        stats.worker_id, town, attempt, self.max_attempts, _first_line(exc),
+                    )
+                    if scraper is not None:
+                        self._close(scraper)
+                        scraper = None
+                    self._requeue(town, attempt)
+                    continue
+                except Exception:
+                    # Anything else is specific to this town; keep the worker and its session alive.
+                    stats.busy_seconds += time.monotonic() - started
+                    logger.exception(
+                        "worker=%d failed on %s (attempt %d/%d)", stats.worker_id, town, attempt, self.max_attempts
+                    )
+                    self._requeue(town, attempt)
+                    continue
+
+                elapsed = time.monotonic() - started
+                stats.busy_seconds += elapsed
+                stats.towns += 1
+                stats.cases += rows.count
+                stats.saved += saved
+                logger.info(
+                    "worker=%d town=%s cases=%d saved=%d in %.1fs (%.1f cases/min overall)",
+                    stats.worker_id, town, rows.count, saved, elapsed, stats.cases_per_minute,
+                )
+        finally:
+            if scraper is not None:
+                self._close(scraper)
+
+    def _requeue(self, town: str, attempt: int) -> None:
+        if attempt < self.max_attempts:
+            self._queue.put((town, attempt + 1))
+            return
+        logger.error("Giving up on %s after %d attempts", town, attempt)
+        with self._state_lock:
+            self._failed.append(town)
+
+    @staticmethod
+    def _close(scraper: Any) -> None:
+        try:
+            scraper.__exit__(None, None, None)
+        except Exception:
+            pass
+
+
+class _Counted:
+    """Iterator over ``rows`` that counts what it has handed out."""
+
+    def __init__(self, rows: Iterable[CaseRow]) -> None:
+        self._rows = iter(rows)
+        self.count = 0
+
+    def __iter__(self) -> "_Counted":
+        return self
+
+    def __next__(self) -> CaseRow:
+        row = next(self._rows)
+        self.count += 1
+        return row
+
+
+def _first_line(exc: BaseException) -> str:
+    text = str(exc)
+    return text.splitlines()[0] if text else type(exc).__name__
@@ -0,0 +1,265 @@
+"""Browser-free parsers for the civil inquiry results and case-detail pages."""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, quote_plus, unquote_plus, urljoin, urlparse
+
+from lxml import html as lxml_html
+from lxml.html import HtmlElement
+
+ROLE_RE = re.compile(r"^[PD]-\d{1,2}$", re.IGNORECASE)
+DOCKET_STRIP_RE = re.compile(r"[^A-Z0-9]")
+DOCKET_PARAM_RE = re.compile(r"DocketNo=([^&#\s\"]+)")
+RECORDS_RE = re.compile(r"(\d+)\s*-\s*(\d+)\s+of\s+(\d+)")
+NOBOT_CHALLENGE_RE = re.compile(r'"ChallengeScript":"~(-?\d+)"')
+
+RESULTS_GRID_ID = "ctl00_ContentPlaceHolder1_gvPropertyResults"
+RESULTS_GRID_TARGET = "ctl00$ContentPlaceHolder1$gvPropertyResults"
+RECORDS_LABEL_ID = "ctl00_ContentPlaceHolder1_lblRecords"
+CASE_INFO_ID = "ctl00_ContentPlaceHolder1_CaseDetailBasicInfo1_pnlCVInfo"
+PARTIES_ID = "ctl00_ContentPlaceHolder1_CaseDetailParties1_pnlParties"
+DOCKET_LABEL_ID = "ctl00_ContentPlaceHolder1_CaseDetailBasicInfo1_lblDocketNo"
+CASE_DETAIL_URL = "https://civilinquiry.jud.ct.gov/CaseDetail/PublicCaseDetail.aspx?DocketNo={}"
+
+Markup = Union[bytes, str, HtmlElement]
+
+
+@dataclass
+class ResultRow:
+    """One line of the ``gvPropertyResults`` grid, before the detail page is fetched."""
+
+    town: str
+    street_address: str
+    zip_code: str
+    case_name: str
+    docket_no: str
+    docket_href: str
+    property_type: str
+    disposition: str
+
+
+@dataclass
+class CaseRow:
+    town: str
+    docket_link: str
+    case_type: str
+    court_location: str
+    property_address: str
+    list_type: str
+    trial_list_claim: str
+    last_action_date: str
+    parties: List[Dict[str, str]]
+
+
+def normalize_docket(value: str) -> str:
+    """``HHD-CV-24-6194967-S`` (results grid) and ``HHDCV246194967S`` (stored) compare equal."""
+    return DOCKET_STRIP_RE.sub("", (value or "").upper())
+
+
+def docket_from_link(link: str) -> str:
+    """Normalized docket number from a ``...?DocketNo=`` URL or a bare docket string."""
+    if not link:
+        return ""
+    match = DOCKET_PARAM_RE.search(link)
+    if match:
+        return normalize_docket(unquote_plus(match.group(1)))
+    return normalize_docket(link.strip().strip('"'))
+
+
+def to_document(markup: Markup) -> HtmlElement:
+    if isinstance(markup, HtmlElement):
+        return markup
+    return lxml_html.fromstring(markup)
+
+
+def _text(element: HtmlElement) -> str:
+    return " ".join(element.text_content().split())
+
+
+def _rows(table: HtmlElement) -> List[HtmlElement]:
+    # Raw server HTML has no <tbody>; pages saved from a browser do.
+    return table.xpath("./tr | ./tbody/tr")
+
+
+# ---------- Results page ----------
+def parse_form_fields(markup: Markup, *, submit: Optional[str] = None) -> Dict[str, str]:
+    """Return the ASP.NET form payload (``__VIEWSTATE``, ``__EVENTVALIDATION``, inputs).
+
+    Submit buttons are left out unless ``submit`` names the one being clicked.
+    """
+    doc = to_document(markup)
+    fields: Dict[str, str] = {}
+    for node in doc.xpath("//form[@id='aspnetForm']//input[@name]"):
+        kind = (node.get("type") or "text").lower()
+        name = node.get("name")
+        if kind in {"submit", "button", "image"}:
+            if name == submit:
+                fields[name] = node.get("value", "")
+            continue
+        if kind in {"checkbox", "radio"} and node.get("checked") is None:
+            continue
+        fields[name] = node.get("value", "")
+
+    # NoBot stores the answer to a "~N" challenge computed client-side.
+    scripts = doc.xpath("//script[contains(text(),'ChallengeScript')]/text()")
+    match = NOBOT_CHALLENGE_RE.search(" ".join(scripts)) if scripts else None
+    if match:
+        for name in fields:
+            if name.endswith("NoBotExtender_ClientState"):
+                fields[name] = str(~int(match.group(1)))
+    return fields
+
+
+def parse_form_action(markup: Markup, base_url: str) -> str:
+    doc = to_document(markup)
+    actions = doc.xpath("//form[@id='aspnetForm']/@action")
+    return urljoin(base_url, actions[0]) if actions else base_url
+
+
+def parse_docket_links(markup: Markup, base_url: str) -> List[str]:
+    """Return absolute hrefs of every ``hlnkDocketNo`` link on a results page."""
+    doc = to_document(markup)
+    return [urljoin(base_url, href) for href in doc.xpath("//a[contains(@id,'hlnkDocketNo')]/@href")]
+
+
+def parse_result_rows(markup: Markup, base_url: str) -> List[ResultRow]:
+    """Return every data row of the results grid; pager and header rows are skipped."""
+    doc = to_document(markup)
+    results: List[ResultRow] = []
+    for row in doc.xpath(f"//table[@id='{RESULTS_GRID_ID}']/tr | //table[@id='{RESULTS_GRID_ID}']/tbody/tr"):
+        link = row.xpath(".//a[contains(@id,'hlnkDocketNo')]")
+        cells = row.xpath("./td")
+        if not link or len(cells) < 7:
+            continue
+        results.append(
+            ResultRow(
+                town=_text(cells[0]),
+                street_address=_text(cells[1]),
+                zip_code=_text(cells[2]),
+                case_name=_text(cells[3]),
+                docket_no=_text(link[0]),
+                docket_href=urljoin(base_url, link[0].get("href", "")),
+                property_type=_text(cells[5]),
+                disposition=_text(cells[6]),
+            )
+        )
+    return results
+
+
+def has_results_grid(markup: Markup) -> bool:
+    return bool(to_document(markup).xpath(f"//table[@id='{RESULTS_GRID_ID}']"))
+
+
+def has_results_page(markup: Markup, page: int) -> bool:
+    """True when the pager offers a postback link to ``page``."""
+    href = f"javascript:__doPostBack('{RESULTS_GRID_TARGET}','Page${page}')"
+    return bool(to_document(markup).xpath(f'//a[@href="{href}"]'))
+
+
+def parse_record_counts(markup: Markup) -> Optional[Tuple[int, int, int]]:
+    """``(first, last, total)`` from the ``1-200 of 343`` label above the grid."""
+    labels = to_document(markup).xpath(f"//*[@id='{RECORDS_LABEL_ID}']")
+    match = RECORDS_RE.search(_text(labels[0])) if labels else None
+    if not match:
+        return None
+    first, last, total = (int(g) for g in match.groups())
+    return first, last, total
+
+
+# ---------- Case detail page ----------
+def parse_case_info(markup: Markup) -> Dict[str, str]:
+    info = {
+        "Case Type": "",
+        "Court Location": "",
+        "Property Address": "",
+        "List Type": "",
+        "Trial List Claim": "",
+        "Last Action Date": "",
+    }
+    doc = to_document(markup)
+    for row in doc.xpath(f"//*[@id='{CASE_INFO_ID}']//tr"):
+        cells = row.xpath("./td")
+        if len(cells) >= 2:
+            key = _text(cells[0]).rstrip(":")
+            if key in info:
+                info[key] = _text(cells[1])
+    return info
+
+
+def parse_parties(markup: Markup) -> List[Dict[str, str]]:
+    """Walk the parties grid, grouping attorney/address/filed rows under each P-/D- role."""
+    doc = to_document(markup)
+    parties: List[Dict[str, str]] = []
+    current: Optional[Dict[str, str]] = None
+
+    outer = doc.xpath(f"//*[@id='{PARTIES_ID}']/table")
+    if not outer:
+        return parties
+    outer_rows = _rows(outer[0])
+    inner = outer_rows[1].xpath("./td/table") if len(outer_rows) > 1 else []
+    if not inner:
+        return parties
+
+    for row in _rows(inner[0]):
+        tds = row.xpath("./td")
+        if not tds:
+            continue
+        first = _text(tds[0])
+        second = _text(tds[1]) if len(tds) > 1 else ""
+        third = _text(tds[2]) if len(tds) > 2 else ""
+
+        if ROLE_RE.match(first):
+            if current:
+                parties.append(current)
+            current = {
+                "role": first,
+                "name": second,
+                "attorney": "",
+                "address": "",
+                "file_date": "",
+            }
+        elif current:
+            lowered = first.lower()
+            if lowered.startswith("attorney") or lowered.startswith("appearance attorney"):
+                current["attorney"] = second or third
+            elif lowered.startswith("address"):
+                current["address"] = " ".join(filter(None, [second, third])).strip()
+            elif lowered.startswith("filed"):
+                current["file_date"] = second or third
+    if current:
+        parties.append(current)
+
+    defendants = [p for p in parties if p["role"].upper().startswith("D-")]
+    plaintiffs = [p for p in parties if p["role"].upper().startswith("P-")]
+    ordered = defendants + plaintiffs
+    return ordered[:10]
+
+
+def parse_docket_link(markup: Markup, url: str = "") -> str:
+    """Canonical PublicCaseDetail URL from the docket label, falling back to ``url``."""
+    doc = to_document(markup)
+    labels = doc.xpath(f"//*[@id='{DOCKET_LABEL_ID}']")
+    docket_no = _text(labels[0]) if labels else ""
+    if not docket_no and url:
+        docket_no = parse_qs(urlparse(url).query).get("DocketNo", [""])[0].strip()
+    if docket_no:
+        return CASE_DETAIL_URL.format(quote_plus(docket_no))
+    return url
+
+
+def parse_case_row(markup: Markup, town: str, url: str = "") -> CaseRow:
+    doc = to_document(markup)
+    case_info = parse_case_info(doc)
+    return CaseRow(
+        town=town,
+        docket_link=parse_docket_link(doc, url),
+        case_type=case_info.get("Case Type", ""),
+        court_location=case_info.get("Court Location", ""),
+        property_address=case_info.get("Property Address", ""),
+        list_type=case_info.get("List Type", ""),
+        trial_list_claim=case_info.get("Trial List Claim", ""),
+        last_action_date=case_info.get("Last Action Date", ""),
+        parties=parse_parties(doc),
+    )
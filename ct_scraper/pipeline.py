@@ -1,21 +1,43 @@
-﻿"""Data pipeline utilities for storing cases and preparing digests."""
+"""Data pipeline utilities for storing cases and preparing digests."""
 from __future__ import annotations
 
 import datetime as dt
-import re
 import sqlite3
+import threading
 from pathlib import Path
-from typing import Iterable, List
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import func, inspect, or_, select, text, update
+from sqlalchemy.orm import Session
 
 from .config import get_settings
-from .database import engine, session_scope
-from .geocode import geocode_address
-from .models import Base, Case, DigestSend, Party, Subscriber
-from .scrape_cases import CaseRow
+from .counties import TOWN_TO_COUNTY, county_for_town
+from .data_version import bump_data_version, ensure_data_version
+from .database import engine, insert_ignoring_conflicts, session_scope
+from .export import CaseWriter
+from .geocode_queue import enqueue_cases
+from .geocoders import TOWN_PRECISION
+from .geohash import encode as encode_geohash
+from .incremental import KnownDockets
+from .models import Base, Case, DigestSend, Party, ScrapeCheckpoint, Subscriber
+from .parsers import CaseRow, docket_from_link
+from .search import case_search_text, ensure_search_index
+from .spatial import ensure_spatial_index
 
-HYPERLINK_RE = re.compile(r"DocketNo=([A-Z0-9]+)")
+# Fields a refreshed detail page may have changed since the case was first stored.
+REFRESHABLE_FIELDS = ("case_type", "court_location", "list_type", "trial_list_claim", "last_action_date")
+# Columns added to existing tables by init_db; create_all only builds missing tables.
+ADDED_COLUMNS = {
+    "cases": {
+        "search_text": "TEXT",
+        "county": "VARCHAR(40)",
+        "geohash": "VARCHAR(12)",
+        "geocode_precision": "VARCHAR(16)",
+    },
+    "geocode_queue": {"gave_up_at": "TIMESTAMP"},
+}
+# Dockets per IN (...) lookup; stays under SQLite's bound-parameter limit.
+IN_CHUNK = 500
 
 
 def init_db() -> None:
@@ -39,45 +61,258 @@ def init_db() -> None:
             if "defendants_json" not in columns:
                 conn.execute("ALTER TABLE cases ADD COLUMN defendants_json TEXT")
 
-
-def save_cases(rows: Iterable[CaseRow]) -> int:
-    inserted = 0
+    _add_missing_columns()
     with session_scope() as session:
-        for row in rows:
-            docket = _extract_docket(row.docket_link)
-            if not docket:
-                continue
-            existing = session.scalar(select(Case).where(Case.docket_no == docket))
-            if existing:
-                continue
-            coords = geocode_address(row.property_address, row.town)
-            case = Case(
-                docket_no=docket,
-                town=row.town,
-                case_type=row.case_type,
-                court_location=row.court_location,
-                property_address=row.property_address,
-                list_type=row.list_type,
-                trial_list_claim=row.trial_list_claim,
-                last_action_date=row.last_action_date,
-                latitude=coords[0] if coords else None,
-                longitude=coords[1] if coords else None,
+        ensure_data_version(session)
+    if backfill_county() + backfill_geohash():
+        with session_scope() as session:
+            bump_data_version(session)
+    ensure_indexes()
+    ensure_search_index(engine)
+    ensure_spatial_index(engine)
+
+
+def _add_missing_columns() -> None:
+    """ALTER in columns added after a table was first created, on any dialect."""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table, columns in ADDED_COLUMNS.items():
+            existing = {col["name"] for col in inspector.get_columns(table)}
+            for name, ddl in columns.items():
+                if name not in existing:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+
+
+def backfill_county() -> int:
+    """Set ``cases.county`` on rows stored before the column existed; one UPDATE per county."""
+    towns_by_county: Dict[str, List[str]] = {}
+    for town, county in TOWN_TO_COUNTY.items():
+        towns_by_county.setdefault(county, []).append(town.upper())
+    filled = 0
+    with engine.begin() as conn:
+        for county, towns in towns_by_county.items():
+            result = conn.execute(
+                update(Case)
+                .where(Case.county.is_(None), func.upper(Case.town).in_(towns))
+                .values(county=county)
+            )
+            filled += result.rowcount or 0
+    return filled
+
+
+def backfill_geohash() -> int:
+    """Compute ``cases.geohash`` for geocoded rows stored before the column existed; town centroids get none."""
+    filled = 0
+    last_id = 0
+    while True:
+        with session_scope() as session:
+            rows = session.execute(
+                select(Case.id, Case.latitude, Case.longitude)
+                .where(
+                    Case.geohash.is_(None),
+                    Case.latitude.is_not(None),
+                    Case.longitude.is_not(None),
+                    or_(Case.geocode_precision.is_(None), Case.geocode_precision != TOWN_PRECISION),
+                    Case.id > last_id,
+                )
+                .order_by(Case.id)
+                .limit(IN_CHUNK)
+            ).all()
+            if not rows:
+                return filled
+            session.execute(
+                update(Case), [{"id": case_id, "geohash": encode_geohash(lat, lng)} for case_id, lat, lng in rows]
             )
-            session.add(case)
-            session.flush()
-            for party in row.parties:
-                session.add(
-                    Party(
-                        case_id=case.id,
-                        role=party.get("role", ""),
-                        name=party.get("name", ""),
-                        attorney=party.get("attorney", ""),
-                        attorney_address=party.get("address", ""),
-                        file_date=party.get("file_date", ""),
-                    )
+            last_id = rows[-1][0]
+            filled += len(rows)
+
+
+def ensure_indexes() -> None:
+    """Create model indexes missing from tables that predate them (create_all skips existing tables)."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def save_cases(rows: Iterable[CaseRow], *, refresh: bool = False) -> int:
+    """Bulk-insert new cases and their parties; returns the number of cases inserted.
+
+    Each call dedups its rows against stored dockets with one ``IN`` query per
+    chunk, then inserts with executemany (``ON CONFLICT DO NOTHING`` on SQLite and
+    Postgres so a concurrent writer cannot fail the batch). With ``refresh`` the
+    mutable fields of already stored cases are updated instead. New cases with
+    an address are queued for the geocode worker rather than geocoded inline.
+    """
+    batch: Dict[str, CaseRow] = {}
+    for row in rows:
+        docket = _extract_docket(row.docket_link)
+        if docket and docket not in batch:
+            batch[docket] = row
+    if not batch:
+        return 0
+
+    with session_scope() as session:
+        existing = _case_ids(session, batch)
+        if refresh and existing:
+            updates = []
+            for docket, case_id in existing.items():
+                values = {f: getattr(batch[docket], f) for f in REFRESHABLE_FIELDS if getattr(batch[docket], f)}
+                if values:
+                    updates.append({"id": case_id, **values})
+            if updates:
+                session.execute(update(Case), updates)
+                bump_data_version(session)
+
+        new = {docket: row for docket, row in batch.items() if docket not in existing}
+        if not new:
+            return 0
+        created = dt.datetime.utcnow()
+        insert_ignoring_conflicts(
+            session,
+            Case,
+            [
+                {
+                    "docket_no": docket,
+                    "town": row.town,
+                    "county": county_for_town(row.town) or None,
+                    "case_type": row.case_type,
+                    "court_location": row.court_location,
+                    "property_address": row.property_address,
+                    "list_type": row.list_type,
+                    "trial_list_claim": row.trial_list_claim,
+                    "last_action_date": row.last_action_date,
+                    "created_at": created,
+                    "search_text": case_search_text(
+                        docket, row.town, row.property_address, (p.get("name", "") for p in row.parties)
+                    ),
+                }
+                for docket, row in new.items()
+            ],
+            ("docket_no",),
+        )
+        case_ids = _case_ids(session, new)
+
+        parties: Dict[Tuple[int, str, str], dict] = {}
+        for docket, case_id in case_ids.items():
+            for party in new[docket].parties:
+                role, name = party.get("role", ""), party.get("name", "")
+                parties.setdefault(
+                    (case_id, role, name),
+                    {
+                        "case_id": case_id,
+                        "docket_no": docket,
+                        "role": role,
+                        "name": name,
+                        "attorney": party.get("attorney", ""),
+                        "mailing_address": party.get("address", ""),
+                        "file_date": party.get("file_date", ""),
+                    },
                 )
-            inserted += 1
-    return inserted
+        insert_ignoring_conflicts(session, Party, list(parties.values()), ("case_id", "role", "name"))
+        enqueue_cases(session, [case_id for docket, case_id in case_ids.items() if new[docket].property_address])
+        if case_ids:
+            bump_data_version(session)
+    return len(case_ids)
+
+
+def _case_ids(session: Session, dockets: Iterable[str]) -> Dict[str, int]:
+    keys = list(dockets)
+    found: Dict[str, int] = {}
+    for i in range(0, len(keys), IN_CHUNK):
+        stmt = select(Case.docket_no, Case.id).where(Case.docket_no.in_(keys[i : i + IN_CHUNK]))
+        found.update(session.execute(stmt).tuples().all())
+    return found
+
+
+def completed_towns(run_key: str) -> Set[str]:
+    with session_scope() as session:
+        stmt = select(ScrapeCheckpoint.town).where(ScrapeCheckpoint.run_key == run_key)
+        return set(session.scalars(stmt))
+
+
+def mark_town_complete(run_key: str, town: str, cases: int) -> None:
+    with session_scope() as session:
+        existing = session.scalar(
+            select(ScrapeCheckpoint).where(ScrapeCheckpoint.run_key == run_key, ScrapeCheckpoint.town == town)
+        )
+        if existing:
+            existing.cases = cases
+            existing.completed_at = dt.datetime.utcnow()
+        else:
+            session.add(ScrapeCheckpoint(run_key=run_key, town=town, cases=cases))
+
+
+class CaseStreamWriter:
+    """Persist CaseRows as a scrape produces them instead of after the whole run.
+
+    Rows are committed every ``batch_size`` rows, so memory stays flat and a crash
+    loses at most one batch. ``finish_town`` flushes and records a checkpoint for
+    ``run_key``; a restarted run skips the towns returned by ``completed_towns``.
+    Rows are also streamed to ``export`` when given. Writers that share ``lock``
+    (one per ScraperPool worker) take turns committing.
+    """
+
+    def __init__(
+        self,
+        run_key: str,
+        *,
+        batch_size: int = 50,
+        refresh: bool = False,
+        known: Optional[KnownDockets] = None,
+        export: Optional[CaseWriter] = None,
+        lock: Optional[threading.Lock] = None,
+    ) -> None:
+        self.run_key = run_key
+        self.batch_size = max(1, batch_size)
+        self.refresh = refresh
+        self.known = known
+        self.export = export
+        self.inserted = 0
+        self.rows = 0
+        self._town_rows = 0
+        self._buffer: List[CaseRow] = []
+        self._lock = lock or threading.Lock()
+
+    def write(self, row: CaseRow) -> None:
+        self._buffer.append(row)
+        if self.export is not None:
+            self.export.write(row)
+        self.rows += 1
+        self._town_rows += 1
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        with self._lock:
+            self.inserted += save_cases(batch, refresh=self.refresh)
+        if self.known is not None:
+            self.known.remember(docket_from_link(row.docket_link) for row in batch)
+
+    def finish_town(self, town: str) -> None:
+        self.flush()
+        with self._lock:
+            mark_town_complete(self.run_key, town, self._town_rows)
+        self._town_rows = 0
+
+    def write_town(self, town: str, rows: Iterable[CaseRow]) -> int:
+        """Write every row for ``town`` and checkpoint it; returns rows inserted.
+
+        If ``rows`` or a commit raises, the town's uncommitted rows are dropped so
+        they are not saved or counted with the next town.
+        """
+        before = self.inserted
+        try:
+            for row in rows:
+                self.write(row)
+            self.finish_town(town)
+        except BaseException:
+            self._buffer.clear()
+            self._town_rows = 0
+            raise
+        return self.inserted - before
 
 
 def get_new_cases_for_digest(since: dt.datetime) -> List[Case]:
@@ -100,9 +335,4 @@ def active_subscribers(as_of: dt.datetime | None = None) -> List[Subscriber]:
 
 
 def _extract_docket(link: str) -> str:
-    if not link:
-        return ""
-    match = HYPERLINK_RE.search(link)
-    if match:
-        return match.group(1)
-    return link.strip().strip('"')
+    return docket_from_link(link)
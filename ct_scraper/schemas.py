@@ -28,6 +28,8 @@ class CaseOut(BaseModel):
     last_action_date: str
     latitude: float | None
     longitude: float | None
+    # "address", or "town" when the coordinates are only the town's centroid.
+    geocode_precision: str | None = None
     created_at: dt.datetime
     parties: List[PartyOut] = Field(default_factory=list)
 
@@ -1,15 +1,12 @@
 """High-level scraper facade."""
 from __future__ import annotations
 
-import random
-import re
+import datetime
 import time
 import tempfile
 import shutil
-from contextlib import contextmanager
-from dataclasses import dataclass
-from typing import Dict, Iterable, Iterator, List, Optional
-from urllib.parse import parse_qs, urlparse, quote_plus
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -20,46 +17,59 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
 BASE_URL = "https://civilinquiry.jud.ct.gov/PropertyAddressSearch.aspx"
-ROLE_RE = re.compile(r"^[PD]-\d{1,2}$", re.IGNORECASE)
-
-import re
-from .database import session_scope
-from .models import Case, Party
-
-
-def pause(a: float = 0.2, b: float = 0.6) -> None:
-    time.sleep(random.uniform(a, b))
 
-
-@dataclass
-class CaseRow:
-    town: str
-    docket_link: str
-    case_type: str
-    court_location: str
-    property_address: str
-    list_type: str
-    trial_list_claim: str
-    last_action_date: str
-    parties: List[Dict[str, str]]
+from .detail_fetch import DetailFetcher
+from .export import open_case_writer
+from .incremental import EarlyStopPolicy, KnownDockets, select_new, total_pages
+from .throttle import get_throttle
+from .parsers import (
+    RESULTS_GRID_ID,
+    RESULTS_GRID_TARGET,
+    CaseRow,
+    has_results_page,
+    parse_record_counts,
+    parse_result_rows,
+    to_document,
+)
+from .pipeline import CaseStreamWriter
 
 
 class CaseScraper:
     """Wrap Selenium scraping so workers can call into it."""
 
-    def __init__(self, *, headless: bool = True, driver_path: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        *,
+        headless: bool = True,
+        driver_path: Optional[str] = None,
+        detail_concurrency: int = 4,
+        detail_rate: float = 4.0,
+        known: Optional[KnownDockets] = None,
+        early_stop: Optional[EarlyStopPolicy] = None,
+    ) -> None:
         self.headless = headless
         self.driver_path = driver_path
+        self.detail_concurrency = detail_concurrency
+        self.detail_rate = detail_rate
+        self.known = known
+        self.early_stop = early_stop or EarlyStopPolicy()
         self.driver: Optional[webdriver.Chrome] = None
         self.wait: Optional[WebDriverWait] = None
+        self.details: Optional[DetailFetcher] = None
         self._profile_dir: Optional[str] = None
 
     def __enter__(self) -> "CaseScraper":
         self.driver = self._build_driver()
         self.wait = WebDriverWait(self.driver, 12)
+        # Only the search form and pager need the browser; detail pages go over HTTP.
+        self.details = DetailFetcher(concurrency=self.detail_concurrency, rate_per_host=self.detail_rate)
         return self
 
     def __exit__(self, exc_type, exc, tb) -> None:
+        if self.details:
+            self.details.close()
+            self.details.session.close()
+            self.details = None
         if self.driver:
             self.driver.quit()
             self.driver = None
@@ -96,249 +106,95 @@ class CaseScraper:
         service = Service(driver_exec) if driver_exec else Service()
         return webdriver.Chrome(service=service, options=chrome_options)
 
-    @contextmanager
-    def _new_tab(self, href: str) -> Iterator[None]:
-        assert self.driver is not None
-        self.driver.execute_script("window.open(arguments[0], '_blank');", href)
-        self.driver.switch_to.window(self.driver.window_handles[-1])
-        try:
-            yield
-        finally:
-            self.driver.close()
-            self.driver.switch_to.window(self.driver.window_handles[0])
-
     # ---------- Public API ----------
     def scrape_towns(self, towns: Iterable[str]) -> Iterator[CaseRow]:
-        assert self.driver is not None and self.wait is not None
+        assert self.driver is not None and self.wait is not None and self.details is not None
         driver = self.driver
         wait = self.wait
+        details = self.details
+        throttle = get_throttle(max_rate=self.detail_rate)
 
         for town in towns:
-            driver.get(BASE_URL)
+            with throttle.request():
+                driver.get(BASE_URL)
+                wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_txtCityTown")))
             page = 1
-            wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_txtCityTown")))
+            paging = self.early_stop.begin(town)
+            consecutive_known = 0
             city = driver.find_element(By.ID, "ctl00_ContentPlaceHolder1_txtCityTown")
             city.clear()
             city.send_keys(town)
-            pause()
+            throttle.wait()
+            started: Optional[float] = time.monotonic()
             driver.find_element(By.ID, "ctl00_ContentPlaceHolder1_btnSubmit").click()
-            pause()
 
             while True:
                 try:
-                    wait.until(EC.presence_of_element_located((By.ID, "ctl00_ContentPlaceHolder1_gvPropertyResults")))
+                    wait.until(EC.presence_of_element_located((By.ID, RESULTS_GRID_ID)))
                 except Exception:
+                    if started is not None:
+                        throttle.record(time.monotonic() - started, ok=False)
                     break
+                if started is not None:
+                    throttle.record(time.monotonic() - started)
 
-                links = driver.find_elements(By.XPATH, "//a[contains(@id,'hlnkDocketNo')]")
-                hrefs = [lnk.get_attribute("href") for lnk in links]
+                # One page_source transfer instead of a WebDriver call per link.
+                doc = to_document(driver.page_source)
+                paging.pages_read += 1
+                if paging.total_pages is None:
+                    paging.total_pages = total_pages(parse_record_counts(doc))
+                hrefs, fully_known = select_new(parse_result_rows(doc, driver.current_url), self.known)
+                consecutive_known = consecutive_known + 1 if fully_known else 0
 
-                for href in hrefs:
-                    with self._new_tab(href):
-                        pause()
-                        yield self._build_case_row(town)
-                        pause()
+                if hrefs:
+                    self._sync_http_session()
+                    yield from details.fetch(town, hrefs)
 
                 next_page_num = page + 1
-                next_link = driver.find_elements(
-                    By.XPATH,
-                    f"//a[@href=\"javascript:__doPostBack('ctl00$ContentPlaceHolder1$gvPropertyResults','Page${next_page_num}')\"]",
-                )
-                if next_link:
-                    marker = links[0] if links else driver.find_element(By.TAG_NAME, "body")
-                    next_link[0].click()
-                    try:
-                        wait.until(EC.presence_of_element_located((
-                            By.XPATH,
-                            f"//table[@id='ctl00_ContentPlaceHolder1_gvPropertyResults']//span[text()='{next_page_num}']"
-                        )))
-                    except Exception:
-                        pass
-                    try:
-                        wait.until(EC.staleness_of(marker))
-                    except Exception:
-                        pause(0.6, 1.0)
-                    page = next_page_num
-                else:
+                if not has_results_page(doc, next_page_num):
                     break
+                if self.early_stop.should_stop(consecutive_known):
+                    paging.stopped_early = True
+                    break
+                marker = driver.find_element(By.ID, RESULTS_GRID_ID)
+                throttle.wait()
+                started = time.monotonic()
+                driver.execute_script("__doPostBack(arguments[0], arguments[1]);", RESULTS_GRID_TARGET, f"Page${next_page_num}")
+                try:
+                    wait.until(EC.presence_of_element_located((
+                        By.XPATH,
+                        f"//table[@id='{RESULTS_GRID_ID}']//span[text()='{next_page_num}']"
+                    )))
+                except Exception:
+                    pass
+                try:
+                    wait.until(EC.staleness_of(marker))
+                except Exception:
+                    # Grid never re-rendered; let the throttle back off before reading it again.
+                    throttle.record(time.monotonic() - started, ok=False)
+                    throttle.wait()
+                    started = None
+                page = next_page_num
 
     # ---------- Helpers ----------
-    def _build_case_row(self, town: str) -> CaseRow:
-        case_info = self._parse_case_info()
-        parties = self._parse_parties()
-        docket_link = self._make_docket_link_from_page()
-        return CaseRow(
-            town=town,
-            docket_link=docket_link,
-            case_type=case_info.get("Case Type", ""),
-            court_location=case_info.get("Court Location", ""),
-            property_address=case_info.get("Property Address", ""),
-            list_type=case_info.get("List Type", ""),
-            trial_list_claim=case_info.get("Trial List Claim", ""),
-            last_action_date=case_info.get("Last Action Date", ""),
-            parties=parties,
-        )
-
-    def _parse_case_info(self) -> Dict[str, str]:
-        assert self.wait is not None
-        wait = self.wait
-        info = {
-            "Case Type": "",
-            "Court Location": "",
-            "Property Address": "",
-            "List Type": "",
-            "Trial List Claim": "",
-            "Last Action Date": "",
-        }
-        tbl = wait.until(
-            EC.presence_of_element_located(
-                (By.XPATH, "//*[@id='ctl00_ContentPlaceHolder1_CaseDetailBasicInfo1_pnlCVInfo']")
-            )
-        )
-        rows = tbl.find_elements(By.TAG_NAME, "tr")
-        for row in rows:
-            cells = row.find_elements(By.TAG_NAME, "td")
-            if len(cells) >= 2:
-                key = cells[0].text.strip().rstrip(":")
-                val = cells[1].text.strip()
-                if key in info:
-                    info[key] = val
-        return info
-
-    def _parse_parties(self) -> List[Dict[str, str]]:
-        assert self.wait is not None
-        wait = self.wait
-        parties: List[Dict[str, str]] = []
-        current: Optional[Dict[str, str]] = None
-
-        tbody = wait.until(
-            EC.presence_of_element_located(
-                (
-                    By.XPATH,
-                    "//*[@id='ctl00_ContentPlaceHolder1_CaseDetailParties1_pnlParties']/table/tbody/tr[2]/td/table/tbody",
-                )
-            )
-        )
-        rows = tbody.find_elements(By.TAG_NAME, "tr")
-        for row in rows:
-            tds = row.find_elements(By.TAG_NAME, "td")
-            if not tds:
-                continue
-            first = tds[0].text.strip()
-            second = tds[1].text.strip() if len(tds) > 1 else ""
-            third = tds[2].text.strip() if len(tds) > 2 else ""
-
-            if ROLE_RE.match(first):
-                if current:
-                    parties.append(current)
-                current = {
-                    "role": first,
-                    "name": second,
-                    "attorney": "",
-                    "address": "",
-                    "file_date": "",
-                }
-            elif current:
-                if first.lower().startswith("attorney"):
-                    current["attorney"] = second or third
-                elif first.lower().startswith("address"):
-                    current["address"] = " ".join(filter(None, [second, third])).strip()
-                elif first.lower().startswith("appearance attorney"):
-                    current["attorney"] = second or third
-                elif first.lower().startswith("filed"):
-                    current["file_date"] = second or third
-                elif not second and ROLE_RE.match(first):
-                    # fallback new role row with empty cells
-                    parties.append(current)
-                    current = {
-                        "role": first,
-                        "name": third,
-                        "attorney": "",
-                        "address": "",
-                        "file_date": "",
-                    }
-        if current:
-            parties.append(current)
-
-        defendants = [p for p in parties if p["role"].upper().startswith("D-")]
-        plaintiffs = [p for p in parties if p["role"].upper().startswith("P-")]
-        ordered = defendants + plaintiffs
-        return ordered[:10]
-
-    def _make_docket_link_from_page(self) -> str:
-        assert self.driver is not None
-        driver = self.driver
-        docket_no = ""
-        try:
-            d_elem = driver.find_element(By.ID, "ctl00_ContentPlaceHolder1_CaseDetailBasicInfo1_lblDocketNo")
-            docket_no = d_elem.text.strip()
-        except Exception:
-            pass
-        if not docket_no:
-            try:
-                qs = parse_qs(urlparse(driver.current_url).query)
-                docket_no = qs.get("DocketNo", [""])[0].strip()
-            except Exception:
-                docket_no = ""
-        if docket_no:
-            encoded = quote_plus(docket_no)
-            return f"https://civilinquiry.jud.ct.gov/CaseDetail/PublicCaseDetail.aspx?DocketNo={encoded}"
-        current_url = driver.current_url
-        if current_url:
-            return current_url
-        return ""
-
-import datetime
-def scrape_cases(towns: Iterable[str]) -> List[CaseRow]:
-    with CaseScraper(headless=True) as scraper:
-        cases = list(scraper.scrape_towns(towns))
-
-    # Save to database
-    docket_re = re.compile(r'DocketNo=([^"&\s]+)')
-    with session_scope() as session:
-        for row in cases:
-            if not row.docket_link:
-                continue
-            match = docket_re.search(row.docket_link)
-            if not match:
-                continue
-            docket_no = match.group(1)
-
-            # Check if already exists
-            existing = session.query(Case).filter_by(docket_no=docket_no).first()
-            if existing:
-                continue
-
-            case = Case(
-                docket_no=docket_no,
-                town=row.town,
-                case_type=row.case_type,
-                court_location=row.court_location,
-                property_address=row.property_address,
-                list_type=row.list_type,
-                trial_list_claim=row.trial_list_claim,
-                last_action_date=row.last_action_date
-            )
-            session.add(case)
-
-            for p in row.parties:
-                party = Party(
-                    case=case,
-                    docket_no=case.docket_no,
-                    role=p["role"],
-                    name=p["name"],
-                    attorney=p["attorney"],
-                    mailing_address=p["address"],
-                    file_date=p["file_date"]
-                )
-                session.add(party)
-
-        session.commit()
-
-    # Also write to CSV for reference
+    def _sync_http_session(self) -> None:
+        """Copy the browser's cookies and user agent so detail requests share its ASP.NET session."""
+        assert self.driver is not None and self.details is not None
+        session = self.details.session
+        for cookie in self.driver.get_cookies():
+            session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"), path=cookie.get("path", "/"))
+        session.headers["User-Agent"] = self.driver.execute_script("return navigator.userAgent;")
+
+def scrape_cases(towns: Iterable[str], *, export_path: str | Path | None = None, batch_size: int = 200) -> int:
+    """Scrape ``towns`` with the browser engine and store them through the bulk pipeline.
+
+    Rows are saved and exported as they arrive; ``export_path`` defaults to a
+    timestamped CSV (``.parquet`` selects Parquet). Returns the number of new cases.
+    """
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"ct_cases_{timestamp}.csv"
-    with open(filename, "w") as f:
-        f.write(str(cases))  # Simple output for testing
-    return cases
-
+    export_path = export_path or f"ct_cases_{timestamp}.csv"
+    with open_case_writer(export_path) as export, CaseScraper(headless=True) as scraper:
+        writer = CaseStreamWriter(f"manual-{timestamp}", batch_size=batch_size, export=export)
+        for town in towns:
+            writer.write_town(town, scraper.scrape_towns([town]))
+    return writer.inserted
@@ -0,0 +1,150 @@
+"""Full-text search over cases: SQLite FTS5 or Postgres tsvector + trigram indexes on ``cases.search_text``."""
+from __future__ import annotations
+
+import json
+import logging
+import re
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import Float, Integer, Select, bindparam, func, or_, select, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.elements import ColumnElement
+
+from .database import session_scope
+from .models import Case
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+# HHDCV246194967S -> HHD CV 24 6194967 S, so a search for the serial number alone matches.
+DOCKET_PARTS_RE = re.compile(r"^([A-Z]{3})([A-Z]{2})(\d{2})(\d+)([A-Z]?)$")
+BACKFILL_BATCH = 1000
+
+SQLITE_DDL = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS cases_fts USING fts5(
+        search_text, content='cases', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS cases_fts_ai AFTER INSERT ON cases BEGIN
+        INSERT INTO cases_fts(rowid, search_text) VALUES (new.id, coalesce(new.search_text, ''));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS cases_fts_ad AFTER DELETE ON cases BEGIN
+        INSERT INTO cases_fts(cases_fts, rowid, search_text) VALUES ('delete', old.id, coalesce(old.search_text, ''));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS cases_fts_au AFTER UPDATE OF search_text ON cases BEGIN
+        INSERT INTO cases_fts(cases_fts, rowid, search_text) VALUES ('delete', old.id, coalesce(old.search_text, ''));
+        INSERT INTO cases_fts(rowid, search_text) VALUES (new.id, coalesce(new.search_text, ''));
+    END""",
+)
+POSTGRES_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_cases_search_tsv ON cases "
+    "USING GIN (to_tsvector('simple', coalesce(search_text, '')))",
+    "CREATE INDEX IF NOT EXISTS ix_cases_search_trgm ON cases USING GIN (search_text gin_trgm_ops)",
+)
+
+
+def case_search_text(
+    docket_no: str,
+    town: str,
+    property_address: str,
+    party_names: Iterable[str] = (),
+    defendants_json: Optional[str] = None,
+) -> str:
+    """The denormalized text indexed for a case: docket, town, address, parties and defendant addresses."""
+    parts: List[str] = [docket_no or ""]
+    match = DOCKET_PARTS_RE.match((docket_no or "").upper())
+    if match:
+        parts.append(" ".join(p for p in match.groups() if p))
+    parts += [town or "", property_address or ""]
+    parts += [name for name in party_names if name]
+    if defendants_json:
+        try:
+            defendants = json.loads(defendants_json)
+        except ValueError:
+            defendants = []
+        for item in defendants if isinstance(defendants, list) else []:
+            if isinstance(item, dict):
+                parts += [str(item.get("name") or ""), str(item.get("mailing_address") or "")]
+    seen = set()
+    unique = [p for p in (p.strip() for p in parts) if p and not (p in seen or seen.add(p))]
+    return " ".join(unique)
+
+
+def apply_search(stmt: Select, term: str, dialect: str) -> Tuple[Select, Optional[ColumnElement]]:
+    """Restrict ``stmt`` (a select of Case) to matches for ``term``.
+
+    Returns the statement and a relevance score that orders best matches first
+    when sorted ascending (lower is better), or None when the dialect has no
+    index to rank with.
+    """
+    tokens = list(dict.fromkeys(TOKEN_RE.findall(term.upper())))
+    if not tokens:
+        return stmt, None
+    if dialect == "sqlite":
+        # Each token is a prefix match; FTS5 ANDs them.
+        query = " ".join('"{}"*'.format(t.replace('"', '""')) for t in tokens)
+        fts = (
+            text("SELECT rowid AS case_id, bm25(cases_fts) AS rank FROM cases_fts WHERE cases_fts MATCH :fts_query")
+            .bindparams(bindparam("fts_query", query))
+            .columns(case_id=Integer, rank=Float)
+            .subquery("fts")
+        )
+        return stmt.join(fts, fts.c.case_id == Case.id), fts.c.rank
+    if dialect == "postgresql":
+        tsv = func.to_tsvector("simple", func.coalesce(Case.search_text, ""))
+        tsq = func.to_tsquery("simple", " & ".join(f"{t}:*" for t in tokens))
+        # The trigram index answers substring matches such as the middle of a docket number.
+        substring = Case.search_text.ilike(f"%{term.strip()}%")
+        return stmt.where(or_(tsv.op("@@")(tsq), substring)), -func.ts_rank(tsv, tsq)
+    pattern = f"%{term.strip()}%"
+    return stmt.where(Case.search_text.ilike(pattern)), None
+
+
+def ensure_search_index(engine: Engine) -> None:
+    """Fill ``search_text`` for rows stored before it existed, then create the dialect's search index."""
+    dialect = engine.dialect.name
+    # Backfill before the FTS triggers exist: their 'delete' step must only ever see indexed rows.
+    filled = backfill_search_text()
+    ddl = SQLITE_DDL if dialect == "sqlite" else POSTGRES_DDL if dialect == "postgresql" else ()
+    with engine.begin() as conn:
+        created_fts = dialect == "sqlite" and not conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = 'cases_fts'")
+        ).first()
+        for statement in ddl:
+            conn.execute(text(statement))
+        if created_fts:
+            conn.execute(text("INSERT INTO cases_fts(cases_fts) VALUES ('rebuild')"))
+    if created_fts or filled:
+        logger.info("Search index ready (%d cases backfilled)", filled)
+
+
+def backfill_search_text() -> int:
+    """Compute ``search_text`` for cases where it is NULL, in keyset batches."""
+    filled = 0
+    last_id = 0
+    while True:
+        with session_scope() as session:
+            cases = session.scalars(
+                select(Case)
+                .options(selectinload(Case.parties))
+                .where(Case.search_text.is_(None), Case.id > last_id)
+                .order_by(Case.id)
+                .limit(BACKFILL_BATCH)
+            ).all()
+            if not cases:
+                return filled
+            session.execute(
+                update(Case),
+                [
+                    {
+                        "id": c.id,
+                        "search_text": case_search_text(
+                            c.docket_no, c.town, c.property_address, (p.name for p in c.parties), c.defendants_json
+                        ),
+                    }
+                    for c in cases
+                ],
+            )
+            last_id = cases[-1].id
+            filled += len(cases)
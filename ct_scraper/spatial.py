@@ -0,0 +1,141 @@
+"""Spatial lookups on case coordinates: an R*Tree on SQLite, geohash prefix ranges elsewhere."""
+from __future__ import annotations
+
+import logging
+import math
+from typing import List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import Select, and_, column, or_, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql.elements import ColumnElement
+
+from .geohash import cell_size, encode
+from .models import Case
+
+logger = logging.getLogger(__name__)
+
+MILES_PER_DEGREE_LAT = 69.09
+# Prefix ranges OR-ed together for one box; more ranges prune better but plan slower.
+MAX_GEOHASH_RANGES = 16
+
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS cases_rtree USING rtree(id, min_lat, max_lat, min_lng, max_lng)",
+    """CREATE TRIGGER IF NOT EXISTS cases_rtree_ai AFTER INSERT ON cases
+        WHEN new.latitude IS NOT NULL AND new.longitude IS NOT NULL BEGIN
+        INSERT OR REPLACE INTO cases_rtree VALUES (new.id, new.latitude, new.latitude, new.longitude, new.longitude);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS cases_rtree_au AFTER UPDATE OF latitude, longitude ON cases BEGIN
+        DELETE FROM cases_rtree WHERE id = old.id;
+        INSERT INTO cases_rtree SELECT new.id, new.latitude, new.latitude, new.longitude, new.longitude
+            WHERE new.latitude IS NOT NULL AND new.longitude IS NOT NULL;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS cases_rtree_ad AFTER DELETE ON cases BEGIN
+        DELETE FROM cases_rtree WHERE id = old.id;
+    END""",
+)
+
+cases_rtree = table(
+    "cases_rtree", column("id"), column("min_lat"), column("max_lat"), column("min_lng"), column("max_lng")
+)
+
+
+class BBox(NamedTuple):
+    min_lng: float
+    min_lat: float
+    max_lng: float
+    max_lat: float
+
+
+def ensure_spatial_index(engine: Engine) -> None:
+    """Create the SQLite R*Tree and its sync triggers, loading existing coordinates the first time.
+
+    Other dialects use ``ix_cases_geohash``, which the model already declares.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conn:
+        created = not conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'cases_rtree'")).first()
+        for statement in SQLITE_DDL:
+            conn.execute(text(statement))
+        if created:
+            loaded = conn.execute(
+                text(
+                    "INSERT INTO cases_rtree SELECT id, latitude, latitude, longitude, longitude FROM cases "
+                    "WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+                )
+            ).rowcount
+            logger.info("Spatial index created with %d geocoded cases", loaded)
+
+
+def geohash_ranges(box: BBox, max_ranges: int = MAX_GEOHASH_RANGES) -> List[str]:
+    """Geohash cells covering ``box`` at the longest length that needs no more than ``max_ranges`` of them."""
+    best: List[str] = []
+    for precision in range(1, 10):
+        height, width = cell_size(precision)
+        rows = math.floor(box.max_lat / height) - math.floor(box.min_lat / height) + 1
+        cols = math.floor(box.max_lng / width) - math.floor(box.min_lng / width) + 1
+        if rows * cols > max_ranges:
+            break
+        cells: Set[str] = set()
+        for r in range(rows):
+            lat = (math.floor(box.min_lat / height) + r + 0.5) * height
+            for c in range(cols):
+                lng = (math.floor(box.min_lng / width) + c + 0.5) * width
+                cells.add(encode(lat, lng, precision))
+        best = sorted(cells)
+    return best
+
+
+def geohash_filter(box: BBox) -> Optional[ColumnElement]:
+    """Index ranges on ``cases.geohash`` containing every point in ``box``; None if the box is too large."""
+    prefixes = geohash_ranges(box)
+    if not prefixes:
+        return None
+    return or_(*(and_(Case.geohash >= p, Case.geohash < p + "{") for p in prefixes))
+
+
+def apply_bbox(stmt: Select, box: BBox, dialect: str) -> Select:
+    """Restrict ``stmt`` (a select from cases) to geocoded cases inside ``box``.
+
+    Cases placed at a town centroid have no geohash and are left out: their
+    coordinates say which town, not where in it.
+    """
+    exact = and_(
+        Case.geohash.is_not(None),
+        Case.latitude.between(box.min_lat, box.max_lat),
+        Case.longitude.between(box.min_lng, box.max_lng),
+    )
+    if dialect == "sqlite":
+        # R*Tree boxes are float32 rounded outward, so the exact test above still applies.
+        stmt = stmt.join(cases_rtree, cases_rtree.c.id == Case.id).where(
+            cases_rtree.c.max_lat >= box.min_lat,
+            cases_rtree.c.min_lat <= box.max_lat,
+            cases_rtree.c.max_lng >= box.min_lng,
+            cases_rtree.c.min_lng <= box.max_lng,
+        )
+        return stmt.where(exact)
+    ranges = geohash_filter(box)
+    if ranges is not None:
+        stmt = stmt.where(ranges)
+    return stmt.where(exact)
+
+
+def radius_bbox(lat: float, lng: float, miles: float) -> BBox:
+    dlat = miles / MILES_PER_DEGREE_LAT
+    dlng = miles / (MILES_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01))
+    return BBox(max(-180.0, lng - dlng), max(-90.0, lat - dlat), min(180.0, lng + dlng), min(90.0, lat + dlat))
+
+
+def apply_radius(stmt: Select, center: Tuple[float, float], miles: float, dialect: str) -> Select:
+    """Cases within ``miles`` of ``center`` (lat, lng): the bounding box via the index, then the distance.
+
+    The distance is equirectangular with the longitude scale fixed at the center,
+    plain arithmetic that every backend evaluates; at CT latitudes it is within
+    0.1% at 5 miles and about 2% at 100.
+    """
+    lat, lng = center
+    stmt = apply_bbox(stmt, radius_bbox(lat, lng, miles), dialect)
+    dx = (Case.longitude - lng) * math.cos(math.radians(lat))
+    dy = Case.latitude - lat
+    limit = miles / MILES_PER_DEGREE_LAT
+    return stmt.where(dx * dx + dy * dy <= limit * limit)
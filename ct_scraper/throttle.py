@@ -0,0 +1,121 @@
+"""Adaptive request pacing shared by the scrapers and the PDF downloader."""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+COURT_HOST = "civilinquiry.jud.ct.gov"
+
+
+class AdaptiveThrottle:
+    """AIMD pacing: the allowed request rate grows additively while responses are
+    fast and healthy and is cut multiplicatively on a timeout, 429 or 5xx.
+
+    ``wait()`` spaces callers ``1 / rate`` seconds apart across all threads
+    sharing the throttle; ``record()`` feeds back each request's outcome.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        initial_rate: float = 2.0,
+        min_rate: float = 0.2,
+        max_rate: float = 8.0,
+        increase: float = 0.25,
+        decrease: float = 0.5,
+        latency_target: float = 2.0,
+    ) -> None:
+        self.name = name
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, min_rate)
+        self.rate = min(max(initial_rate, min_rate), self.max_rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.successes = 0
+        self.failures = 0
+        self._latency_ewma = 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.rate
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def record(self, latency: float, ok: bool = True) -> None:
+        with self._lock:
+            self._latency_ewma = latency if not self._latency_ewma else 0.8 * self._latency_ewma + 0.2 * latency
+            if not ok:
+                self.failures += 1
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                # Push the next slot out so concurrent callers feel the back-off immediately.
+                self._next_slot = max(self._next_slot, time.monotonic() + 1.0 / self.rate)
+            elif latency > self.latency_target:
+                self.successes += 1
+                self.rate = max(self.min_rate, self.rate * (1 + self.decrease) / 2)
+            else:
+                self.successes += 1
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def record_status(self, status_code: int, latency: float) -> None:
+        self.record(latency, ok=status_code != 429 and status_code < 500)
+
+    @contextmanager
+    def request(self) -> Iterator[None]:
+        """Pace one request and record it as failed if the block raises."""
+        self.wait()
+        start = time.monotonic()
+        try:
+            yield
+        except Exception:
+            self.record(time.monotonic() - start, ok=False)
+            raise
+        self.record(time.monotonic() - start, ok=True)
+
+    def snapshot(self) -> Dict[str, float | int | str]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "rate": round(self.rate, 3),
+                "latency_ewma": round(self._latency_ewma, 3),
+                "successes": self.successes,
+                "failures": self.failures,
+            }
+
+
+_throttles: Dict[str, AdaptiveThrottle] = {}
+_registry_lock = threading.Lock()
+
+
+def get_throttle(name: str = COURT_HOST, **options: float) -> AdaptiveThrottle:
+    """Process-wide throttle for ``name``; ``options`` only apply on first use."""
+    with _registry_lock:
+        throttle = _throttles.get(name)
+        if throttle is None:
+            throttle = _throttles[name] = AdaptiveThrottle(name, **options)
+        return throttle
+
+
+def throttle_snapshots() -> List[Dict[str, float | int | str]]:
+    with _registry_lock:
+        throttles = list(_throttles.values())
+    return [t.snapshot() for t in throttles]
+
+
+def log_throttles() -> None:
+    for snap in throttle_snapshots():
+        logger.info(
+            "throttle=%s rate=%.2f req/s latency=%.2fs ok=%d failed=%d",
+            snap["name"], snap["rate"], snap["latency_ewma"], snap["successes"], snap["failures"],
+        )
@@ -1,10 +1,10 @@
-import { useEffect, useMemo } from "react";
-import { MapContainer, TileLayer, CircleMarker, Popup, useMap } from "react-leaflet";
+import { useEffect, useMemo, useState } from "react";
+import { MapContainer, TileLayer, CircleMarker, Popup, Tooltip, useMap } from "react-leaflet";
 import "leaflet/dist/leaflet.css";
 import type { LatLngTuple } from "leaflet";
 import L from "leaflet";
 
-import type { CaseRecord } from "@/types";
+import type { CaseRecord, ClusterFeature } from "@/types";
 
 const DEFAULT_CENTER: LatLngTuple = [41.6032, -73.0877];
 
@@ -29,51 +29,27 @@ function MapBounds({ positions }: { positions: LatLngTuple[] }) {
   return null;
 }
 
-function Boundaries() {
+const BOUNDARY_LAYERS = [
+  { name: "state", style: { color: "#5227FF", weight: 3, opacity: 0.8, fillOpacity: 0.1 } },
+  { name: "counties", style: { color: "#4F20E8", weight: 2, opacity: 0.7, fillOpacity: 0 } },
+  // Towns: thinner lines to avoid clutter
+  { name: "towns", style: { color: "#A78BFA", weight: 1, opacity: 0.5, fillOpacity: 0 } },
+];
+
+function Boundaries({ apiBase }: { apiBase: string }) {
   const map = useMap();
 
   useEffect(() => {
-    // State boundary
-    fetch('https://gis.data.ct.gov/arcgis/rest/services/CTGov_Open_Data/Connecticut_State_Boundary/MapServer/0/query?where=1%3D1&outFields=*&outSR=4326&f=geojson')
-      .then(res => res.json())
-      .then(data => {
-        L.geoJSON(data, {
-          style: {
-            color: '#5227FF',
-            weight: 3,
-            opacity: 0.8,
-            fillOpacity: 0.1
-          }
-        }).addTo(map);
-      });
-
-    // Counties
-    fetch('https://gis.data.ct.gov/arcgis/rest/services/CTGov_Open_Data/Connecticut_Counties/MapServer/0/query?where=1%3D1&outFields=*&outSR=4326&f=geojson')
-      .then(res => res.json())
-      .then(data => {
-        L.geoJSON(data, {
-          style: {
-            color: '#4F20E8',
-            weight: 2,
-            opacity: 0.7,
-            fillOpacity: 0
-          }
-        }).addTo(map);
-      });
-
-    // Towns (thinner lines to avoid clutter)
-    fetch('https://gis.data.ct.gov/arcgis/rest/services/CTGov_Open_Data/Connecticut_Towns/MapServer/0/query?where=1%3D1&outFields=*&outSR=4326&f=geojson')
-      .then(res => res.json())
-      .then(data => {
-        L.geoJSON(data, {
-          style: {
-            color: '#A78BFA',
-            weight: 1,
-            opacity: 0.5,
-            fillOpacity: 0
-          }
-        }).addTo(map);
-      });
+    if (!apiBase) return;
+    // Simplified layers served by the API with long cache headers.
+    BOUNDARY_LAYERS.forEach(({ name, style }) => {
+      fetch(`${apiBase}/map/boundaries/${name}.geojson`)
+        .then((res) => (res.ok ? res.json() : null))
+        .then((data) => {
+          if (data) L.geoJSON(data, { style }).addTo(map);
+        })
+        .catch(() => undefined);
+    });
 
     // Clean up on unmount
     return () => {
@@ -83,16 +59,109 @@ function Boundaries() {
         }
       });
     };
-  }, [map]);
+  }, [map, apiBase]);
 
   return null;
 }
 
+function clamp(value: number, min: number, max: number) {
+  return Math.min(max, Math.max(min, value));
+}
+
+function ClusterLayer({ apiBase, query }: { apiBase: string; query: string }) {
+  const map = useMap();
+  const [features, setFeatures] = useState<ClusterFeature[]>([]);
+
+  useEffect(() => {
+    if (!apiBase) return;
+    let controller: AbortController | null = null;
+
+    // Counts per grid cell for the visible area, recomputed server-side on every pan/zoom.
+    const load = () => {
+      controller?.abort();
+      controller = new AbortController();
+      const bounds = map.getBounds();
+      const params = new URLSearchParams(query);
+      params.set(
+        "bbox",
+        [
+          clamp(bounds.getWest(), -180, 180),
+          clamp(bounds.getSouth(), -90, 90),
+          clamp(bounds.getEast(), -180, 180),
+          clamp(bounds.getNorth(), -90, 90),
+        ]
+          .map((value) => value.toFixed(5))
+          .join(",")
+      );
+      params.set("zoom", String(Math.round(map.getZoom())));
+      fetch(`${apiBase}/map/clusters?${params.toString()}`, { signal: controller.signal })
+        .then((res) => (res.ok ? res.json() : { features: [] }))
+        .then((data) => setFeatures(Array.isArray(data.features) ? data.features : []))
+        .catch(() => undefined);
+    };
+
+    load();
+    map.on("moveend", load);
+    return () => {
+      map.off("moveend", load);
+      controller?.abort();
+    };
+  }, [map, apiBase, query]);
+
+  return (
+    <>
+      {features.map((feature) => {
+        const [lng, lat] = feature.geometry.coordinates;
+        const { count, cell } = feature.properties;
+        const center: LatLngTuple = [lat, lng];
+        if (count > 1) {
+          return (
+            <CircleMarker
+              key={cell}
+              center={center}
+              radius={Math.min(28, 8 + 5 * Math.log10(count))}
+              pathOptions={{ color: "#4F20E8", weight: 1, fillColor: "#5227FF", fillOpacity: 0.6 }}
+              eventHandlers={{ click: () => map.setView(center, Math.min(map.getZoom() + 2, map.getMaxZoom())) }}
+            >
+              <Tooltip direction="top">{count.toLocaleString()} cases</Tooltip>
+            </CircleMarker>
+          );
+        }
+        const row = feature.properties;
+        return (
+          <CircleMarker
+            key={cell}
+            center={center}
+            radius={6}
+            pathOptions={{
+              color: "#2563eb",
+              weight: 1,
+              fillColor: "#3b82f6",
+              fillOpacity: 0.85,
+            }}
+          >
+            <Popup maxWidth={260}>
+              <div className="space-y-1 text-sm">
+                {row.docket_no ? <div className="font-semibold">{row.docket_no}</div> : null}
+                {row.town ? <div>{row.town}</div> : null}
+                {row.property_address ? <div>{row.property_address}</div> : null}
+              </div>
+            </Popup>
+          </CircleMarker>
+        );
+      })}
+    </>
+  );
+}
+
 export interface CasesMapProps {
   cases: CaseRecord[];
+  apiBase: string;
+  /** Filter query string (county, town, dates) applied to the clustered points. */
+  query: string;
 }
 
-export function CasesMap({ cases }: CasesMapProps) {
+export function CasesMap({ cases, apiBase, query }: CasesMapProps) {
   const positions = useMemo(
     () =>
       cases
@@ -113,36 +182,8 @@ export function CasesMap({ cases }: CasesMapProps) {
         url="https://server.arcgisonline.com/ArcGIS/rest/services/World_Street_Map/MapServer/tile/{z}/{y}/{x}"
       />
       <MapBounds positions={positions} />
-      <Boundaries />
-      {cases
-        .filter((row) => row.latitude != null && row.longitude != null)
-        .map((row, index) => {
-          const center: LatLngTuple = [row.latitude as number, row.longitude as number];
-          return (
-            <CircleMarker
-              key={`${row.docket_no ?? "case"}-${index}`}
-              center={center}
-              radius={6}
-              pathOptions={{
-                color: "#2563eb",
-                weight: 1,
-                fillColor: "#3b82f6",
-                fillOpacity: 0.85,
-              }}
-            >
-              <Popup maxWidth={260}>
-                <div className="space-y-1 text-sm">
-                  {row.docket_no ? <div className="font-semibold">{row.docket_no}</div> : null}
-                  {row.town ? <div>{row.town}</div> : null}
-                  {row.property_address ? <div>{row.property_address}</div> : null}
-                  {row.county ? <div>{row.county} County</div> : null}
-                  {row.case_type ? <div>{row.case_type}</div> : null}
-                  {row.last_action_date ? <div>Last action: {row.last_action_date}</div> : null}
-                </div>
-              </Popup>
-            </CircleMarker>
-          );
-        })}
+      <Boundaries apiBase={apiBase} />
+      <ClusterLayer apiBase={apiBase} query={query} />
     </MapContainer>
   );
 }
@@ -26,7 +26,7 @@ import type { CaseRecord } from "@/types";
 
 const LIMIT = 100;
 const STORAGE_KEY = "ct-scraper-api-base";
-const DEFAULT_STATUS = `Select filters and click Apply Filters to load up to ${LIMIT} cases.`;
+const DEFAULT_STATUS = `Select filters and click Apply Filters to load cases ${LIMIT} at a time.`;
 
 const DEFAULT_API_BASE = import.meta.env.VITE_DEFAULT_API_BASE ?? "https://geoleads.land/api";
 
@@ -65,6 +65,8 @@ export default function App() {
   const [baseUrl, setBaseUrl] = useState<string>(defaultBase);
   const [filters, setFilters] = useState<Filters>(DEFAULT_FILTERS);
   const [cases, setCases] = useState<CaseRecord[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [mapQuery, setMapQuery] = useState("");
   const [status, setStatus] = useState(DEFAULT_STATUS);
   const [lastUpdated, setLastUpdated] = useState<string | null>(null);
   const [isLoading, setIsLoading] = useState(false);
@@ -94,7 +96,7 @@ export default function App() {
   const townOptions = useMemo(() => townsForCounty(filters.county), [filters.county]);
 
   const fetchCases = useCallback(
-    async (currentFilters: Filters) => {
+    async (currentFilters: Filters, cursor: string | null = null) => {
       let sanitized = sanitizeBase(baseUrl);
       if (!sanitized || !sanitized.startsWith("http")) {
         setError("Provide a valid API base URL.");
@@ -115,6 +117,12 @@ export default function App() {
       if (currentFilters.town) params.set("town", currentFilters.town);
       if (currentFilters.dateFrom) params.set("date_from", currentFilters.dateFrom);
       if (currentFilters.dateTo) params.set("date_to", currentFilters.dateTo);
+      if (!cursor) {
+        const mapParams = new URLSearchParams(params);
+        mapParams.delete("limit");
+        setMapQuery(mapParams.toString());
+      }
+      if (cursor) params.set("cursor", cursor);
 
       try {
         const response = await fetch(`${sanitized}/cases?${params.toString()}`);
@@ -123,19 +131,23 @@ export default function App() {
         }
         const payload = await response.json();
         const rows = Array.isArray(payload) ? (payload as CaseRecord[]) : [];
-        setCases(rows);
-        setStatus(`Showing ${rows.length} case(s) (max ${LIMIT})`);
+        const more = response.headers.get("X-Next-Cursor");
+        const shown = cursor ? cases.length + rows.length : rows.length;
+        setCases((prev) => (cursor ? [...prev, ...rows] : rows));
+        setNextCursor(more);
+        setStatus(`Showing ${shown} case(s)${more ? " - more available" : ""}`);
         setLastUpdated(new Date().toISOString());
       } catch (err) {
         const message = err instanceof Error ? err.message : "Unknown error";
         setError(message);
         setStatus(`Error loading cases: ${message}`);
-        setCases([]);
+        if (!cursor) setCases([]);
+        setNextCursor(null);
       } finally {
         setIsLoading(false);
       }
     },
-    [baseUrl]
+    [baseUrl, cases.length]
   );
 
   const handleApplyFilters = () => {
@@ -146,6 +158,10 @@ export default function App() {
     fetchCases(filters);
   };
 
+  const handleLoadMore = () => {
+    if (nextCursor) fetchCases(filters, nextCursor);
+  };
+
   const handleClearFilters = () => {
     setFilters(DEFAULT_FILTERS);
     fetchCases(DEFAULT_FILTERS);
@@ -265,6 +281,16 @@ export default function App() {
               >
                 Clear
               </Button>
+              {nextCursor && (
+                <Button
+                  variant="outline"
+                  onClick={handleLoadMore}
+                  disabled={isLoading}
+                  className="border-gray-600 text-white hover:bg-gray-700"
+                >
+                  Load more
+                </Button>
+              )}
             </div>
             <div className="text-sm text-gray-400">{status}</div>
           </CardFooter>
@@ -275,7 +301,7 @@ export default function App() {
             <CardTitle className="text-white">Map View</CardTitle>
           </CardHeader>
           <CardContent className="pt-4 bg-gray-800">
-            <CasesMap cases={cases} />
+            <CasesMap cases={cases} apiBase={sanitizeBase(baseUrl)} query={mapQuery} />
           </CardContent>
         </Card>
 
@@ -9,4 +9,16 @@ export interface CaseRecord {
   case_url?: string | null;
   latitude?: number | null;
   longitude?: number | null;
-}
\ No newline at end of file
+}
+/** One GeoJSON point from GET /map/clusters; single-case cells carry the case details. */
+export interface ClusterFeature {
+  type: "Feature";
+  geometry: { type: "Point"; coordinates: [number, number] };
+  properties: {
+    count: number;
+    cell: string;
+    docket_no?: string | null;
+    town?: string | null;
+    property_address?: string | null;
+  };
+}
@@ -9,5 +9,5 @@ if __name__ == "__main__":
         towns = sys.argv[1:]
 
     print("Scraping towns: {}".format(towns))
-    scrape_cases(towns)
-    print("Scraping complete. Check database and CSV output.")
\ No newline at end of file
+    inserted = scrape_cases(towns)
+    print("Scraping complete. {} new cases saved; rows exported to ct_cases_*.csv.".format(inserted))
\ No newline at end of file
@@ -1,37 +1,127 @@
 """Backfill latitude/longitude for cases."""
 from __future__ import annotations
 
-import sqlite3
+import json
+import logging
+import time
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
-from ct_scraper.geocode import geocode_address
-
-DB_PATH = Path(__file__).resolve().parents[1] / "data" / "ct_scraper.db"
-
-def main() -> None:
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    rows = cur.execute(
-        "SELECT id, property_address, town FROM cases WHERE latitude IS NULL OR longitude IS NULL"
-    ).fetchall()
-    total = len(rows)
-    print(f"Cases needing geocode: {total}")
-    updated = 0
-    for idx, (case_id, address, town) in enumerate(rows, 1):
-        if not address:
-            continue
-        coords = geocode_address(address, town)
+import typer
+from geopy.exc import GeocoderServiceError
+from sqlalchemy import func, or_, select, update
+
+from ct_scraper.address import address_key
+from ct_scraper.data_version import bump_data_version
+from ct_scraper.database import session_scope
+from ct_scraper.geocode import build_geocoder, case_location, get_geocoder
+from ct_scraper.geocoders import TOWN_PRECISION, Located
+from ct_scraper.models import Case
+from ct_scraper.pipeline import init_db
+
+app = typer.Typer(help="Geocode every stored case that has no coordinates or only its town's")
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("backfill_geocode")
+
+DEFAULT_CHECKPOINT = Path("data") / "backfill_geocode.checkpoint.json"
+
+
+def _missing_coords():
+    # Town-centroid rows are looked up again in case an address-level backend now knows them.
+    return (
+        or_(Case.latitude.is_(None), Case.longitude.is_(None), Case.geocode_precision == TOWN_PRECISION),
+        Case.property_address != "",
+    )
+
+
+def _load_checkpoint(path: Path) -> int:
+    try:
+        return int(json.loads(path.read_text())["last_id"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return 0
+
+
+def _save_checkpoint(path: Path, last_id: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"last_id": last_id}))
+    tmp.replace(path)
+
+
+def _next_batch(after_id: int, size: int) -> List[Tuple[int, str, str]]:
+    stmt = (
+        select(Case.id, Case.property_address, Case.town)
+        .where(Case.id > after_id, *_missing_coords())
+        .order_by(Case.id)
+        .limit(size)
+    )
+    with session_scope() as session:
+        return [tuple(row) for row in session.execute(stmt)]
+
+
+@app.command()
+def run(batch_size: int = typer.Option(500, min=1, help="Cases read, geocoded and committed per batch"),
+        limit: int | None = typer.Option(None, help="Stop after this many cases"),
+        backends: str | None = typer.Option(
+            None, help="Backend chain, e.g. 'local,nominatim|photon,centroid' (default: GEOCODER_BACKENDS)"),
+        checkpoint: Path = typer.Option(DEFAULT_CHECKPOINT, help="File recording the last case id processed"),
+        restart: bool = typer.Option(False, help="Ignore the checkpoint and start from the first case")) -> None:
+    init_db()
+    geocoder = build_geocoder([b.strip() for b in backends.split(",") if b.strip()]) if backends else get_geocoder()
+    last_id = 0 if restart else _load_checkpoint(checkpoint)
+    with session_scope() as session:
+        pending = session.scalar(select(func.count()).select_from(Case).where(Case.id > last_id, *_missing_coords()))
+    logger.info("Cases needing geocode: %d (resuming after id %d, backends %s)", pending, last_id, geocoder.name)
+
+    processed = updated = 0
+    interrupted = False
+    started = time.monotonic()
+    while limit is None or processed < limit:
+        size = batch_size if limit is None else min(batch_size, limit - processed)
+        rows = _next_batch(last_id, size)
+        if not rows:
+            break
+
+        # One lookup per distinct normalized address in the batch.
+        queries: Dict[str, Tuple[str, str]] = {}
+        for _, address, town in rows:
+            queries.setdefault(address_key(address, town), (address, town))
+        queries.pop("", None)
+        try:
+            located = geocoder.locate_many(list(queries.values()))
+        except GeocoderServiceError as exc:
+            # Nothing from this batch was written; the checkpoint resumes before it.
+            logger.warning("Geocoder unavailable, stopping after id %d: %s", last_id, exc)
+            interrupted = True
+            break
+        found: Dict[str, Optional[Located]] = dict(zip(queries, located))
+
+        coords = []
+        for case_id, address, town in rows:
+            result = found.get(address_key(address, town))
+            if result:
+                coords.append(case_location(case_id, result))
         if coords:
-            cur.execute(
-                "UPDATE cases SET latitude = ?, longitude = ? WHERE id = ?",
-                (coords[0], coords[1], case_id),
-            )
-            conn.commit()
-            updated += 1
-        if idx % 50 == 0:
-            print(f"Processed {idx}/{total}")
-    print(f"Updated {updated} cases")
-    conn.close()
+            with session_scope() as session:
+                session.execute(update(Case), coords)
+                bump_data_version(session)
+
+        last_id = rows[-1][0]
+        _save_checkpoint(checkpoint, last_id)
+        processed += len(rows)
+        updated += len(coords)
+        elapsed = time.monotonic() - started
+        logger.info(
+            "Processed %d/%d (%d distinct addresses in batch), updated %d, %.1f cases/s",
+            processed, pending, len(queries), updated, processed / elapsed if elapsed else 0.0,
+        )
+
+    if not interrupted and (limit is None or processed < limit):
+        # Full pass done; the next run starts over so cases that missed get another try.
+        checkpoint.unlink(missing_ok=True)
+    logger.info("Updated %d of %d cases; answers per backend: %s", updated, processed, dict(geocoder.hits) or "none")
+    geocoder.close()
+
 
 if __name__ == "__main__":
-    main()
+    app()
@@ -0,0 +1,174 @@
+"""Load-test GET /cases: the sync threadpool handler against the async-engine handler.
+
+Seeds a throwaway SQLite database (or uses ``--database-url``), starts each app
+under uvicorn in a subprocess, and has ``--clients`` concurrent keep-alive
+clients request pages spread over every town. Needs httpx for the clients. The
+clients share the machine with the server, so on a small box their own CPU use
+stretches both tails; compare the two rows of one run rather than across hosts.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import typer
+from fastapi import Depends, FastAPI, Query, Request, Response
+from sqlalchemy.orm import Session
+
+from bench_cases_api import _seed
+
+app = typer.Typer(help="p99 latency of GET /cases under concurrent clients, sync vs async database access")
+
+HOST = "127.0.0.1"
+
+
+def _sync_app():
+    """GET /cases as it was before the async engine: a plain def on Starlette's threadpool with a blocking Session."""
+    # ct_scraper reads DATABASE_URL at import time, so it is imported only once run() has set it.
+    from ct_scraper.api.cache import cache_key, cached_page
+    from ct_scraper.api.routes import _cases_page, health
+    from ct_scraper.data_version import get_data_version
+    from ct_scraper.database import get_session
+
+    legacy = FastAPI()
+    legacy.get("/health")(health)
+
+    @legacy.get("/cases")
+    def list_cases(request: Request, limit: int = Query(100, ge=1, le=1000), town: Optional[str] = Query(None),
+                   session: Session = Depends(get_session)):
+        params = dict(limit=limit, cursor=None, town=town)
+        key = cache_key(request.url.path, params, get_data_version(session))
+        page, headers = cached_page(request, key, lambda: _cases_page(session, **params))
+        return Response(content=page.body, media_type="application/json", headers=headers)
+
+    return legacy
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * pct))]
+
+
+async def _load(base_url: str, paths: List[str], clients: int, requests_per_client: int) -> Dict[str, float]:
+    import httpx
+
+    latencies: List[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+
+        async def worker(n: int) -> None:
+            nonlocal errors
+            for i in range(requests_per_client):
+                start = time.perf_counter()
+                try:
+                    response = await client.get(paths[(n * requests_per_client + i) % len(paths)])
+                except httpx.TransportError:
+                    errors += 1
+                    continue
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(n) for n in range(clients)))
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": _percentile(latencies, 0.50),
+        "p95_ms": _percentile(latencies, 0.95),
+        "p99_ms": _percentile(latencies, 0.99),
+        "max_ms": latencies[-1],
+    }
+
+
+def _wait_ready(base_url: str, server: subprocess.Popen, timeout: float = 30) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited with status {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server at {base_url} did not come up")
+
+
+@app.command()
+def serve(mode: str = typer.Argument(..., help="sync or async"),
+          port: int = typer.Option(8765)) -> None:
+    """Run one side of the comparison; ``run`` starts this in a subprocess."""
+    import uvicorn
+
+    if mode == "sync":
+        target = _sync_app()
+    else:
+        from ct_scraper.api.app import create_app
+
+        target = create_app()
+    # Clients queue for seconds at the far end of the run; keep their connections open meanwhile.
+    uvicorn.run(target, host=HOST, port=port, log_level="warning", access_log=False, timeout_keep_alive=120)
+
+
+@app.command()
+def run(clients: int = typer.Option(200, min=1, help="Concurrent keep-alive clients"),
+        requests_per_client: int = typer.Option(20, min=1, help="Sequential requests per client"),
+        rows: int = typer.Option(50, min=1, max=1000, help="Cases per request (the limit parameter)"),
+        cases: int = typer.Option(20000, min=1, help="Cases to seed when the database has fewer"),
+        parties_per_case: int = typer.Option(3, min=0, help="Parties seeded per case"),
+        port: int = typer.Option(8765, help="Port for the server under test"),
+        database_url: str | None = typer.Option(None, help="Benchmark this database instead of a temporary SQLite file"),
+        json_out: Path | None = typer.Option(None, help="Write the results to this JSON file")) -> None:
+    tmpdir = None
+    if database_url is None:
+        tmpdir = tempfile.TemporaryDirectory(prefix="bench_async_api_")
+        database_url = f"sqlite:///{Path(tmpdir.name) / 'bench.db'}"
+    # Inherited by the servers. With the response cache on, every request after the
+    # first per town would be a lookup rather than a database read.
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["RESPONSE_CACHE"] = "off"
+
+    from ct_scraper.counties import TOWN_TO_COUNTY
+
+    _seed(cases, parties_per_case)
+    paths = [f"/cases?limit={rows}&town={town}" for town in TOWN_TO_COUNTY]
+    base_url = f"http://{HOST}:{port}"
+
+    report = {}
+    for mode, label in (("sync", "sync def + threadpool"), ("async", "async def + AsyncSession")):
+        server = subprocess.Popen([sys.executable, __file__, "serve", mode, "--port", str(port)])
+        try:
+            _wait_ready(base_url, server)
+            asyncio.run(_load(base_url, paths, min(clients, 10), 2))  # warm up pools and page cache
+            report[label] = asyncio.run(_load(base_url, paths, clients, requests_per_client))
+        finally:
+            server.terminate()
+            server.wait()
+
+    typer.echo(f"{database_url}: {clients} clients x {requests_per_client} requests, {rows} cases per response")
+    for label, stats in report.items():
+        typer.echo(
+            f"{label:26s} rps={stats['rps']:.0f} p50={stats['p50_ms']:.0f}ms p95={stats['p95_ms']:.0f}ms "
+            f"p99={stats['p99_ms']:.0f}ms max={stats['max_ms']:.0f}ms errors={stats['errors']}"
+        )
+    if json_out:
+        json_out.write_text(json.dumps({"clients": clients, "rows": rows, "results": report}, indent=2))
+    if tmpdir is not None:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,181 @@
+"""Benchmark GET /cases serialization: the ORM + response_model path against the column/orjson path.
+
+Seeds a throwaway SQLite database (or uses ``--database-url``), then times full
+requests through the ASGI app for both handlers at the same page size.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import json
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import typer
+
+app = typer.Typer(help="Time GET /cases at a given page size before and after the fast serializer")
+
+
+def _time(fn: Callable[[], object], rounds: int) -> Dict[str, float]:
+    samples: List[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "min_ms": samples[0],
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+    }
+
+
+def _seed(cases: int, parties_per_case: int) -> None:
+    from sqlalchemy import func, insert, select
+
+    from ct_scraper.counties import TOWN_TO_COUNTY
+    from ct_scraper.database import session_scope
+    from ct_scraper.models import Case, Party
+    from ct_scraper.pipeline import init_db
+
+    init_db()
+    with session_scope() as session:
+        if session.scalar(select(func.count()).select_from(Case)) >= cases:
+            return
+        towns = list(TOWN_TO_COUNTY)
+        start = dt.datetime(2025, 1, 1)
+        session.execute(
+            insert(Case),
+            [
+                {
+                    "docket_no": f"HHDCV25{i:07d}S",
+                    "town": towns[i % len(towns)],
+                    "county": TOWN_TO_COUNTY[towns[i % len(towns)]],
+                    "case_type": "Foreclosure",
+                    "court_location": "Hartford JD",
+                    "property_address": f"{i % 900 + 1} Main Street",
+                    "list_type": "Short Calendar",
+                    "trial_list_claim": "",
+                    "last_action_date": "10/01/2025",
+                    "latitude": 41.7 + (i % 100) / 1000,
+                    "longitude": -72.6 - (i % 100) / 1000,
+                    "created_at": start + dt.timedelta(minutes=i),
+                }
+                for i in range(cases)
+            ],
+        )
+        ids = session.scalars(select(Case.id)).all()
+        session.execute(
+            insert(Party),
+            [
+                {
+                    "case_id": case_id,
+                    "docket_no": f"HHDCV25{case_id:07d}S",
+                    "role": f"D-{n + 1:02d}",
+                    "name": f"Defendant {case_id}-{n}",
+                    "attorney": "",
+                    "mailing_address": f"{n + 1} Elm Street, Hartford, CT 06106",
+                    "file_date": "09/01/2025",
+                }
+                for case_id in ids
+                for n in range(parties_per_case)
+            ],
+        )
+
+
+def _legacy_app():
+    """The pre-orjson handler: ORM entities, CaseOut/PartyOut per row, then response_model validation."""
+    from urllib.parse import quote_plus
+
+    from fastapi import Depends, FastAPI, Query
+    from sqlalchemy import select
+    from sqlalchemy.orm import Session, selectinload
+
+    from ct_scraper import schemas
+    from ct_scraper.counties import county_for_town
+    from ct_scraper.database import get_session
+    from ct_scraper.models import Case
+
+    legacy = FastAPI()
+
+    @legacy.get("/cases", response_model=list[schemas.CaseOut])
+    def list_cases(limit: int = Query(100, ge=1, le=1000), session: Session = Depends(get_session)):
+        stmt = select(Case).options(selectinload(Case.parties)).order_by(Case.created_at.desc(), Case.id.desc())
+        return [
+            schemas.CaseOut(
+                docket_no=case.docket_no,
+                case_url=f"https://civilinquiry.jud.ct.gov/CaseDetail/PublicCaseDetail.aspx?DocketNo={quote_plus(case.docket_no.strip())}",
+                town=case.town,
+                county=case.county or county_for_town(case.town),
+                case_type=case.case_type,
+                court_location=case.court_location,
+                property_address=case.property_address,
+                list_type=case.list_type,
+                trial_list_claim=case.trial_list_claim,
+                last_action_date=case.last_action_date,
+                latitude=case.latitude,
+                longitude=case.longitude,
+                geocode_precision=case.geocode_precision,
+                created_at=case.created_at,
+                parties=[
+                    schemas.PartyOut(
+                        role=p.role, name=p.name, attorney=p.attorney,
+                        attorney_address=p.mailing_address, file_date=p.file_date,
+                    )
+                    for p in case.parties
+                ],
+            )
+            for case in session.scalars(stmt.limit(limit)).all()
+        ]
+
+    return legacy
+
+
+@app.command()
+def run(rows: int = typer.Option(1000, min=1, max=1000, help="Cases per request (the limit parameter)"),
+        cases: int = typer.Option(5000, min=1, help="Cases to seed when the database has fewer"),
+        parties_per_case: int = typer.Option(3, min=0, help="Parties seeded per case"),
+        rounds: int = typer.Option(30, min=1, help="Timed requests per handler"),
+        database_url: str | None = typer.Option(None, help="Benchmark this database instead of a temporary SQLite file"),
+        json_out: Path | None = typer.Option(None, help="Write the timings to this JSON file")) -> None:
+    tmpdir = None
+    if database_url is None:
+        tmpdir = tempfile.TemporaryDirectory(prefix="bench_cases_api_")
+        database_url = f"sqlite:///{Path(tmpdir.name) / 'bench.db'}"
+    # ct_scraper settings are read from the environment at import time. The response
+    # cache would turn every timed request after the first into a lookup.
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["RESPONSE_CACHE"] = "off"
+
+    from fastapi.testclient import TestClient
+
+    from ct_scraper.api.app import app as api
+
+    _seed(cases, parties_per_case)
+    handlers = {"before (ORM + response_model)": TestClient(_legacy_app()), "after (columns + orjson)": TestClient(api)}
+    params = {"limit": rows}
+
+    bodies = {}
+    for name, client in handlers.items():
+        response = client.get("/cases", params=params)
+        response.raise_for_status()
+        bodies[name] = response.json()
+    before, after = bodies.values()
+    if before != after:
+        typer.echo("warning: the two handlers returned different bodies", err=True)
+
+    report = {name: _time(lambda c=client: c.get("/cases", params=params), rounds) for name, client in handlers.items()}
+    typer.echo(f"{database_url}: {len(after)} cases per response, {rounds} rounds")
+    for name, stats in report.items():
+        typer.echo(f"{name:32s} min={stats['min_ms']:.1f}ms median={stats['median_ms']:.1f}ms p95={stats['p95_ms']:.1f}ms")
+    if json_out:
+        json_out.write_text(json.dumps({"rows": rows, "rounds": rounds, "timings": report}, indent=2))
+    if tmpdir is not None:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    app()
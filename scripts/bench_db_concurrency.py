@@ -0,0 +1,265 @@
+"""Benchmark API reads while a bulk ingest writes to the same SQLite file.
+
+Seeds a throwaway database, then for each engine setup starts a /cases server
+and ``--writers`` separate ingest processes, as the API, the scrape timer and
+the PDF/geocode jobs run in production, and has ``--readers`` clients read
+pages until every ingest finishes.
+"before" is a plain create_engine on a rollback-journal file; "after" is
+database.make_engine with the api and ingest profiles (WAL, synchronous=NORMAL,
+mmap, busy_timeout, BEGIN IMMEDIATE for the writer). Needs httpx for the clients.
+"""
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import typer
+from fastapi import FastAPI, Query, Response
+
+from bench_cases_api import _seed
+
+app = typer.Typer(help="API read latency and errors during a bulk ingest, default engine vs tuned profiles")
+
+HOST = "127.0.0.1"
+MODES = ("before", "after")
+
+
+def _engine(mode: str, role: str):
+    from sqlalchemy import create_engine
+
+    from ct_scraper.database import ENGINE_PROFILES, make_engine
+
+    url = os.environ["DATABASE_URL"]
+    return make_engine(url, ENGINE_PROFILES[role]) if mode == "after" else create_engine(url)
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * pct))] if samples else 0.0
+
+
+@app.command()
+def serve(mode: str = typer.Argument(..., help="before or after"), port: int = typer.Option(8766)) -> None:
+    """GET /cases on one engine setup; ``run`` starts this in a subprocess."""
+    import uvicorn
+    from sqlalchemy.orm import sessionmaker
+
+    from ct_scraper.api.routes import _cases_page
+    from ct_scraper.data_version import get_data_version
+
+    make_session = sessionmaker(_engine(mode, "api"))
+    api = FastAPI()
+
+    @api.get("/health")
+    def health() -> Dict[str, str]:
+        return {"status": "ok"}
+
+    @api.get("/cases")
+    def list_cases(limit: int = Query(50, ge=1, le=1000), town: Optional[str] = Query(None)):
+        with make_session() as session:
+            get_data_version(session)
+            page = _cases_page(session, limit=limit, cursor=None, town=town)
+        return Response(content=page.body, media_type="application/json")
+
+    uvicorn.run(api, host=HOST, port=port, log_level="warning", access_log=False)
+
+
+@app.command()
+def ingest(mode: str = typer.Argument(..., help="before or after"),
+           batches: int = typer.Option(40, min=1),
+           batch_size: int = typer.Option(500, min=1),
+           parties_per_case: int = typer.Option(3, min=0),
+           writer_id: int = typer.Option(0, min=0, max=99, help="Keeps concurrent writers' dockets apart")) -> None:
+    """Write ``batches`` transactions the way save_cases does and print a JSON summary."""
+    from sqlalchemy import insert, select
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.orm import Session
+
+    from ct_scraper.counties import TOWN_TO_COUNTY
+    from ct_scraper.data_version import bump_data_version
+    from ct_scraper.models import Case, Party
+
+    engine = _engine(mode, "ingest")
+    towns = list(TOWN_TO_COUNTY)
+    written = failed = 0
+    started = time.perf_counter()
+    for batch in range(batches):
+        dockets = [f"NNHCV26{writer_id:02d}{batch:03d}{i:04d}S" for i in range(batch_size)]
+        try:
+            with Session(engine) as session, session.begin():
+                # Read, then write in the same transaction, as save_cases does.
+                known = set(session.scalars(select(Case.docket_no).where(Case.docket_no.in_(dockets))))
+                rows = [
+                    {
+                        "docket_no": docket,
+                        "town": towns[i % len(towns)],
+                        "county": TOWN_TO_COUNTY[towns[i % len(towns)]],
+                        "case_type": "Foreclosure",
+                        "court_location": "New Haven JD",
+                        "property_address": f"{i + 1} State Street",
+                        "list_type": "Short Calendar",
+                        "trial_list_claim": "",
+                        "last_action_date": "10/01/2026",
+                        "created_at": dt.datetime.utcnow(),
+                    }
+                    for i, docket in enumerate(dockets)
+                    if docket not in known
+                ]
+                session.execute(insert(Case), rows)
+                ids = session.execute(select(Case.id, Case.docket_no).where(Case.docket_no.in_(dockets))).all()
+                if parties_per_case:
+                    session.execute(
+                        insert(Party),
+                        [
+                            {
+                                "case_id": case_id,
+                                "docket_no": docket,
+                                "role": f"D-{n + 1:02d}",
+                                "name": f"Defendant {n}",
+                                "mailing_address": f"{n + 1} Elm Street, New Haven, CT 06510",
+                                "file_date": "09/01/2026",
+                            }
+                            for case_id, docket in ids
+                            for n in range(parties_per_case)
+                        ],
+                    )
+                bump_data_version(session)
+            written += len(rows)
+        except OperationalError:
+            failed += 1
+    typer.echo(json.dumps({"seconds": time.perf_counter() - started, "cases": written, "failed_batches": failed}))
+
+
+async def _read_until(base_url: str, paths: List[str], readers: int,
+                      writers: List[asyncio.subprocess.Process]) -> Dict[str, float]:
+    import httpx
+
+    latencies: List[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=readers, max_keepalive_connections=readers)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+
+        async def reader(n: int) -> None:
+            nonlocal errors
+            i = n
+            while any(writer.returncode is None for writer in writers):
+                start = time.perf_counter()
+                try:
+                    response = await client.get(paths[i % len(paths)])
+                except httpx.TransportError:
+                    errors += 1
+                    continue
+                finally:
+                    i += readers
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(writer.wait() for writer in writers), *(reader(n) for n in range(readers)))
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "reads": len(latencies),
+        "read_errors": errors,
+        "reads_per_s": len(latencies) / elapsed,
+        "p50_ms": _percentile(latencies, 0.50),
+        "p99_ms": _percentile(latencies, 0.99),
+        "max_ms": latencies[-1] if latencies else 0.0,
+    }
+
+
+async def _measure(mode: str, port: int, paths: List[str], readers: int, writers: int,
+                   ingest_args: List[str]) -> Dict[str, float]:
+    import httpx
+
+    base_url = f"http://{HOST}:{port}"
+    server = await asyncio.create_subprocess_exec(sys.executable, __file__, "serve", mode, "--port", str(port))
+    try:
+        async with httpx.AsyncClient(base_url=base_url) as client:
+            for _ in range(150):
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.2)
+            else:
+                raise RuntimeError(f"server at {base_url} did not come up")
+        procs = [
+            await asyncio.create_subprocess_exec(
+                sys.executable, __file__, "ingest", mode, *ingest_args, "--writer-id", str(n),
+                stdout=asyncio.subprocess.PIPE,
+            )
+            for n in range(writers)
+        ]
+        stats = await _read_until(base_url, paths, readers, procs)
+        summaries = [json.loads((await proc.stdout.read()).decode().strip().splitlines()[-1]) for proc in procs]
+    finally:
+        server.terminate()
+        await server.wait()
+    return {
+        **stats,
+        "ingest_s": max(summary["seconds"] for summary in summaries),
+        "ingested": sum(summary["cases"] for summary in summaries),
+        "failed_batches": sum(summary["failed_batches"] for summary in summaries),
+    }
+
+
+@app.command()
+def run(readers: int = typer.Option(16, min=1, help="Concurrent /cases clients"),
+        writers: int = typer.Option(2, min=1, max=99, help="Concurrent ingest processes"),
+        batches: int = typer.Option(40, min=1, help="Ingest transactions per writer"),
+        batch_size: int = typer.Option(500, min=1, help="Cases per ingest transaction"),
+        parties_per_case: int = typer.Option(3, min=0, help="Parties per case, seeded and ingested"),
+        cases: int = typer.Option(20000, min=1, help="Cases seeded before the ingest starts"),
+        port: int = typer.Option(8766, help="Port for the server under test"),
+        json_out: Path | None = typer.Option(None, help="Write the results to this JSON file")) -> None:
+    tmpdir = tempfile.TemporaryDirectory(prefix="bench_db_concurrency_")
+    seeded = Path(tmpdir.name) / "seed.db"
+    # Inherited by the server and ingest processes; ct_scraper reads it at import time.
+    os.environ["DATABASE_URL"] = f"sqlite:///{seeded}"
+    os.environ["RESPONSE_CACHE"] = "off"
+
+    from ct_scraper.counties import TOWN_TO_COUNTY
+    from ct_scraper.database import engine
+
+    _seed(cases, parties_per_case)
+    engine.dispose()
+    # One self-contained rollback-journal file that each mode starts from.
+    with sqlite3.connect(seeded) as conn:
+        conn.execute("PRAGMA journal_mode = DELETE")
+
+    paths = [f"/cases?limit=50&town={town}" for town in TOWN_TO_COUNTY]
+    ingest_args = ["--batches", str(batches), "--batch-size", str(batch_size), "--parties-per-case", str(parties_per_case)]
+    report = {}
+    for mode in MODES:
+        target = Path(tmpdir.name) / f"{mode}.db"
+        shutil.copy(seeded, target)
+        os.environ["DATABASE_URL"] = f"sqlite:///{target}"
+        report[mode] = asyncio.run(_measure(mode, port, paths, readers, writers, ingest_args))
+
+    typer.echo(f"{cases} seeded cases, {readers} readers, {writers} writers each ingesting {batches} x {batch_size} cases")
+    for mode, stats in report.items():
+        typer.echo(
+            f"{mode:6s} ingest={stats['ingest_s']:.1f}s ({stats['ingested']} cases, {stats['failed_batches']} failed batches) "
+            f"reads={stats['reads']} ({stats['reads_per_s']:.0f}/s) p50={stats['p50_ms']:.0f}ms "
+            f"p99={stats['p99_ms']:.0f}ms max={stats['max_ms']:.0f}ms errors={stats['read_errors']}"
+        )
+    if json_out:
+        json_out.write_text(json.dumps(
+            {"readers": readers, "writers": writers, "batches": batches, "batch_size": batch_size, "results": report},
+            indent=2,
+        ))
+    tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,65 @@
+"""Benchmark the lxml results/detail parsers against recorded pages.
+
+Run after changing ct_scraper/parsers.py and compare the per-page timings with
+the previous release (``--json-out`` keeps a copy of the numbers).
+"""
+from __future__ import annotations
+
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import typer
+
+from ct_scraper.parsers import parse_case_row, parse_docket_links, parse_form_fields, parse_result_rows
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+RESULTS_PAGE = BASE_DIR / "hartford_page.html"
+DETAIL_DIR = BASE_DIR / "tests" / "fixtures" / "detail_pages"
+RESULTS_URL = "https://civilinquiry.jud.ct.gov/PropertyAddressSearchResults.aspx"
+
+app = typer.Typer(help="Benchmark HTML parsers over recorded fixtures")
+
+
+def _time(fn: Callable[[], object], rounds: int) -> Dict[str, float]:
+    samples: List[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"min_ms": min(samples), "median_ms": statistics.median(samples), "max_ms": max(samples)}
+
+
+@app.command()
+def run(rounds: int = typer.Option(50, min=1, help="Timed iterations per fixture"),
+        results_page: Path = typer.Option(RESULTS_PAGE, help="Recorded gvPropertyResults page"),
+        detail_dir: Path = typer.Option(DETAIL_DIR, help="Directory of recorded PublicCaseDetail pages"),
+        json_out: Path | None = typer.Option(None, help="Write the timings to this JSON file")) -> None:
+    report: Dict[str, Dict[str, float]] = {}
+
+    raw = results_page.read_bytes()
+    rows = parse_result_rows(raw, RESULTS_URL)
+    report["results.parse_result_rows"] = _time(lambda: parse_result_rows(raw, RESULTS_URL), rounds)
+    report["results.parse_docket_links"] = _time(lambda: parse_docket_links(raw, RESULTS_URL), rounds)
+    report["results.parse_form_fields"] = _time(lambda: parse_form_fields(raw), rounds)
+    typer.echo(f"{results_page.name}: {len(raw) / 1024:.0f} KiB, {len(rows)} result rows")
+
+    detail_pages = sorted(detail_dir.glob("*.html")) if detail_dir.exists() else []
+    if detail_pages:
+        blobs = [p.read_bytes() for p in detail_pages]
+        per_page = _time(lambda: [parse_case_row(b, "bench") for b in blobs], rounds)
+        report["detail.parse_case_row"] = {k: v / len(blobs) for k, v in per_page.items()}
+        typer.echo(f"{detail_dir}: {len(blobs)} detail pages")
+    else:
+        typer.echo(f"No detail fixtures in {detail_dir}; record some with scripts/record_fixtures.py")
+
+    for name, stats in report.items():
+        typer.echo(f"{name:32s} min={stats['min_ms']:.2f}ms median={stats['median_ms']:.2f}ms max={stats['max_ms']:.2f}ms")
+    if json_out:
+        json_out.write_text(json.dumps({"rounds": rounds, "timings": report}, indent=2))
+
+
+if __name__ == "__main__":
+    app()
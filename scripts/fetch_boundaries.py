@@ -0,0 +1,68 @@
+"""Download simplified CT state, county and town boundaries for the API to serve under /map/boundaries.
+
+The CT GIS ArcGIS services simplify server-side (``maxAllowableOffset``) and round
+coordinates (``geometryPrecision``), so the town layer shrinks to a size the map
+can load on every visit. Rerun when the source layers change.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict
+
+import requests
+import typer
+
+from ct_scraper.config import get_settings
+
+app = typer.Typer(help="Fetch CT boundary GeoJSON layers into BOUNDARIES_DIR")
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("fetch_boundaries")
+
+SERVICE = "https://gis.data.ct.gov/arcgis/rest/services/CTGov_Open_Data"
+LAYERS = {
+    "state": f"{SERVICE}/Connecticut_State_Boundary/MapServer/0/query",
+    "counties": f"{SERVICE}/Connecticut_Counties/MapServer/0/query",
+    "towns": f"{SERVICE}/Connecticut_Towns/MapServer/0/query",
+}
+
+
+def _slim(feature: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the geometry and name-like attributes; the map only draws outlines."""
+    properties = {
+        key: value
+        for key, value in (feature.get("properties") or {}).items()
+        if "name" in key.lower() or key.lower() in {"town", "county"}
+    }
+    return {"type": "Feature", "geometry": feature.get("geometry"), "properties": properties}
+
+
+@app.command()
+def run(out_dir: Path | None = typer.Option(None, help="Output directory (default: BOUNDARIES_DIR)"),
+        tolerance: float = typer.Option(0.0005, help="Simplification tolerance in degrees (~50 m)"),
+        precision: int = typer.Option(5, min=3, max=8, help="Decimal places kept in coordinates")) -> None:
+    target = out_dir or Path(get_settings().boundaries_dir)
+    target.mkdir(parents=True, exist_ok=True)
+    for layer, url in LAYERS.items():
+        params = {
+            "where": "1=1",
+            "outFields": "*",
+            "outSR": 4326,
+            "maxAllowableOffset": tolerance,
+            "geometryPrecision": precision,
+            "f": "geojson",
+        }
+        response = requests.get(url, params=params, timeout=120)
+        response.raise_for_status()
+        data = response.json()
+        collection = {"type": "FeatureCollection", "features": [_slim(f) for f in data.get("features", [])]}
+        path = target / f"{layer}.geojson"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(collection, separators=(",", ":")))
+        tmp.replace(path)
+        logger.info("%s: %d features, %.0f KiB -> %s", layer, len(collection["features"]), path.stat().st_size / 1024, path)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,54 @@
+"""Report how much address normalization raises geocode cache hits and dedups lookups."""
+from __future__ import annotations
+
+from collections import Counter
+from typing import Dict, Set
+
+import typer
+from sqlalchemy import select
+
+from ct_scraper.address import address_key
+from ct_scraper.database import session_scope
+from ct_scraper.geocode import get_cache
+from ct_scraper.models import Case
+
+app = typer.Typer(help="Geocode cache hit-rate report")
+
+
+@app.command()
+def run(limit: int | None = typer.Option(None, help="Only look at this many cases")) -> None:
+    cache = get_cache()
+    total = raw_hits = 0
+    raw_keys: Set[str] = set()
+    # Cases per normalized key, and whether that key or any raw spelling of it is cached.
+    norm_cases: Counter = Counter()
+    norm_cached: Dict[str, bool] = {}
+    stmt = select(Case.property_address, Case.town).where(Case.property_address != "").order_by(Case.id)
+    if limit:
+        stmt = stmt.limit(limit)
+    with session_scope() as session:
+        for address, town in session.execute(stmt.execution_options(yield_per=1000)):
+            raw = f"{address}, {town}, CT"
+            norm = address_key(address, town)
+            raw_hit = cache.get(raw) is not None
+            total += 1
+            raw_keys.add(raw)
+            raw_hits += raw_hit
+            norm_cases[norm] += 1
+            if not norm_cached.get(norm):
+                norm_cached[norm] = raw_hit or cache.get(norm) is not None
+    norm_hits = sum(n for key, n in norm_cases.items() if norm_cached[key])
+
+    def pct(part: int, whole: int) -> str:
+        return f"{100.0 * part / whole:.1f}%" if whole else "n/a"
+
+    typer.echo(f"cases with an address:       {total}")
+    typer.echo(f"distinct raw addresses:      {len(raw_keys)}")
+    typer.echo(f"distinct normalized:         {len(norm_cases)} ({pct(len(raw_keys) - len(norm_cases), len(raw_keys))} fewer lookups)")
+    typer.echo(f"hit rate before (raw):       {pct(raw_hits, total)}")
+    typer.echo(f"hit rate after (normalized): {pct(norm_hits, total)}")
+    typer.echo(f"lookups left (~1s each):     {sum(1 for cached in norm_cached.values() if not cached)}")
+
+
+if __name__ == "__main__":
+    app()
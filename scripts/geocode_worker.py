@@ -0,0 +1,50 @@
+"""Drain the geocode queue filled by scrape runs."""
+from __future__ import annotations
+
+import logging
+import time
+
+import typer
+
+from ct_scraper.geocode import get_cache, get_geocoder
+from ct_scraper.geocode_queue import MAX_ATTEMPTS, abandoned_jobs, drain_queue, enqueue_missing, pending_jobs
+from ct_scraper.pipeline import init_db
+
+app = typer.Typer(help="Geocode queued cases at the provider's rate")
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("geocode_worker")
+
+
+@app.command()
+def run(limit: int | None = typer.Option(None, help="Stop after this many lookups"),
+        batch_size: int = typer.Option(50, min=1, help="Lookups written per database transaction"),
+        max_attempts: int = typer.Option(MAX_ATTEMPTS, min=1, help="Give up on an address after this many misses"),
+        enqueue: bool = typer.Option(True, help="First queue stored cases that have no coordinates yet")) -> None:
+    init_db()
+    if enqueue:
+        queued = enqueue_missing()
+        if queued:
+            logger.info("Queued %d cases missing coordinates", queued)
+    logger.info("Geocode queue: %d pending", pending_jobs(max_attempts))
+    started = time.monotonic()
+    stats = drain_queue(limit, batch_size=batch_size, max_attempts=max_attempts)
+    cache = get_cache()
+    logger.info("Geocode cache: hits=%d misses=%d hit_rate=%.0f%%", cache.hits, cache.misses, cache.hit_rate * 100)
+    logger.info("Geocoder %s answers: %s", get_geocoder().name, dict(get_geocoder().hits) or "none")
+    logger.info(
+        "Geocode worker finished. processed=%d geocoded=%d missed=%d gave_up=%d deferred=%d hit_rate=%.0f%% "
+        "elapsed=%.0fs",
+        stats.processed, stats.geocoded, stats.missed, stats.gave_up, stats.deferred, stats.hit_rate * 100,
+        time.monotonic() - started,
+    )
+
+
+@app.command()
+def status(max_attempts: int = typer.Option(MAX_ATTEMPTS, min=1)) -> None:
+    init_db()
+    typer.echo(f"{pending_jobs(max_attempts)} cases waiting for coordinates, "
+               f"{abandoned_jobs(max_attempts)} given up after {max_attempts} attempts")
+
+
+if __name__ == "__main__":
+    app()
@@ -14,8 +14,6 @@ import os
 
 import pathlib
 
-import random
-
 import shutil
 
 import subprocess
@@ -42,6 +40,8 @@ try:
 
     from ct_scraper.models import Case
 
+    from ct_scraper.throttle import get_throttle, log_throttles
+
 except ImportError as exc:  # pragma: no cover
 
     logging.critical("Import error: %s. Make sure the ct_scraper module is in the parent directory.", exc)
@@ -354,6 +354,8 @@ def run_pdf_downloader(limit: int | None) -> None:
 
     wait = WebDriverWait(driver, 25)
 
+    throttle = get_throttle()
+
 
 
     processed = successes = failures = 0
@@ -372,18 +374,26 @@ def run_pdf_downloader(limit: int | None) -> None:
 
 
 
+            throttle.wait()
+
+            started = time.monotonic()
+
             try:
 
                 driver.get(url)
 
             except Exception as exc:
 
+                throttle.record(time.monotonic() - started, ok=False)
+
                 logger.error("Navigation error for %s: %s", docket, exc)
 
                 failures += 1
 
                 continue
 
+            throttle.record(time.monotonic() - started)
+
 
 
             try:
@@ -436,10 +446,6 @@ def run_pdf_downloader(limit: int | None) -> None:
 
             processed += 1
 
-
-
-            time.sleep(random.uniform(0.3, 0.8))
-
     finally:
 
         driver.quit()
@@ -450,6 +456,8 @@ def run_pdf_downloader(limit: int | None) -> None:
 
         logger.info("Outputs saved to: %s", PDF_OUTPUT_DIR)
 
+        log_throttles()
+
 
 
 
@@ -28,8 +28,10 @@ PROJECT_ROOT = CURRENT_DIR.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from ct_scraper.data_version import bump_data_version
 from ct_scraper.database import session_scope
 from ct_scraper.models import Case, Party
+from ct_scraper.search import case_search_text
 
 MODEL = "google/gemini-flash-1.5"
 API_URL = "https://openrouter.ai/api/v1/chat/completions"
@@ -383,6 +385,12 @@ def update_defendant_addresses(
                     )
 
             case.defendants_json = json.dumps(clean_defendants, ensure_ascii=False)
+            session.flush()
+            session.refresh(case, ["parties"])
+            case.search_text = case_search_text(
+                case.docket_no, case.town, case.property_address, (p.name for p in case.parties), case.defendants_json
+            )
+            bump_data_version(session)
             session.commit()
             logging.info("Committed %d updates for %s", updated, docket)
 
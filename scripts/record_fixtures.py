@@ -0,0 +1,40 @@
+"""Record live results and case-detail pages for offline parser checks and benchmarks."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import typer
+from lxml import html as lxml_html
+
+from ct_scraper.http_scraper import HttpCaseScraper
+from ct_scraper.parsers import parse_result_rows
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+FIXTURE_DIR = BASE_DIR / "tests" / "fixtures"
+
+app = typer.Typer(help="Save civil inquiry pages as parser fixtures")
+
+
+@app.command()
+def run(town: str = typer.Option("Hartford", help="Town to search"),
+        details: int = typer.Option(10, min=0, help="Number of case detail pages to save"),
+        out_dir: Path = typer.Option(FIXTURE_DIR, help="Fixture root directory")) -> None:
+    detail_dir = out_dir / "detail_pages"
+    detail_dir.mkdir(parents=True, exist_ok=True)
+    with HttpCaseScraper() as scraper:
+        page_url, doc = next(scraper.iter_results_pages(town))
+        results_path = out_dir / f"{town.lower().replace(' ', '_')}_results.html"
+        results_path.write_bytes(lxml_html.tostring(doc))
+        typer.echo(f"Saved {results_path}")
+
+        assert scraper.session is not None
+        for row in parse_result_rows(doc, page_url)[:details]:
+            resp = scraper.session.get(row.docket_href, timeout=scraper.timeout)
+            resp.raise_for_status()
+            path = detail_dir / f"{row.docket_no.replace('-', '')}.html"
+            path.write_bytes(resp.content)
+            typer.echo(f"Saved {path}")
+
+
+if __name__ == "__main__":
+    app()
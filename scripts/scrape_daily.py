@@ -3,13 +3,18 @@ from __future__ import annotations
 
 import datetime as dt
 import logging
+import threading
 from typing import List
 
 import typer
 
 from ct_scraper.config import get_settings
-from ct_scraper.pipeline import init_db, save_cases
+from ct_scraper.http_scraper import HttpCaseScraper
+from ct_scraper.incremental import EarlyStopPolicy, load_known_dockets
+from ct_scraper.parallel import ScraperPool
+from ct_scraper.pipeline import CaseStreamWriter, completed_towns, init_db
 from ct_scraper.scrape_cases import CaseScraper
+from ct_scraper.throttle import log_throttles
 from ct_scraper.towns import TOWNS
 
 app = typer.Typer(help="Run daily CT civil inquiry scrape")
@@ -19,18 +24,88 @@ logger = logging.getLogger("scrape_daily")
 
 @app.command()
 def run(headless: bool = typer.Option(True, help="Run Chrome in headless mode"),
-        limit: int | None = typer.Option(None, help="Limit towns processed for testing")) -> None:
+        limit: int | None = typer.Option(None, help="Limit towns processed for testing"),
+        workers: int = typer.Option(1, min=1, help="Number of parallel scraper sessions"),
+        engine: str = typer.Option("browser", help="Scrape engine: 'browser' (Selenium) or 'http'"),
+        detail_concurrency: int = typer.Option(4, min=1, help="Case detail pages fetched at once per worker"),
+        detail_rate: float = typer.Option(4.0, help="Ceiling for the adaptive request rate to the court site (req/s)"),
+        full: bool = typer.Option(False, help="Re-open every docket, including ones already stored"),
+        refresh_days: int | None = typer.Option(None, help="Re-fetch stored dockets with a last action in this many days"),
+        stop_after_known_pages: int = typer.Option(
+            0, min=0, help="Stop paging a town after this many consecutive pages with no new dockets (0 = never)"),
+        batch_size: int = typer.Option(50, min=1, help="Rows committed per database transaction"),
+        run_key: str | None = typer.Option(None, help="Checkpoint key for this run (default: today's UTC date)"),
+        resume: bool = typer.Option(False, help="Skip towns already completed under the same run key")) -> None:
     settings = get_settings()
-    logger.info("Starting scrape. headless=%s", headless)
+    logger.info("Starting scrape. headless=%s workers=%d engine=%s", headless, workers, engine)
     init_db()
     towns: List[str] = settings.allowed_towns or TOWNS
     if limit:
         towns = towns[:limit]
+    run_key = run_key or dt.datetime.utcnow().date().isoformat()
+    done = completed_towns(run_key) if resume else set()
+    if done:
+        logger.info("Resuming run %s: %d towns already completed", run_key, len(done))
+        towns = [t for t in towns if t not in done]
 
-    with CaseScraper(headless=headless) as scraper:
-        rows = list(scraper.scrape_towns(towns))
-    inserted = save_cases(rows)
-    logger.info("Scrape finished. towns=%d inserted_cases=%d", len(towns), inserted)
+    if engine not in {"browser", "http"}:
+        raise typer.BadParameter("engine must be 'browser' or 'http'")
+    known = None if full else load_known_dockets(refresh_days)
+    if known is not None:
+        logger.info("Incremental scrape: %d known dockets, %d due for refresh", len(known), len(known.refresh))
+    refresh = bool(refresh_days) or full
+    early_stop = EarlyStopPolicy(stop_after_known_pages if known is not None else 0)
+    detail_opts = {
+        "detail_concurrency": detail_concurrency,
+        "detail_rate": detail_rate,
+        "known": known,
+        "early_stop": early_stop,
+    }
+    if engine == "http":
+        factory = lambda: HttpCaseScraper(**detail_opts)
+    else:
+        factory = lambda: CaseScraper(headless=headless, **detail_opts)
+
+    if workers > 1:
+        # One writer per worker, so each buffers at most one batch of its own town.
+        lock = threading.Lock()
+        sinks = lambda: CaseStreamWriter(
+            run_key, batch_size=batch_size, refresh=refresh, known=known, lock=lock
+        ).write_town
+        pool = ScraperPool(sinks, workers=workers, factory=factory)
+        result = pool.run(towns)
+        _log_paging(early_stop)
+        log_throttles()
+        logger.info(
+            "Scrape finished. towns=%d inserted_cases=%d skipped_known=%d elapsed=%.0fs failed_towns=%s",
+            len(towns), result.saved, known.skipped if known else 0, result.elapsed,
+            ", ".join(result.failed_towns) or "none",
+        )
+        return
+
+    writer = CaseStreamWriter(run_key, batch_size=batch_size, refresh=refresh, known=known)
+    with factory() as scraper:
+        for town in towns:
+            writer.write_town(town, scraper.scrape_towns([town]))
+    _log_paging(early_stop)
+    log_throttles()
+    logger.info(
+        "Scrape finished. towns=%d inserted_cases=%d skipped_known=%d",
+        len(towns), writer.inserted, known.skipped if known else 0,
+    )
+
+
+def _log_paging(early_stop: EarlyStopPolicy) -> None:
+    for stats in early_stop.towns_stopped_early:
+        logger.info(
+            "Early stop: town=%s pages_read=%d pages_skipped=%d",
+            stats.town, stats.pages_read, stats.pages_skipped,
+        )
+    if early_stop.known_pages:
+        logger.info(
+            "Early stop summary: towns_stopped=%d pages_skipped=%d",
+            len(early_stop.towns_stopped_early), early_stop.pages_skipped,
+        )
 
 
 @app.command()
@@ -17,6 +17,7 @@ with session_scope() as session:
     case = Case(
         docket_no="AANCV156018160S",
         town="Bridgeport",
+        county="Fairfield",
         case_type="Civil",
         court_location="Superior Court",
         property_address="Test Property",
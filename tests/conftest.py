@@ -0,0 +1,64 @@
+"""Shared fixtures.
+
+ct_scraper builds its engine from DATABASE_URL when it is first imported, so the
+scratch database is configured here, before any test module imports it.
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pytest
+
+_DB_DIR = tempfile.TemporaryDirectory(prefix="ct_scraper_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_DB_DIR.name) / 'test.db'}"
+os.environ["RESPONSE_CACHE"] = "off"
+
+from sqlalchemy import delete  # noqa: E402
+
+from ct_scraper.parsers import CASE_DETAIL_URL, CaseRow  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def _schema():
+    from ct_scraper.pipeline import init_db
+
+    init_db()
+
+
+@pytest.fixture
+def db(_schema):
+    """The initialised scratch database's engine; rows the test writes are deleted afterwards."""
+    from ct_scraper.database import engine
+    from ct_scraper.models import Base, DataVersion
+
+    yield engine
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            if table is not DataVersion.__table__:
+                conn.execute(delete(table))
+
+
+@pytest.fixture
+def make_case_row() -> Callable[..., CaseRow]:
+    """Build a CaseRow as the scrapers yield it; keyword arguments override the defaults."""
+
+    def make(docket: str = "HHDCV246194967S", town: str = "Hartford",
+             parties: Optional[List[Dict[str, str]]] = None, **fields: str) -> CaseRow:
+        values = {
+            "case_type": "P00 - Property - Foreclosure",
+            "court_location": "HARTFORD JD",
+            "property_address": "1121 TOLLAND STREET EAST HARTFORD, CT 06108",
+            "list_type": "No List Type",
+            "trial_list_claim": "",
+            "last_action_date": "09/30/2026",
+            **fields,
+        }
+        if parties is None:
+            parties = [{"role": "D-01", "name": "MARTIN, SCOTT L", "attorney": "",
+                        "address": "1121 TOLLAND STREET", "file_date": "05/06/2024"}]
+        return CaseRow(town=town, docket_link=CASE_DETAIL_URL.format(docket), parties=parties, **values)
+
+    return make
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import pytest
+
+from ct_scraper.address import address_key, normalize_address, normalize_town, strip_locality, strip_unit
+
+
+@pytest.mark.parametrize("raw, street", [
+    ("102 Orchard Street, Apt 2", "102 Orchard Street"),
+    ("East River DriveUnit 807", "East River Drive"),
+    ("12 Northbrook Court#9", "12 Northbrook Court"),
+    ("55 North Main St, Unit 4B", "55 North Main St"),
+    ("3 Fl Ave", "3 Fl Ave"),
+    ("", ""),
+])
+def test_strip_unit(raw, street):
+    assert strip_unit(raw) == street
+
+
+@pytest.mark.parametrize("raw, street", [
+    # The court's property address format, town glued onto the street.
+    ("1121 TOLLAND STREET EAST HARTFORD, CT 06108", "1121 TOLLAND STREET"),
+    ("1121 Tolland St, East Hartford, CT 06108", "1121 Tolland St"),
+    ("236 Broadway, Milford, CT 06460", "236 Broadway"),
+    ("12 Main Street North Haven, CT 06473-1234", "12 Main Street"),
+    ("12 Oak Ct, CT", "12 Oak Ct"),
+    # No state, so nothing is taken for a town or for Connecticut.
+    ("12 Oak Ct", "12 Oak Ct"),
+    ("7 Berlin Turnpike", "7 Berlin Turnpike"),
+])
+def test_strip_locality(raw, street):
+    assert strip_locality(raw) == street
+
+
+@pytest.mark.parametrize("raw, normalized", [
+    ("102 Orchard Street, Apt 2", "102 ORCHARD ST"),
+    ("102 orchard st.", "102 ORCHARD ST"),
+    ("1121 TOLLAND STREET", "1121 TOLLAND ST"),
+    ("1121 TOLLAND STREET EAST HARTFORD, CT 06108", "1121 TOLLAND ST"),
+    ("99 EAST STREET WEST HARTFORD, CT 06107", "99 EAST ST"),
+    ("East River DriveUnit 807", "E RIVER DR"),
+    ("10 West Avenue Extension", "10 WEST AVE EXT"),
+    ("10 West Main Street", "10 W MAIN ST"),
+    ("5 North St", "5 NORTH ST"),
+    ("5 Main St North", "5 MAIN ST N"),
+    ("23-25 Vineland Terrace", "23-25 VINELAND TER"),
+    # Suffix words inside the street name are left alone.
+    ("8 La Salle Road", "8 LA SALLE RD"),
+    ("12 Court Street", "12 COURT ST"),
+    ("Lane Street", "LANE ST"),
+    ("", ""),
+])
+def test_normalize_address(raw, normalized):
+    assert normalize_address(raw) == normalized
+
+
+def test_address_key():
+    assert address_key("102 Orchard Street, Apt 2", "East  Hartford") == "102 ORCHARD ST|EAST HARTFORD|CT"
+    assert address_key("102 orchard st.", "east hartford") == address_key("102 Orchard St", "EAST HARTFORD")
+    assert address_key("102 Orchard St", "Hartford") != address_key("102 Orchard St", "East Hartford")
+    assert address_key("", "Hartford") == ""
+    assert address_key("1121 TOLLAND STREET EAST HARTFORD, CT 06108", "East Hartford") == address_key(
+        "1121 Tolland St, East Hartford, CT 06108", "EAST HARTFORD"
+    ) == "1121 TOLLAND ST|EAST HARTFORD|CT"
+    assert normalize_town(" new  haven ") == "NEW HAVEN"
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ct_scraper.api.app import create_app
+from ct_scraper.api.cache import KEY_PREFIX, CachedResponse, ResponseCache, cache_key, etag_for, etag_matches
+from ct_scraper.data_version import get_data_version
+from ct_scraper.database import SessionLocal
+from ct_scraper.pipeline import save_cases
+
+
+def test_cache_key_ignores_param_order_unset_params_and_padding():
+    key = cache_key("/cases", {"limit": 50, "town": "Hartford", "cursor": None}, 3)
+    assert key.startswith(KEY_PREFIX)
+    assert key == cache_key("/cases", {"town": " Hartford ", "limit": 50}, 3)
+
+
+@pytest.mark.parametrize("path, params, version", [
+    ("/cases", {"limit": 50, "town": "Hartford"}, 4),
+    ("/map/clusters", {"limit": 50, "town": "Hartford"}, 3),
+    ("/cases", {"limit": 100, "town": "Hartford"}, 3),
+    ("/cases", {"limit": 50, "town": "hartford"}, 3),
+    ("/cases", {"limit": 50, "town": "Hartford", "county": "Hartford"}, 3),
+])
+def test_cache_key_changes_with_version_path_and_values(path, params, version):
+    assert cache_key(path, params, version) != cache_key("/cases", {"limit": 50, "town": "Hartford"}, 3)
+
+
+@pytest.mark.parametrize("header, matches", [
+    (None, False),
+    ("", False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", W/"abc"', True),
+    ('"xyz"', False),
+    ("abc", False),
+    ("*", True),
+])
+def test_etag_matches(header, matches):
+    assert etag_matches(header, '"abc"') is matches
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = ResponseCache(maxsize=2)
+    cache.put("a", CachedResponse(b"a"))
+    cache.put("b", CachedResponse(b"b"))
+    assert cache.get("a").body == b"a"
+    cache.put("c", CachedResponse(b"c"))
+    assert cache.get("b") is None
+    assert [cache.get(k).body for k in ("a", "c")] == [b"a", b"c"]
+    assert (cache.hits, cache.misses, len(cache)) == (3, 1, 2)
+
+
+def test_cases_etag_revalidates_until_data_changes(db, make_case_row):
+    save_cases([make_case_row("HHDCV246194967S")])
+    with TestClient(create_app()) as client:
+        first = client.get("/cases", params={"limit": 10})
+        etag = first.headers["ETag"]
+        with SessionLocal() as session:
+            version = get_data_version(session)
+        assert first.status_code == 200
+        assert etag == etag_for(cache_key("/cases", {"limit": 10, "cursor": None}, version))
+
+        assert client.get("/cases", params={"limit": 10}, headers={"If-None-Match": etag}).status_code == 304
+        # A different page is a different resource.
+        assert client.get("/cases", params={"limit": 5}, headers={"If-None-Match": etag}).status_code == 200
+
+        save_cases([make_case_row("HHDCV216138878S")])
+        changed = client.get("/cases", params={"limit": 10}, headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+        assert len(changed.json()) == 2
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import Dict
+
+from ct_scraper.detail_fetch import DetailFetcher
+
+DETAIL_URL = "https://civilinquiry.jud.ct.gov/CaseDetail/PublicCaseDetail.aspx?DocketNo="
+
+
+class StubResponse:
+    def __init__(self, content: bytes, url: str) -> None:
+        self.content = content
+        self.url = url
+        self.status_code = 200
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class StubSession:
+    def __init__(self, pages: Dict[str, bytes]) -> None:
+        self.pages = pages
+
+    def get(self, url: str, timeout: float = None) -> StubResponse:
+        return StubResponse(self.pages[url], url)
+
+
+def test_unparseable_page_is_a_miss_for_that_docket_only():
+    good = DETAIL_URL + "HHDCV246194967S"
+    empty = DETAIL_URL + "HHDCV216138878S"
+    pages = {good: b"<html><body><table></table></body></html>", empty: b""}
+    fetcher = DetailFetcher(StubSession(pages), concurrency=2, rate_per_host=1000)
+    try:
+        rows = list(fetcher.fetch("EAST HARTFORD", [empty, good]))
+    finally:
+        fetcher.close()
+    assert [row.town for row in rows] == ["EAST HARTFORD"]
+    assert (fetcher.fetched, fetcher.failed) == (1, 1)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from geopy.exc import GeocoderUnavailable
+
+from ct_scraper import geocode, geocode_cache
+from ct_scraper.address import address_key
+from ct_scraper.geocode import RemoteGeocoder
+from ct_scraper.geocode_cache import GeocodeCache
+
+ADDRESS, TOWN = "1121 Tolland Street", "East Hartford"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return GeocodeCache(tmp_path / "cache.sqlite3", negative_ttl=60)
+
+
+class ScriptedProvider:
+    """geopy provider stand-in whose geocode() returns or raises the next scripted outcome."""
+
+    script: list = []
+    calls: list = []
+
+    def __init__(self, user_agent, timeout) -> None:
+        pass
+
+    def geocode(self, query):
+        self.calls.append(query)
+        outcome = self.script.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def provider(monkeypatch, cache):
+    monkeypatch.setattr(geocode, "_cache", cache)
+    monkeypatch.setitem(geocode.REMOTE_PROVIDERS, "nominatim", ScriptedProvider)
+    monkeypatch.setattr(ScriptedProvider, "script", [])
+    monkeypatch.setattr(ScriptedProvider, "calls", [])
+    return ScriptedProvider
+
+
+def _remote():
+    return RemoteGeocoder("nominatim", min_delay=0, max_retries=1, error_wait=0)
+
+
+def test_miss_expires_after_negative_ttl(cache, monkeypatch):
+    cache.put("miss", None)
+    cache.put("hit", (41.77, -72.61))
+    assert cache.get("miss").found is False and cache.get("miss").coords is None
+
+    now = geocode_cache.time.time()
+    monkeypatch.setattr(geocode_cache.time, "time", lambda: now + 61)
+    assert cache.get("miss") is None
+    assert cache.get("hit").coords == (41.77, -72.61)
+
+
+def test_import_json_keeps_existing_keys_and_skips_unusable_entries(cache, tmp_path):
+    cache.put("kept", (1.0, 2.0))
+    legacy = tmp_path / "geocode_cache.json"
+    legacy.write_text(json.dumps({
+        "kept": {"lat": 9.0, "lng": 9.0},
+        "added": {"lat": 41.77, "lng": -72.61},
+        "no coords": {"lat": None, "lng": None},
+        "not a dict": [41.77, -72.61],
+    }))
+    assert cache.import_json(legacy) == 1
+    assert len(cache) == 2
+    assert cache.get("kept").coords == (1.0, 2.0)
+    assert cache.get("added").coords == (41.77, -72.61)
+
+
+def test_import_json_tolerates_an_unreadable_file(cache, tmp_path):
+    broken = tmp_path / "geocode_cache.json"
+    broken.write_text("{not json")
+    assert cache.import_json(broken) == 0
+    assert cache.import_json(tmp_path / "missing.json") == 0
+
+
+def test_provider_error_raises_and_writes_nothing(provider, cache):
+    provider.script = [GeocoderUnavailable("503"), GeocoderUnavailable("503")]
+    with pytest.raises(GeocoderUnavailable):
+        _remote().geocode(ADDRESS, TOWN)
+    assert len(provider.calls) == 2
+    assert len(cache) == 0
+
+    # The next lookup goes back to the provider instead of reading a cached miss.
+    provider.script = [SimpleNamespace(latitude=41.77, longitude=-72.61)]
+    assert _remote().geocode(ADDRESS, TOWN) == (41.77, -72.61)
+    assert cache.get(address_key(ADDRESS, TOWN)).coords == (41.77, -72.61)
+
+
+def test_empty_answer_is_cached_as_a_miss_for_that_provider(provider, cache):
+    provider.script = [None]
+    remote = _remote()
+    assert remote.geocode(ADDRESS, TOWN) is None
+    assert remote.geocode(ADDRESS, TOWN) is None
+    assert len(provider.calls) == 1
+    assert cache.get(f"nominatim:{address_key(ADDRESS, TOWN)}").found is False
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import datetime as dt
+
+import pytest
+from geopy.exc import GeocoderUnavailable
+from sqlalchemy import delete, select, update
+
+from ct_scraper import geocode_queue
+from ct_scraper.database import SessionLocal, session_scope
+from ct_scraper.geocode_queue import abandoned_jobs, drain_queue, enqueue_missing, pending_jobs
+from ct_scraper.geocode import case_location
+from ct_scraper.geocoders import ADDRESS_PRECISION, TOWN_PRECISION
+from ct_scraper.models import Case, GeocodeJob
+from ct_scraper.pipeline import save_cases
+
+FOUND = "1121 TOLLAND STREET EAST HARTFORD, CT 06108"
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """Answer FOUND and miss every other address, without touching the geocoder chain."""
+    calls = []
+
+    def locate_many(queries):
+        calls.append(list(queries))
+        return [((41.77, -72.61), ADDRESS_PRECISION) if address == FOUND else None for address, _ in queries]
+
+    monkeypatch.setattr(geocode_queue, "locate_many", locate_many)
+    return calls
+
+
+def _make_due():
+    with session_scope() as session:
+        session.execute(update(GeocodeJob).values(not_before=dt.datetime.utcnow() - dt.timedelta(seconds=1)))
+
+
+def _jobs():
+    with SessionLocal() as session:
+        return list(session.scalars(select(GeocodeJob).order_by(GeocodeJob.id)))
+
+
+def test_hit_writes_coordinates_and_clears_job(db, make_case_row, lookups):
+    save_cases([make_case_row("HHDCV246194967S", property_address=FOUND)])
+    stats = drain_queue()
+    assert (stats.processed, stats.geocoded, stats.missed, stats.gave_up) == (1, 1, 0, 0)
+    assert _jobs() == []
+    with SessionLocal() as session:
+        case = session.scalar(select(Case))
+        assert (case.latitude, case.longitude, case.geocode_precision) == (41.77, -72.61, ADDRESS_PRECISION)
+        assert case.geohash
+
+
+def test_miss_is_retried_then_given_up(db, make_case_row, lookups, caplog):
+    save_cases([make_case_row("HHDCV216138878S", property_address="NOWHERE LANE")])
+
+    for attempt in (1, 2):
+        stats = drain_queue(max_attempts=3)
+        assert (stats.missed, stats.gave_up) == (1, 0)
+        assert _jobs()[0].attempts == attempt
+        # Backed off: not due again until RETRY_DELAY * attempts has passed.
+        assert drain_queue(max_attempts=3).processed == 0
+        _make_due()
+
+    with caplog.at_level("WARNING", logger="ct_scraper.geocode_queue"):
+        stats = drain_queue(max_attempts=3)
+    assert (stats.missed, stats.gave_up) == (1, 1)
+    assert "Gave up on 1 addresses after 3 attempts" in caplog.text
+
+    job = _jobs()[0]
+    assert job.attempts == 3 and job.gave_up_at is not None
+    assert (pending_jobs(3), abandoned_jobs(3)) == (0, 1)
+    # Kept in the queue so the case is not queued again, and never claimed again.
+    assert enqueue_missing() == 0
+    _make_due()
+    assert drain_queue(max_attempts=10).processed == 0
+    assert len(lookups) == 3
+
+
+def test_provider_error_leaves_jobs_due_without_using_an_attempt(db, make_case_row, monkeypatch):
+    def unavailable(queries):
+        raise GeocoderUnavailable("503 Service Unavailable")
+
+    monkeypatch.setattr(geocode_queue, "locate_many", unavailable)
+    save_cases([make_case_row("HHDCV246194967S", property_address=FOUND)])
+    for _ in range(3):
+        stats = drain_queue(max_attempts=3)
+        assert (stats.processed, stats.missed, stats.deferred) == (0, 0, 1)
+
+    job = _jobs()[0]
+    assert (job.attempts, job.gave_up_at) == (0, None)
+    assert pending_jobs(3) == 1
+
+
+def test_town_centroid_is_stored_but_retried_for_an_address_match(db, make_case_row, monkeypatch):
+    monkeypatch.setattr(geocode_queue, "locate_many", lambda queries: [((41.76, -72.68), TOWN_PRECISION)] * len(queries))
+    save_cases([make_case_row("HHDCV246194967S")])
+
+    stats = drain_queue(max_attempts=3)
+    assert (stats.geocoded, stats.missed) == (0, 1)
+    assert _jobs()[0].attempts == 1
+    with SessionLocal() as session:
+        case = session.scalar(select(Case))
+        assert (case.latitude, case.geocode_precision, case.geohash) == (41.76, TOWN_PRECISION, None)
+    # Still queued, so it is not queued twice.
+    assert enqueue_missing() == 0
+
+
+def test_enqueue_missing_picks_up_town_precision_cases(db, make_case_row):
+    save_cases([make_case_row("HHDCV246194967S"), make_case_row("HHDCV216138878S")])
+    with session_scope() as session:
+        session.execute(delete(GeocodeJob))
+        ids = dict(session.execute(select(Case.docket_no, Case.id)).all())
+        session.execute(update(Case), [
+            case_location(ids["HHDCV246194967S"], ((41.76, -72.68), TOWN_PRECISION)),
+            case_location(ids["HHDCV216138878S"], ((41.77, -72.61), ADDRESS_PRECISION)),
+        ])
+
+    assert enqueue_missing() == 1
+    assert [job.case_id for job in _jobs()] == [ids["HHDCV246194967S"]]
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+from sqlalchemy import select, update
+
+from ct_scraper.database import SessionLocal, session_scope
+from ct_scraper.geocode import case_location
+from ct_scraper.geocoders import (
+    ADDRESS_PRECISION,
+    TOWN_PRECISION,
+    GeocoderChain,
+    LocalGeocoder,
+    ParallelGeocoders,
+    TownCentroidGeocoder,
+)
+from ct_scraper.models import Case
+from ct_scraper.pipeline import save_cases
+from ct_scraper.spatial import BBox, apply_bbox
+
+HARTFORD = (41.7637, -72.6851)
+
+
+class StubGeocoder:
+    name = "stub"
+    precision = ADDRESS_PRECISION
+
+    def __init__(self, known):
+        self.known = known
+
+    def geocode(self, address, town):
+        return self.known.get(address)
+
+
+def test_chain_reports_precision_of_the_answering_backend():
+    chain = GeocoderChain([StubGeocoder({"1 Main St": (41.1, -72.1)}), TownCentroidGeocoder({"Hartford": HARTFORD})])
+    located = chain.locate_many([("1 Main St", "Hartford"), ("9 Nowhere Ln", "Hartford"), ("9 Nowhere Ln", "Atlantis")])
+    assert located == [((41.1, -72.1), ADDRESS_PRECISION), (HARTFORD, TOWN_PRECISION), None]
+    assert chain.geocode_many([("9 Nowhere Ln", "Hartford")]) == [HARTFORD]
+    assert chain.hits == {"stub": 1, "centroid": 2}
+
+
+def test_case_location_gives_town_centroids_no_geohash():
+    address = case_location(7, ((41.1, -72.1), ADDRESS_PRECISION))
+    assert address["geohash"] and address["geocode_precision"] == ADDRESS_PRECISION
+    town = case_location(7, (HARTFORD, TOWN_PRECISION))
+    assert town == {"id": 7, "latitude": HARTFORD[0], "longitude": HARTFORD[1],
+                    "geocode_precision": TOWN_PRECISION, "geohash": None}
+
+
+def test_centroid_cases_are_left_out_of_bbox_queries(db, make_case_row):
+    save_cases([make_case_row("HHDCV246194967S"), make_case_row("HHDCV216138878S")])
+    with session_scope() as session:
+        ids = dict(session.execute(select(Case.docket_no, Case.id)).tuples().all())
+        session.execute(update(Case), [
+            case_location(ids["HHDCV246194967S"], ((41.7640, -72.6850), ADDRESS_PRECISION)),
+            case_location(ids["HHDCV216138878S"], (HARTFORD, TOWN_PRECISION)),
+        ])
+
+    box = BBox(-72.70, 41.75, -72.67, 41.78)
+    with SessionLocal() as session:
+        found = session.scalars(apply_bbox(select(Case.docket_no), box, session.get_bind().dialect.name)).all()
+    assert found == ["HHDCV246194967S"]
+
+
+def test_from_csv_skips_malformed_rows(tmp_path, caplog):
+    path = tmp_path / "centroids.csv"
+    path.write_text("town,lat,lng\nHartford,41.7637,-72.6851\nAvon,,-72.86\nBethel,north,-73.41\nCanton,41.82,-72.91\n")
+    with caplog.at_level("WARNING", logger="ct_scraper.geocoders"):
+        geocoder = TownCentroidGeocoder.from_csv(path)
+    assert geocoder.geocode("", "hartford") == HARTFORD
+    assert geocoder.geocode("", "Canton") == (41.82, -72.91)
+    assert geocoder.geocode("", "Avon") is None and geocoder.geocode("", "Bethel") is None
+    assert "centroids.csv:3" in caplog.text and "centroids.csv:4" in caplog.text
+
+
+def test_local_geocoder_matches_court_format_addresses(tmp_path, make_case_row):
+    pytest.importorskip("numpy")
+    path = tmp_path / "points.csv"
+    path.write_text(
+        "town,lat,lng,number,street\n"
+        "EAST HARTFORD,41.7600,-72.6100,1121,Tolland St\n"
+        "EAST HARTFORD,41.7700,-72.6000,1141,Tolland St\n"
+    )
+    local = LocalGeocoder(path)
+    court = make_case_row().property_address  # "1121 TOLLAND STREET EAST HARTFORD, CT 06108"
+    found = local.geocode_many([
+        (court, "East Hartford"),
+        ("1131 TOLLAND STREET EAST HARTFORD, CT 06108", "East Hartford"),
+        ("1121 Tolland St, East Hartford, CT 06108", "East Hartford"),
+    ])
+    assert found[0] == found[2] == (41.76, -72.61)
+    assert found[1] == pytest.approx((41.765, -72.605))
+
+
+class ThreadRecordingGeocoder(StubGeocoder):
+    def __init__(self, name, known):
+        super().__init__(known)
+        self.name = name
+        self.threads = set()
+
+    def geocode(self, address, town):
+        self.threads.add(threading.current_thread())
+        return super().geocode(address, town)
+
+
+def test_parallel_geocoders_reuse_one_pool_across_batches():
+    first = ThreadRecordingGeocoder("first", {"1 Main St": (41.1, -72.1)})
+    second = ThreadRecordingGeocoder("second", {"2 Elm St": (41.2, -72.2)})
+    with ParallelGeocoders([first, second]) as pool:
+        for _ in range(5):
+            queries = [("1 Main St", "Hartford"), ("2 Elm St", "Hartford"), ("3 Oak St", "Hartford")]
+            assert pool.geocode_many(queries) == [(41.1, -72.1), (41.2, -72.2), None]
+        # Each miss is retried by the other provider, but no batch starts threads of its own.
+        assert len(first.threads | second.threads) <= 2
+        assert pool.hits == {"first": 5, "second": 5}
+    with pytest.raises(RuntimeError):
+        pool.geocode_many([("1 Main St", "Hartford")])
+
+
+def test_chain_close_shuts_down_parallel_link():
+    parallel = ParallelGeocoders([StubGeocoder({})])
+    with GeocoderChain([parallel, TownCentroidGeocoder({"Hartford": HARTFORD})]) as chain:
+        assert chain.geocode("1 Main St", "Hartford") == HARTFORD
+    with pytest.raises(RuntimeError):
+        parallel.geocode("1 Main St", "Hartford")
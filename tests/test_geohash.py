@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import pytest
+
+from ct_scraper.geohash import PRECISION, cell_size, encode
+
+
+@pytest.mark.parametrize(
+    "lat, lng, precision, expected",
+    [
+        (57.64911, 10.40744, 11, "u4pruydqqvj"),
+        (42.6, -5.6, 5, "ezs42"),
+        (-25.382708, -49.265506, 7, "6gkzwgj"),
+    ],
+)
+def test_encode_matches_reference_hashes(lat, lng, precision, expected):
+    assert encode(lat, lng, precision) == expected
+
+
+def test_shorter_hash_is_a_prefix_of_the_stored_one():
+    full = encode(41.7637, -72.6851)
+    assert len(full) == PRECISION
+    assert all(full.startswith(encode(41.7637, -72.6851, n)) for n in range(1, PRECISION))
+
+
+def test_nearby_points_share_a_cell():
+    assert encode(41.7637, -72.6851, 6) == encode(41.7640, -72.6855, 6)
+    assert encode(41.7637, -72.6851, 5) != encode(41.3083, -72.9279, 5)
+
+
+def test_cell_size_halves_alternately():
+    assert cell_size(1) == (45.0, 45.0)
+    height, width = cell_size(PRECISION)
+    assert height * 111_000 < 5 and width * 83_000 < 5
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+
+from ct_scraper.http_scraper import SUBMIT_FIELD, TOWN_FIELD, HttpCaseScraper
+from ct_scraper.parsers import (
+    RESULTS_GRID_TARGET,
+    has_results_grid,
+    has_results_page,
+    parse_docket_links,
+    parse_form_fields,
+    parse_result_rows,
+    to_document,
+)
+from ct_scraper.scrape_cases import BASE_URL
+
+# A real first page of East Hartford results: 200 of 343 rows and a pager link to page 2.
+PAGE_ONE = (Path(__file__).resolve().parents[1] / "hartford_page.html").read_bytes()
+# The same grid as the server renders it on page 2: the pager links back to page 1 only.
+PAGE_TWO = PAGE_ONE.replace(b"Page$2", b"Page$1")
+RESULTS_URL = "https://civilinquiry.jud.ct.gov/PropertyAddressSearchResults.aspx"
+NOBOT_FIELD = "ctl00$NoBot$NoBot_NoBotExtender_ClientState"
+
+
+class StubResponse:
+    def __init__(self, content: bytes, url: str) -> None:
+        self.content = content
+        self.url = url
+        self.status_code = 200
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class StubSession:
+    """Answers each request with the next recorded page and keeps what was sent."""
+
+    def __init__(self, pages: List[bytes]) -> None:
+        self.pages = list(pages)
+        self.sent: List[Tuple[str, str, Optional[Dict[str, str]]]] = []
+
+    def request(self, method: str, url: str, timeout: float = None, data: Optional[Dict[str, str]] = None):
+        self.sent.append((method, url, data))
+        return StubResponse(self.pages.pop(0), RESULTS_URL if method == "POST" else url)
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture(scope="module")
+def doc():
+    return to_document(PAGE_ONE)
+
+
+def test_parse_form_fields_answers_nobot_challenge(doc):
+    fields = parse_form_fields(doc, submit=SUBMIT_FIELD)
+    assert fields["__VIEWSTATE"].startswith("/wEPDwU")
+    assert fields["__EVENTVALIDATION"].startswith("/wEdAA")
+    assert fields["__EVENTTARGET"] == fields["__EVENTARGUMENT"] == ""
+    # ChallengeScript is "~535"; the browser would have evaluated it to -536.
+    assert fields[NOBOT_FIELD] == str(~535)
+
+
+def test_parse_result_rows(doc):
+    rows = parse_result_rows(doc, RESULTS_URL)
+    assert len(rows) == 200
+    first = rows[0]
+    assert first.town == "EAST HARTFORD"
+    assert first.street_address == "1121 Tolland Street"
+    assert first.docket_no == "HHD-CV-24-6194967-S"
+    assert first.docket_href == "https://civilinquiry.jud.ct.gov/LoadDocket.aspx?DocketNo=HHD-CV-24-6194967-S"
+    assert first.property_type == "Residential"
+    assert [row.docket_href for row in rows] == parse_docket_links(doc, RESULTS_URL)
+
+
+def test_has_results_page(doc):
+    assert has_results_grid(doc)
+    assert has_results_page(doc, 2)
+    assert not has_results_page(doc, 1)
+    assert not has_results_page(doc, 3)
+
+
+def test_iter_results_pages_posts_state_back_and_stops_on_last_page():
+    session = StubSession([PAGE_ONE, PAGE_ONE, PAGE_TWO])
+    with HttpCaseScraper(session=session, nobot_delay=0, detail_rate=1000) as scraper:
+        pages = list(scraper.iter_results_pages("EAST HARTFORD"))
+
+    assert [url for url, _ in pages] == [RESULTS_URL, RESULTS_URL]
+    assert [method for method, _, _ in session.sent] == ["GET", "POST", "POST"]
+    assert session.sent[0][1] == BASE_URL
+    first_page_state = parse_form_fields(to_document(PAGE_ONE))
+
+    _, url, search = session.sent[1]
+    assert url == RESULTS_URL
+    assert search[TOWN_FIELD] == "EAST HARTFORD"
+    assert search[NOBOT_FIELD] == str(~535)
+
+    _, url, pager = session.sent[2]
+    assert pager["__EVENTTARGET"] == RESULTS_GRID_TARGET
+    assert pager["__EVENTARGUMENT"] == "Page$2"
+    for field in ("__VIEWSTATE", "__VIEWSTATEGENERATOR", "__EVENTVALIDATION"):
+        assert search[field] == pager[field] == first_page_state[field]
+    assert session.pages == []
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import base64
+import datetime as dt
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from ct_scraper.api.pagination import decode_cursor, decode_rank_cursor, encode_cursor, encode_rank_cursor
+from ct_scraper.api.routes import _cases_page
+from ct_scraper.database import SessionLocal
+from ct_scraper.pipeline import save_cases
+
+
+def _raw(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    created_at = dt.datetime(2026, 10, 2, 14, 30, 5, 123456)
+    cursor = encode_cursor(created_at, 4711)
+    assert "=" not in cursor and "/" not in cursor and "+" not in cursor
+    assert decode_cursor(cursor) == (created_at, 4711)
+
+
+def test_rank_cursor_round_trip():
+    assert decode_rank_cursor(encode_rank_cursor(-1.2345678901234567, 4711)) == (-1.2345678901234567, 4711)
+
+
+def test_cursor_kinds_are_not_interchangeable():
+    with pytest.raises(HTTPException):
+        decode_cursor(encode_rank_cursor(-1.5, 4711))
+    with pytest.raises(HTTPException):
+        decode_rank_cursor(encode_cursor(dt.datetime(2026, 10, 2), 4711))
+    with pytest.raises(HTTPException):
+        decode_rank_cursor(_raw(["score", -1.5, 4711]))
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor!",
+    _raw("just a string"),
+    _raw(["2026-10-02T14:30:05"]),
+    _raw(["yesterday", 1]),
+    _raw([20261002, 1]),
+    _raw(["2026-10-02T14:30:05", "one"]),
+    _raw(None),
+])
+def test_malformed_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor)
+    assert exc_info.value.status_code == 400
+
+
+def test_cursor_pages_through_ties_on_created_at(db, make_case_row):
+    # One save_cases batch stamps every case with the same created_at, so only the id orders them.
+    dockets = [f"HHDCV2661{n:05d}S" for n in range(7)]
+    save_cases([make_case_row(docket) for docket in dockets])
+
+    seen, cursor = [], None
+    with SessionLocal() as session:
+        while True:
+            page = _cases_page(session, limit=3, cursor=cursor)
+            seen.extend(case["docket_no"] for case in json.loads(page.body))
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+    assert seen == list(reversed(dockets))
+
+
+def _pages(session, limit, **filters):
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = _cases_page(session, limit=limit, cursor=cursor, **filters)
+        seen.extend(case["docket_no"] for case in json.loads(page.body))
+        pages += 1
+        cursor = page.next_cursor
+        if cursor is None:
+            return seen, pages
+
+
+def test_ranked_search_pages_through_every_match(db, make_case_row):
+    # More defendants make a longer document and a weaker match; pairs tie on rank.
+    rows = []
+    for n in range(8):
+        parties = [{"role": f"D-{i + 1:02d}", "name": f"DOE{i}, JANE"} for i in range(n // 2)]
+        rows.append(make_case_row(f"HHDCV2661{n:05d}S", parties=parties))
+    rows.append(make_case_row("HHDCV266199999S", property_address="9 ELM STREET HARTFORD, CT 06106"))
+    save_cases(rows)
+
+    with SessionLocal() as session:
+        whole, _ = _pages(session, 100, search="tolland")
+        paged, pages = _pages(session, 3, search="tolland")
+    assert pages == 3
+    assert paged == whole
+    assert sorted(paged) == sorted(f"HHDCV2661{n:05d}S" for n in range(8))
+    # Fewest defendants (best match) first; within a tie, the higher id.
+    assert paged[:2] == ["HHDCV266100001S", "HHDCV266100000S"]
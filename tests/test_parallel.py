@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+from selenium.common.exceptions import InvalidSessionIdException, TimeoutException
+
+from ct_scraper.parallel import ScraperPool
+
+
+class FakeScraper:
+    """Scrapes each town from a script of outcomes: an exception to raise or rows to yield, one per attempt."""
+
+    def __init__(self, script: Dict[str, List[object]], sessions: List["FakeScraper"]) -> None:
+        self.script = script
+        self.closed = False
+        sessions.append(self)
+
+    def __enter__(self) -> "FakeScraper":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.closed = True
+
+    def scrape_towns(self, towns):
+        for town in towns:
+            outcome = self.script[town].pop(0) if len(self.script[town]) > 1 else self.script[town][0]
+            if isinstance(outcome, BaseException):
+                raise outcome
+            yield from outcome
+
+
+def _pool(script, sink=None, max_attempts=3):
+    sessions: List[FakeScraper] = []
+    saved: Dict[str, int] = {}
+
+    def default_sink(town, rows):
+        saved[town] = len(list(rows))
+        return saved[town]
+
+    pool = ScraperPool(lambda: sink or default_sink, workers=1, factory=lambda: FakeScraper(script, sessions),
+                       max_attempts=max_attempts)
+    return pool, sessions, saved
+
+
+def test_timeout_retries_town_on_same_session():
+    pool, sessions, saved = _pool({"Slow": [TimeoutException("wait timed out"), ["a", "b"]], "Avon": [["c"]]})
+    result = pool.run(["Slow", "Avon"])
+    assert saved == {"Slow": 2, "Avon": 1}
+    assert len(sessions) == 1
+    assert result.workers[0].restarts == 0
+    assert result.failed_towns == []
+
+
+def test_session_crash_restarts_browser():
+    pool, sessions, saved = _pool({"Avon": [InvalidSessionIdException("gone"), ["a"]]})
+    result = pool.run(["Avon"])
+    assert saved == {"Avon": 1}
+    assert len(sessions) == 2 and sessions[0].closed
+    assert result.workers[0].restarts == 1
+
+
+def test_parse_error_requeues_without_killing_worker():
+    pool, sessions, saved = _pool({"Odd": [ValueError("bad row"), ["a"]], "Avon": [["b", "c"]]})
+    result = pool.run(["Odd", "Avon"])
+    assert saved == {"Odd": 1, "Avon": 2}
+    assert len(sessions) == 1
+    assert result.failed_towns == []
+
+
+def test_sink_failure_is_recorded_and_worker_continues():
+    saved: Dict[str, int] = {}
+
+    def sink(town, rows):
+        if town == "Bad":
+            raise RuntimeError("database is locked")
+        saved[town] = len(list(rows))
+        return saved[town]
+
+    pool, _, _ = _pool({"Bad": [["a"]], "Avon": [["b"]], "Bethel": [["c", "d"]]}, sink=sink, max_attempts=2)
+    result = pool.run(["Bad", "Avon", "Bethel"])
+    assert saved == {"Avon": 1, "Bethel": 2}
+    assert result.failed_towns == ["Bad"]
+    assert result.saved == 3
+
+
+def test_each_worker_streams_into_its_own_sink():
+    script = {town: [["a", "b"]] for town in ("Avon", "Bethel", "Canton", "Derby")}
+    sessions: List[FakeScraper] = []
+    sinks: List[List[str]] = []
+
+    def make_sink():
+        seen: List[str] = []
+        sinks.append(seen)
+
+        def sink(town, rows):
+            # Rows arrive as an iterator, not a list collected by the worker.
+            assert not isinstance(rows, list)
+            seen.extend(rows)
+            return 2
+
+        return sink
+
+    pool = ScraperPool(make_sink, workers=2, factory=lambda: FakeScraper(script, sessions))
+    result = pool.run(list(script))
+    assert len(sinks) == 2
+    assert sum(len(seen) for seen in sinks) == 8
+    assert result.cases == result.saved == 8
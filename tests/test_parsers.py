@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from ct_scraper.parsers import parse_case_info, parse_case_row, parse_docket_link, parse_parties
+
+DETAIL_DIR = Path(__file__).resolve().parent / "fixtures" / "detail_pages"
+CASE_URL = "https://civilinquiry.jud.ct.gov/CaseDetail/PublicCaseDetail.aspx?DocketNo="
+
+
+def _page(docket: str) -> bytes:
+    return (DETAIL_DIR / f"{docket}.html").read_bytes()
+
+
+def test_parse_case_row():
+    row = parse_case_row(_page("HHDCV246194967S"), "EAST HARTFORD", CASE_URL + "HHDCV246194967S")
+    assert row.town == "EAST HARTFORD"
+    assert row.docket_link == CASE_URL + "HHD-CV24-6194967-S"
+    assert row.case_type == "P00 - Property - Foreclosure"
+    assert row.court_location == "HARTFORD JD"
+    assert row.property_address == "1121 TOLLAND STREET EAST HARTFORD, CT 06108"
+    assert row.list_type == "No List Type"
+    assert row.trial_list_claim == ""
+    assert row.last_action_date.startswith("09/30/2026")
+
+
+def test_parse_parties_groups_detail_rows_under_each_role():
+    assert parse_parties(_page("HHDCV246194967S")) == [
+        {
+            "role": "D-01",
+            "name": "MARTIN, SCOTT L, AKA MARTIN SCOTT",
+            "attorney": "",
+            "address": "1121 TOLLAND STREET EAST HARTFORD, CT 06108",
+            "file_date": "05/06/2024",
+        },
+        {
+            # Appearance attorney and file date in the third cell when the second is blank.
+            "role": "D-02",
+            "name": "MARTIN, KAREN",
+            "attorney": "LAW OFFICE OF JOHN T. RYAN (421109)",
+            "address": "1121 TOLLAND STREET",
+            "file_date": "06/12/2024",
+        },
+        {"role": "D-03", "name": "CONNECTICUT DEPARTMENT OF REVENUE SERVICES", "attorney": "", "address": "", "file_date": ""},
+        {
+            "role": "P-01",
+            "name": "DEUTSCHE BANK NATIONAL TRUST COMPANY, AS TRUSTEE FOR MORGAN STANLEY ABS CAPITAL I INC. TRUST 2006-NC4",
+            "attorney": "MCCALLA RAYMER LEIBERT PIERCE LLC (428407)",
+            "address": "50 WESTON STREET HARTFORD, CT 06120",
+            "file_date": "",
+        },
+    ]
+
+
+def test_parse_parties_puts_defendants_first_and_keeps_ten():
+    # Saved from a browser: every table has a <tbody>.
+    parties = parse_parties(_page("HHDCV216138878S"))
+    assert [p["role"] for p in parties] == [f"D-{n:02d}" for n in range(1, 11)]
+    assert parties[0] == {
+        "role": "D-01",
+        "name": "FRANCIS, WAYNE",
+        "attorney": "",
+        "address": "24 VINELAND TERRACE HARTFORD, CT 06112",
+        "file_date": "03/01/2021",
+    }
+
+
+def test_parse_case_info_with_tbody():
+    assert parse_case_info(_page("HHDCV216138878S")) == {
+        "Case Type": "P00 - Property - Foreclosure",
+        "Court Location": "HARTFORD JD",
+        "Property Address": "23-25 VINELAND TERRACE HARTFORD, CT 06112",
+        "List Type": "Short Calendar",
+        "Trial List Claim": "Court",
+        "Last Action Date": "10/02/2026",
+    }
+
+
+def test_parse_docket_link_falls_back_to_url():
+    assert parse_docket_link(b"<html><body></body></html>", CASE_URL + "HHDCV216138878S") == CASE_URL + "HHDCV216138878S"
+    assert parse_docket_link(b"<html><body></body></html>") == ""
@@ -0,0 +1,42 @@
+"""Parser timings over the recorded pages; run with ``pytest tests/test_parsers_bench.py --benchmark-only``."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from ct_scraper.parsers import parse_case_row, parse_docket_links, parse_form_fields, parse_result_rows
+
+pytest.importorskip("pytest_benchmark")
+
+RESULTS_PAGE = Path(__file__).resolve().parents[1] / "hartford_page.html"
+DETAIL_DIR = Path(__file__).resolve().parent / "fixtures" / "detail_pages"
+RESULTS_URL = "https://civilinquiry.jud.ct.gov/PropertyAddressSearchResults.aspx"
+
+
+@pytest.fixture(scope="module")
+def results_page() -> bytes:
+    return RESULTS_PAGE.read_bytes()
+
+
+@pytest.fixture(scope="module")
+def detail_pages():
+    return [path.read_bytes() for path in sorted(DETAIL_DIR.glob("*.html"))]
+
+
+def test_bench_parse_result_rows(benchmark, results_page):
+    rows = benchmark(parse_result_rows, results_page, RESULTS_URL)
+    assert len(rows) == 200
+
+
+def test_bench_parse_docket_links(benchmark, results_page):
+    assert len(benchmark(parse_docket_links, results_page, RESULTS_URL)) == 200
+
+
+def test_bench_parse_form_fields(benchmark, results_page):
+    assert "__VIEWSTATE" in benchmark(parse_form_fields, results_page)
+
+
+def test_bench_parse_case_row(benchmark, detail_pages):
+    rows = benchmark(lambda: [parse_case_row(page, "bench") for page in detail_pages])
+    assert all(row.parties for row in rows)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import func, select
+
+from ct_scraper.database import SessionLocal, session_scope
+from ct_scraper.data_version import get_data_version
+from ct_scraper.models import Case, GeocodeJob, Party, ScrapeCheckpoint
+from ct_scraper.pipeline import CaseStreamWriter, completed_towns, save_cases
+
+
+def _cases():
+    # Closed without a commit, so the loaded attributes stay readable.
+    with SessionLocal() as session:
+        return {case.docket_no: case for case in session.scalars(select(Case))}
+
+
+def test_save_cases_inserts_cases_parties_and_geocode_jobs(db, make_case_row):
+    rows = [
+        make_case_row("HHDCV246194967S"),
+        make_case_row("HHDCV216138878S", property_address=""),
+        make_case_row("HHDCV246194967S", case_type="duplicate in the same batch"),
+    ]
+    assert save_cases(rows) == 2
+
+    cases = _cases()
+    assert set(cases) == {"HHDCV246194967S", "HHDCV216138878S"}
+    assert cases["HHDCV246194967S"].case_type == "P00 - Property - Foreclosure"
+    assert cases["HHDCV246194967S"].county == "Hartford"
+    with session_scope() as session:
+        assert session.scalar(select(func.count()).select_from(Party)) == 2
+        # Only cases with an address are queued for geocoding.
+        assert session.scalar(select(func.count()).select_from(GeocodeJob)) == 1
+
+
+def test_reinsert_returns_zero_and_leaves_data_version(db, make_case_row):
+    rows = [make_case_row("HHDCV246194967S"), make_case_row("HHDCV216138878S")]
+    assert save_cases(rows) == 2
+    with session_scope() as session:
+        version = get_data_version(session)
+
+    assert save_cases(rows) == 0
+    with session_scope() as session:
+        assert get_data_version(session) == version
+        assert session.scalar(select(func.count()).select_from(Party)) == 2
+
+
+def test_refresh_updates_only_the_fields_each_row_carries(db, make_case_row):
+    save_cases([make_case_row("HHDCV246194967S"), make_case_row("HHDCV216138878S")])
+
+    # Different non-empty columns per row, so update(Case) gets mixed parameter sets.
+    refreshed = [
+        make_case_row("HHDCV246194967S", list_type="Short Calendar", last_action_date=""),
+        make_case_row("HHDCV216138878S", case_type="", trial_list_claim="Court", last_action_date="10/02/2026"),
+    ]
+    assert save_cases(refreshed, refresh=True) == 0
+
+    cases = _cases()
+    first, second = cases["HHDCV246194967S"], cases["HHDCV216138878S"]
+    assert (first.list_type, first.last_action_date) == ("Short Calendar", "09/30/2026")
+    assert (second.case_type, second.trial_list_claim, second.last_action_date) == (
+        "P00 - Property - Foreclosure", "Court", "10/02/2026",
+    )
+    assert second.list_type == "No List Type"
+
+
+def test_refresh_off_leaves_stored_cases_alone(db, make_case_row):
+    save_cases([make_case_row("HHDCV246194967S")])
+    assert save_cases([make_case_row("HHDCV246194967S", list_type="Short Calendar")]) == 0
+    assert _cases()["HHDCV246194967S"].list_type == "No List Type"
+
+
+def test_failed_town_does_not_leak_rows_into_the_next(db, make_case_row):
+    writer = CaseStreamWriter("run", batch_size=10)
+
+    def broken_town():
+        yield make_case_row("HHDCV246194967S", town="Avon")
+        raise RuntimeError("session died")
+
+    with pytest.raises(RuntimeError):
+        writer.write_town("Avon", broken_town())
+    assert writer.write_town("Bethel", [make_case_row("HHDCV216138878S", town="Bethel")]) == 1
+
+    assert set(_cases()) == {"HHDCV216138878S"}
+    assert completed_towns("run") == {"Bethel"}
+    with session_scope() as session:
+        assert session.scalar(select(ScrapeCheckpoint.cases)) == 1
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from sqlalchemy import delete, select, update
+
+from ct_scraper.api.filters import filtered_cases
+from ct_scraper.database import SessionLocal, session_scope
+from ct_scraper.models import Case
+from ct_scraper.pipeline import save_cases
+from ct_scraper.search import case_search_text
+
+
+def _search(term):
+    with SessionLocal() as session:
+        stmt, _ = filtered_cases(session.get_bind().dialect.name, search=term)
+        return [row.docket_no for row in session.execute(stmt)]
+
+
+def _party(name):
+    return [{"role": "D-01", "name": name, "attorney": "", "address": "", "file_date": "05/06/2024"}]
+
+
+def test_new_cases_are_indexed_on_insert(db, make_case_row):
+    save_cases([make_case_row("HHDCV246194967S", parties=_party("OKAFOR, ADAEZE"))])
+    assert _search("okafor") == ["HHDCV246194967S"]
+    # Prefix matches, and the docket serial on its own.
+    assert _search("Okaf") == _search("6194967") == ["HHDCV246194967S"]
+    assert _search("nobody") == []
+
+
+def test_index_follows_updates_and_deletes(db, make_case_row):
+    save_cases([make_case_row("HHDCV246194967S")])
+    with session_scope() as session:
+        case = session.scalar(select(Case))
+        text = case_search_text(case.docket_no, case.town, "14 Zebrawood Lane", ["MARTIN, SCOTT L"])
+        session.execute(update(Case).where(Case.id == case.id).values(search_text=text))
+    assert _search("zebrawood") == ["HHDCV246194967S"]
+    assert _search("tolland") == []
+
+    with session_scope() as session:
+        session.execute(delete(Case))
+    assert _search("zebrawood") == []
+
+
+def test_ranked_search_puts_the_best_match_first(db, make_case_row):
+    # Saved first, so newest-first order alone would list it last.
+    save_cases([make_case_row("HHDCV246194967S", parties=_party("TOLLAND, MARY"))])
+    save_cases([make_case_row("HHDCV216138878S", parties=_party("MARTIN, SCOTT"))])
+    assert _search("tolland") == ["HHDCV246194967S", "HHDCV216138878S"]
+    assert _search("martin") == ["HHDCV216138878S"]
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import select, update
+
+from ct_scraper.database import SessionLocal
+from ct_scraper.geocode import case_location
+from ct_scraper.geocoders import ADDRESS_PRECISION, TOWN_PRECISION
+from ct_scraper.geohash import encode
+from ct_scraper.models import Case
+from ct_scraper.pipeline import save_cases
+from ct_scraper.spatial import MAX_GEOHASH_RANGES, BBox, apply_radius, geohash_ranges
+
+HARTFORD = (41.7637, -72.6851)
+# (docket, (lat, lng), precision): about 0.3, 4 and 31 miles from downtown Hartford.
+PLACES = [
+    ("HHDCV266100001S", (41.7670, -72.6800), ADDRESS_PRECISION),
+    ("HHDCV266100002S", (41.7620, -72.6100), ADDRESS_PRECISION),
+    ("NNHCV266100003S", (41.3083, -72.9279), ADDRESS_PRECISION),
+    ("HHDCV266100004S", HARTFORD, TOWN_PRECISION),
+]
+
+
+@pytest.fixture
+def located(db, make_case_row):
+    save_cases([make_case_row(docket) for docket, _, _ in PLACES])
+    with SessionLocal() as session, session.begin():
+        ids = dict(session.execute(select(Case.docket_no, Case.id)).all())
+        session.execute(update(Case), [case_location(ids[docket], (point, precision)) for docket, point, precision in PLACES])
+    return db
+
+
+def _near(dialect, miles):
+    stmt = apply_radius(select(Case.docket_no), HARTFORD, miles, dialect)
+    with SessionLocal() as session:
+        return set(session.scalars(stmt))
+
+
+def test_ranges_cover_every_point_in_the_box():
+    box = BBox(-72.75, 41.70, -72.60, 41.80)
+    prefixes = geohash_ranges(box)
+    assert 0 < len(prefixes) <= MAX_GEOHASH_RANGES
+    for lat in (41.70, 41.75, 41.80):
+        for lng in (-72.75, -72.675, -72.60):
+            assert any(encode(lat, lng).startswith(p) for p in prefixes)
+
+
+def test_smaller_box_gets_longer_prefixes():
+    wide = geohash_ranges(BBox(-73.7, 41.0, -71.8, 42.1))
+    narrow = geohash_ranges(BBox(-72.69, 41.76, -72.68, 41.77))
+    assert len(narrow[0]) > len(wide[0])
+
+
+def test_box_wider_than_the_range_budget_has_no_ranges():
+    assert geohash_ranges(BBox(-180.0, -90.0, 180.0, 90.0)) == []
+    assert geohash_ranges(BBox(-1.0, -1.0, 1.0, 1.0), max_ranges=3) == []
+
+
+@pytest.mark.parametrize("dialect", ["sqlite", "postgresql"])
+def test_radius_keeps_address_points_within_distance(located, dialect):
+    assert _near(dialect, 1) == {"HHDCV266100001S"}
+    assert _near(dialect, 5) == {"HHDCV266100001S", "HHDCV266100002S"}
+    assert _near(dialect, 40) == {"HHDCV266100001S", "HHDCV266100002S", "NNHCV266100003S"}
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+
+import pytest
+
+from ct_scraper.api.filters import filtered_cases
+from ct_scraper.api.streaming import FLAT_COLUMNS, stream_cases
+from ct_scraper.database import SessionLocal
+from ct_scraper.pipeline import save_cases
+
+DOCKETS = [f"HHDCV2661{n:05d}S" for n in range(5)]
+
+
+@pytest.fixture
+def stored(db, make_case_row):
+    save_cases([make_case_row(docket) for docket in DOCKETS])
+    stmt, _ = filtered_cases(db.dialect.name)
+    return stmt
+
+
+class TrackingSessions:
+    """Session factory that remembers whether every session it handed out was closed."""
+
+    def __init__(self) -> None:
+        self.sessions = []
+
+    def __call__(self):
+        session = SessionLocal()
+        self.sessions.append(session)
+        return session
+
+    @property
+    def all_closed(self) -> bool:
+        return all(not session.in_transaction() for session in self.sessions)
+
+
+def test_ndjson_streams_one_chunk_per_partition(stored):
+    chunks = list(stream_cases(SessionLocal, stored, "ndjson", chunk_rows=2))
+    assert len(chunks) == 3
+    records = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert [r["docket_no"] for r in records] == list(reversed(DOCKETS))
+    assert records[0]["parties"][0]["name"] == "MARTIN, SCOTT L"
+
+
+def test_csv_writes_header_once(stored):
+    chunks = list(stream_cases(SessionLocal, stored, "csv", chunk_rows=2))
+    assert chunks[0].decode().strip() == ",".join(FLAT_COLUMNS)
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+    assert [r["docket_no"] for r in rows] == list(reversed(DOCKETS))
+    assert json.loads(rows[0]["parties_json"])[0]["role"] == "D-01"
+
+
+def test_parquet_has_one_row_group_per_chunk(stored):
+    pq = pytest.importorskip("pyarrow.parquet")
+    data = b"".join(stream_cases(SessionLocal, stored, "parquet", chunk_rows=2))
+    parquet = pq.ParquetFile(io.BytesIO(data))
+    assert parquet.metadata.num_row_groups == 3
+    assert parquet.read().column("docket_no").to_pylist() == list(reversed(DOCKETS))
+
+
+def test_session_is_closed_when_client_disconnects(stored):
+    sessions = TrackingSessions()
+    stream = stream_cases(sessions, stored, "ndjson", chunk_rows=2)
+    next(stream)
+    stream.close()
+    assert len(sessions.sessions) == 1 and sessions.all_closed
+
+
+def test_empty_result_streams_nothing_but_csv_header(db):
+    stmt, _ = filtered_cases(db.dialect.name, town="Nowhere")
+    assert b"".join(stream_cases(SessionLocal, stmt, "ndjson")) == b""
+    assert b"".join(stream_cases(SessionLocal, stmt, "csv")).decode().strip() == ",".join(FLAT_COLUMNS)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import pytest
+
+from ct_scraper import throttle as throttle_module
+from ct_scraper.throttle import AdaptiveThrottle, get_throttle
+
+
+def _throttle(**options) -> AdaptiveThrottle:
+    defaults = dict(initial_rate=2.0, min_rate=0.5, max_rate=3.0, increase=0.25, decrease=0.5, latency_target=2.0)
+    return AdaptiveThrottle("test", **{**defaults, **options})
+
+
+def test_fast_successes_increase_rate_additively_up_to_max():
+    throttle = _throttle()
+    throttle.record(0.1)
+    throttle.record(0.1)
+    assert throttle.rate == pytest.approx(2.5)
+    for _ in range(10):
+        throttle.record(0.1)
+    assert throttle.rate == 3.0
+    assert (throttle.successes, throttle.failures) == (12, 0)
+
+
+def test_failure_halves_rate_down_to_min():
+    throttle = _throttle()
+    throttle.record(0.1, ok=False)
+    assert throttle.rate == 1.0
+    throttle.record(0.1, ok=False)
+    throttle.record(0.1, ok=False)
+    assert throttle.rate == 0.5
+    assert throttle.failures == 3
+
+
+def test_slow_success_backs_off_gently():
+    throttle = _throttle()
+    throttle.record(5.0)
+    # Between holding steady and a full cut: rate * (1 + decrease) / 2.
+    assert throttle.rate == pytest.approx(1.5)
+    assert throttle.successes == 1
+
+
+@pytest.mark.parametrize("status, ok", [(200, True), (404, True), (429, False), (500, False), (503, False)])
+def test_record_status(status, ok):
+    throttle = _throttle()
+    throttle.record_status(status, 0.1)
+    assert throttle.rate == (2.25 if ok else 1.0)
+
+
+def test_request_records_failure_when_block_raises():
+    throttle = _throttle(initial_rate=1000.0, max_rate=1000.0)
+    with pytest.raises(RuntimeError):
+        with throttle.request():
+            raise RuntimeError("connection reset")
+    assert throttle.rate == 500.0
+    assert throttle.snapshot()["failures"] == 1
+
+
+def test_get_throttle_shares_one_instance_per_name(monkeypatch):
+    monkeypatch.setattr(throttle_module, "_throttles", {})
+    first = get_throttle("example.org", max_rate=5.0)
+    assert get_throttle("example.org", max_rate=50.0) is first
+    assert first.max_rate == 5.0
+    assert get_throttle("example.com") is not first